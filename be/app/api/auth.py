@@ -1,19 +1,20 @@
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.auth import ChallengeRequest, ChallengeResponse, VerifyRequest, VerifyResponse, LogoutRequest
-from app.database.connection import get_db
+from app.database.connection import get_async_db
 from app.services.crypto import AuthCryptoService
 from app.services.nonce import NonceService
 from app.services.session import SessionService
 from app.services.read_contract import ContractService
+from app.services.container import get_contract_service
 
 router = APIRouter(tags=["authentication"])
 
 crypto_service = AuthCryptoService()
-contract_service = ContractService()
 
 @router.post("/challenge", response_model=ChallengeResponse)
-def request_challenge(request: ChallengeRequest, db: Session = Depends(get_db)):
+async def request_challenge(request: ChallengeRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Step 1: Generate authentication challenge
     Client provides wallet address, server generates nonce
@@ -21,7 +22,7 @@ def request_challenge(request: ChallengeRequest, db: Session = Depends(get_db)):
     try:
         nonce = crypto_service.generate_nonce()
         
-        NonceService.create_nonce(db, request.wallet_address, nonce)
+        await NonceService.create_nonce(db, request.wallet_address, nonce)
         
         challenge = crypto_service.create_challenge_message(nonce, request.wallet_address)
         
@@ -30,7 +31,11 @@ def request_challenge(request: ChallengeRequest, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to generate challenge: {str(e)}")
 
 @router.post("/verify", response_model=VerifyResponse)
-def verify_signature(request: VerifyRequest, db: Session = Depends(get_db)):
+async def verify_signature(
+    request: VerifyRequest,
+    db: AsyncSession = Depends(get_async_db),
+    contract_service: ContractService = Depends(get_contract_service)
+):
     """
     Step 2: Verify signature and authenticate user
     Client signs challenge with private key, server verifies and creates session
@@ -38,13 +43,14 @@ def verify_signature(request: VerifyRequest, db: Session = Depends(get_db)):
     """
     try:
         
-        nonce_record = NonceService.get_nonce(db, request.wallet_address)
+        nonce_record = await NonceService.get_nonce(db, request.wallet_address)
         if not nonce_record:
             raise HTTPException(status_code=400, detail="Challenge expired or not found")
         
         challenge = crypto_service.create_challenge_message(nonce_record.nonce, request.wallet_address)
 
-        is_valid, public_key_x, public_key_y = crypto_service.verify_wallet_ownership(
+        is_valid, public_key_x, public_key_y = await run_in_threadpool(
+            crypto_service.verify_wallet_ownership,
             challenge, 
             request.signature, 
             request.wallet_address
@@ -52,20 +58,20 @@ def verify_signature(request: VerifyRequest, db: Session = Depends(get_db)):
     
         if not is_valid:
             raise HTTPException(status_code=401, detail="Invalid signature or wallet address mismatch")
-        is_issuer = contract_service.is_issuer(request.wallet_address)
+        is_issuer = await run_in_threadpool(contract_service.is_issuer, request.wallet_address)
         if not is_issuer:
-            NonceService.delete_nonce(db, request.wallet_address)
+            await NonceService.delete_nonce(db, request.wallet_address)
             raise HTTPException(
                 status_code=403, 
                 detail="Access denied. Only issuers can authenticate."
             )
         
-        NonceService.delete_nonce(db, request.wallet_address)
+        await NonceService.delete_nonce(db, request.wallet_address)
         
         role = "issuer"
         jwt_token = SessionService.create_jwt_token(request.wallet_address, role)
         
-        session = SessionService.create_session(
+        session = await SessionService.create_session(
             db, 
             request.wallet_address, 
             public_key_x, 
@@ -88,12 +94,12 @@ def verify_signature(request: VerifyRequest, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Verification failed: {str(e)}")
 
 @router.post("/logout")
-def logout(request: LogoutRequest, db: Session = Depends(get_db)):
+async def logout(request: LogoutRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Logout user and remove session
     """
     try:
-        success = SessionService.delete_session(db, request.wallet_address)
+        success = await SessionService.delete_session(db, request.wallet_address)
         if success:
             return {"message": "Logout successful"}
         else:
@@ -104,15 +110,19 @@ def logout(request: LogoutRequest, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Logout failed: {str(e)}")
 
 @router.get("/session/{wallet_address}")
-def get_session(wallet_address: str, db: Session = Depends(get_db)):
+async def get_session(
+    wallet_address: str,
+    db: AsyncSession = Depends(get_async_db),
+    contract_service: ContractService = Depends(get_contract_service)
+):
     """
     Check if user has active session and validate issuer status
     """
-    session = SessionService.get_session(db, wallet_address)
+    session = await SessionService.get_session(db, wallet_address)
     if session:
         payload = SessionService.verify_jwt_token(session.jwt_token)
         if payload:
-            is_issuer = contract_service.is_issuer(wallet_address)
+            is_issuer = await run_in_threadpool(contract_service.is_issuer, wallet_address)
             if is_issuer:
                 return {
                     "active": True,
@@ -124,13 +134,17 @@ def get_session(wallet_address: str, db: Session = Depends(get_db)):
     return {"active": False}
 
 @router.get("/validate-token")
-def validate_token(token: str, db: Session = Depends(get_db)):
+async def validate_token(
+    token: str,
+    db: AsyncSession = Depends(get_async_db),
+    contract_service: ContractService = Depends(get_contract_service)
+):
     """
     Validate JWT token and return session info
     """
-    session = SessionService.validate_session_token(db, token)
+    session = await SessionService.validate_session_token(db, token)
     if session:
-        is_issuer = contract_service.is_issuer(session.wallet_address)
+        is_issuer = await run_in_threadpool(contract_service.is_issuer, session.wallet_address)
         if is_issuer:
             return {
                 "valid": True,
@@ -138,4 +152,11 @@ def validate_token(token: str, db: Session = Depends(get_db)):
                 "role": session.role
             }
     
-    return {"valid": False}
\ No newline at end of file
+    return {"valid": False}
+
+@router.get("/issuer-cache/stats")
+def get_issuer_cache_stats(contract_service: ContractService = Depends(get_contract_service)):
+    """
+    Hit/miss counters of the in-process issuer cache
+    """
+    return contract_service.issuer_cache.stats()
\ No newline at end of file
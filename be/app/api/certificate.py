@@ -1,88 +1,107 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Query, File, Form, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.certificate import (
     IssueCertificateRequest, 
     IssueCertificateResponse,
+    BatchVerifyRequest,
     PublicVerifyRequest,
     PublicVerifyResponse, 
     VerifyCertificateRequest, 
     VerifyCertificateResponse,
     SignCertificateRequest,
-    SignCertificateResponse
+    SignCertificateResponse,
+    CertificateSignaturesRequest,
+    CertificateSignaturesResponse,
+    AttachmentUploadResponse
 )
-from app.database.connection import get_db
-from app.services.ipfs import IPFSService
+from app.database.connection import get_async_db, AsyncSessionLocal
+from app.services.async_ipfs import AsyncIPFSService
 from app.services.encryption import AESEncryptionService
-from app.services.read_contract import ContractService
+from app.services.async_read_contract import AsyncContractService
 from app.services.certificate import CertificateService
+from app.services.certificate_index import CertificateIndexService
+from app.services.cohort import CohortService
+from app.services.blob_cache import BlobCache
+from app.services.batch_crypto import BatchCryptoEngine
+from app.services.bulk_issue import BulkIssueService, parse_issue_rows
+from app.services.bulk_verify import BulkVerifyService
+from app.services.compression import CompressionService
+from app.services.container import (
+    get_async_contract_service,
+    get_async_ipfs_service,
+    get_batch_crypto,
+    get_blob_cache,
+    get_compression_service,
+    get_encryption_service,
+    get_pin_queue,
+    get_template_registry,
+    get_verification_cache,
+    get_verify_memo
+)
+from app.services.indexer import INDEXER_ENABLED
+from app.services.payload_stream import PayloadStreamService
+from app.services.pin_queue import PinQueue
+from app.services.template_registry import TemplateRegistry
+from app.services.verify_cache import VerificationCache
+from app.services.verify_memo import PublicVerifyMemo, memo_key
 from app.models.certificate_key import CertificateKey
 import hashlib
+import json
+import os
+import mimetypes
+import orjson
 from datetime import datetime
+from typing import AsyncIterator, Optional
 from urllib.parse import quote
 
 router = APIRouter(tags=["certificate"])
 
-ipfs_service = IPFSService()
-encryption_service = AESEncryptionService()
-contract_service = ContractService()
-certificate_service = CertificateService()
-
-# Template ijazah Indonesia
-IJAZAH_TEMPLATE = """Kementerian Pendidikan Tinggi, Sains, dan Teknologi
-Institut Teknologi Bandung
-
-dengan ini menyatakan bahwa
-
-{student_name}
-NIM {student_id}
-
-lahir di {birth_place}, tanggal {birth_date}, telah menyelesaikan dengan baik dan sudah memenuhi semua persyaratan pada Program Studi {degree}
-
-Oleh sebab itu kepadanya diberikan gelar
-
-SARJANA TEKNIK
-
-beserta hak dan segala kewajiban yang melekat pada gelar tersebut. Diberikan di Bandung tanggal {issue_date}
-
-Rektor
-
-     
-
-Prof. Dr. Ir. Tatacipta Dirgantara, M.T.
-NIP: 1243568790
-"""
+CERTIFICATE_PAGE_SIZE = 100
+UPLOAD_CHUNK_SIZE = 256 * 1024
+IPFS_PIN_ASYNC = os.getenv("IPFS_PIN_ASYNC", "true").lower() == "true"
 
 @router.post("/issue", response_model=IssueCertificateResponse)
 async def issue_certificate(
     request: IssueCertificateRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    contract_service: AsyncContractService = Depends(get_async_contract_service),
+    ipfs_service: AsyncIPFSService = Depends(get_async_ipfs_service),
+    encryption_service: AESEncryptionService = Depends(get_encryption_service),
+    pin_queue: PinQueue = Depends(get_pin_queue),
+    templates: TemplateRegistry = Depends(get_template_registry),
+    compression: CompressionService = Depends(get_compression_service)
 ):
     """
     Issue a new certificate
-    Flow: Generate txt -> Encrypt -> Upload to IPFS -> Store key -> Return for signing
+    Flow: Generate txt -> Compress -> Encrypt -> Upload to IPFS -> Store key -> Return for signing
+    With IPFS_PIN_ASYNC the CID is computed locally and the upload happens in the background
+    The response names the template version (and its IPFS CID) the certificate was rendered from
     """
     try:
-        if contract_service.certificate_exists(request.student_id):
+        if await contract_service.certificate_exists(request.student_id):
             raise HTTPException(status_code=400, detail="Certificate already exists for this student ID")
-        
-        certificate_text = IJAZAH_TEMPLATE.format(
-            student_name=request.student_name,
-            student_id=request.student_id,
-            birth_place=request.birth_place,
-            birth_date=request.birth_date,
-            degree=request.degree,
-            issue_date=request.issue_date
-        )
+
+        # Template and dictionary lookups may query the database; encryption is CPU-bound
+        try:
+            template = await run_in_threadpool(templates.get, request.template_id, request.template_version)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        certificate_text = template.render(request)
         
         aes_key = encryption_service.generate_key()
         
         certificate_bytes = certificate_text.encode('utf-8')
-        encrypted_data = encryption_service.encrypt(certificate_bytes, aes_key)
+        encrypted_data = await run_in_threadpool(encryption_service.encrypt, certificate_bytes, aes_key, compression)
         
-        ipfs_cid = ipfs_service.upload_file(
-            encrypted_data,
-            f"certificate_{request.student_id}.enc"
-        )
+        if IPFS_PIN_ASYNC:
+            ipfs_cid = await run_in_threadpool(pin_queue.submit, encrypted_data)
+        else:
+            ipfs_cid = await ipfs_service.upload_file(
+                encrypted_data,
+                f"certificate_{request.student_id}.enc"
+            )
         
         if not ipfs_cid:
             raise HTTPException(status_code=500, detail="Failed to upload to IPFS")
@@ -94,7 +113,7 @@ async def issue_certificate(
             aes_key=aes_key
         )
         db.add(cert_key)
-        db.commit()
+        await db.commit()
         
         return IssueCertificateResponse(
             success=True,
@@ -102,31 +121,119 @@ async def issue_certificate(
             student_id=request.student_id,
             ipfs_cid=ipfs_cid,
             cert_hash=cert_hash,
-            aes_key=aes_key
+            aes_key=aes_key,
+            **template.to_ref()
         )
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to issue certificate: {str(e)}")
 
+@router.post("/issue/batch")
+async def issue_certificates_batch(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|jsonl)$"),
+    cohort_id: Optional[str] = Query(None, min_length=1, max_length=128),
+    db: AsyncSession = Depends(get_async_db),
+    contract_service: AsyncContractService = Depends(get_async_contract_service),
+    ipfs_service: AsyncIPFSService = Depends(get_async_ipfs_service),
+    crypto_engine: BatchCryptoEngine = Depends(get_batch_crypto),
+    pin_queue: PinQueue = Depends(get_pin_queue),
+    templates: TemplateRegistry = Depends(get_template_registry),
+    compression: CompressionService = Depends(get_compression_service)
+):
+    """
+    Issue a cohort from a CSV or JSONL upload of IssueCertificateRequest rows
+    The format comes from `format` or the file extension (.csv, .jsonl/.ndjson)
+    Streams NDJSON: one IssueCertificateResponse per row with its 1-based `row`, in
+    upload order, then a summary line {"count", "issued", "failed"}
+    With `cohort_id`, the issued certificates form a Merkle cohort: the summary carries
+    `cohort` {cohort_id, merkle_root, size}, and only the root is proposed on chain
+    (proposeCohort) instead of one proposeCertificate per row
+    """
+    if cohort_id is not None:
+        if await CohortService.get_cohort(db, cohort_id) or (await contract_service.get_cohort_state(cohort_id))["exists"]:
+            raise HTTPException(status_code=400, detail="Cohort already exists")
+    if format is None:
+        extension = os.path.splitext(file.filename or "")[1].lower()
+        format = "csv" if extension == ".csv" or file.content_type == "text/csv" else "jsonl"
+    try:
+        rows = parse_issue_rows(await file.read(), format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid upload: {str(e)}")
+
+    async def generate_lines():
+        async with AsyncSessionLocal() as db:
+            issued = 0
+            members = []
+            async for result in BulkIssueService.issue(
+                rows,
+                templates,
+                db,
+                contract_service,
+                ipfs_service,
+                crypto_engine,
+                pin_queue if IPFS_PIN_ASYNC else None,
+                await run_in_threadpool(compression.current)
+            ):
+                issued += result["success"]
+                if cohort_id is not None and result["success"]:
+                    members.append(result)
+                yield json.dumps(result) + "\n"
+            summary = {"count": len(rows), "issued": issued, "failed": len(rows) - issued}
+            if members:
+                try:
+                    cohort = await CohortService.create_cohort(db, cohort_id, members)
+                    summary["cohort"] = {"cohort_id": cohort.cohort_id, "merkle_root": cohort.merkle_root, "size": cohort.size}
+                except Exception as e:
+                    summary["cohort_error"] = f"Failed to build cohort: {str(e)}"
+            yield json.dumps(summary) + "\n"
+
+    return StreamingResponse(generate_lines(), media_type="application/x-ndjson")
+
 @router.post("/verify", response_model=VerifyCertificateResponse)
 async def verify_certificate(
     request: VerifyCertificateRequest,
-    db: Session = Depends(get_db)
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    contract_service: AsyncContractService = Depends(get_async_contract_service),
+    ipfs_service: AsyncIPFSService = Depends(get_async_ipfs_service),
+    encryption_service: AESEncryptionService = Depends(get_encryption_service),
+    compression: CompressionService = Depends(get_compression_service),
+    verify_cache: VerificationCache = Depends(get_verification_cache)
 ):
+    """
+    Verify a certificate against its on-chain record
+    Verified results are served from memory until a revocation event for the student,
+    reported in X-Verify-Cache (memory, miss or bypass) and X-Verify-Block
+    """
+    cached = verify_cache.get(request.student_id)
+    if cached is not None:
+        result, block = cached
+        response.headers["X-Verify-Cache"] = "memory"
+        response.headers["X-Verify-Block"] = str(block)
+        return result
+    token = await run_in_threadpool(verify_cache.begin)
+    response.headers["X-Verify-Cache"] = "miss" if token is not None else "bypass"
+    if token is not None:
+        response.headers["X-Verify-Block"] = str(token[1])
+
     try:
-        if not contract_service.certificate_exists(request.student_id):
+        state = await contract_service.get_certificate_state(request.student_id)
+        if not state["exists"]:
+            state = await CohortService.get_certificate_state(db, contract_service, request.student_id)
+        if not state["exists"]:
             return VerifyCertificateResponse(
                 success=False,
                 valid=False,
                 message="Certificate not found on blockchain"
             )
 
-        is_valid = contract_service.is_certificate_valid(request.student_id)
+        is_valid = state["isValid"]
 
-        cert_data = contract_service.get_certificate(request.student_id)
+        cert_data = state["certificate"]
         if not cert_data:
             return VerifyCertificateResponse(
                 success=False,
@@ -137,7 +244,7 @@ async def verify_certificate(
         ipfs_cid = cert_data["ipfsCID"]
         file_url = ipfs_service.get_gateway_url(ipfs_cid)
 
-        encrypted_data = ipfs_service.get_file(ipfs_cid)
+        encrypted_data = await ipfs_service.get_file(ipfs_cid)
         if not encrypted_data:
             return VerifyCertificateResponse(
                 success=False,
@@ -147,102 +254,123 @@ async def verify_certificate(
                 file_url=file_url
             )
 
-        certificate_key = certificate_service.get_certificate_by_nim(db, request.student_id)
+        certificate_key = await CertificateService.get_certificate_by_nim(db, request.student_id)
         if not certificate_key:
             raise HTTPException(status_code=404, detail="AES key not found")
 
-        aes_key = certificate_key.aes_key
-
-        try:
-            decrypted_data = encryption_service.decrypt(encrypted_data, aes_key)
-            certificate_text = decrypted_data.decode("utf-8")
-        except Exception:
-            return VerifyCertificateResponse(
-                success=False,
-                valid=is_valid,
-                message="Invalid decryption key",
-                ipfs_cid=ipfs_cid,
-                file_url=file_url
-            )
-
-        calculated_hash = hashlib.sha256(decrypted_data).hexdigest()
-        blockchain_hash = cert_data["certHash"]
-
-        if calculated_hash != blockchain_hash:
-            return VerifyCertificateResponse(
-                success=False,
-                valid=False,
-                message="Certificate hash mismatch",
-                ipfs_cid=ipfs_cid,
-                file_url=file_url
-            )
-        
-        verify_url = (
-            "http://localhost:3000/verify"
-            f"?cid={quote(ipfs_cid)}"
-            f"&key={quote(aes_key)}"
-            f"&hash={quote(blockchain_hash)}"
-        )
-
-        certificate_text_with_url = (
-            certificate_text
-            + "\n\nVerifikasi Keaslian Ijazah:\n"
-            + verify_url
-        )
-
-
-        return VerifyCertificateResponse(
-            success=True,
-            valid=is_valid,
-            certificate_text=certificate_text_with_url,
-            ipfs_cid=ipfs_cid,
-            file_url=verify_url,
-            message="Certificate verified successfully"
-            if is_valid else "Certificate has been revoked"
+        result = await run_in_threadpool(
+            BulkVerifyService.check_payload,
+            request.student_id,
+            cert_data,
+            is_valid,
+            encrypted_data,
+            certificate_key.aes_key,
+            file_url,
+            encryption_service,
+            compression
         )
+        BulkVerifyService.cache_result(verify_cache, token, request.student_id, cert_data, result)
+        return result
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Verification failed: {str(e)}")
 
+@router.post("/verify/batch")
+async def verify_certificates_batch(
+    request: BatchVerifyRequest,
+    contract_service: AsyncContractService = Depends(get_async_contract_service),
+    ipfs_service: AsyncIPFSService = Depends(get_async_ipfs_service),
+    encryption_service: AESEncryptionService = Depends(get_encryption_service),
+    compression: CompressionService = Depends(get_compression_service),
+    verify_cache: VerificationCache = Depends(get_verification_cache)
+):
+    """
+    Verify up to 1000 student IDs, e.g. an employer background-check batch
+    Streams NDJSON: one VerifyCertificateResponse per distinct ID with its `student_id`
+    and `cache`, in completion order, then a summary line {"count", "verified", "valid", "failed"}
+    """
+    student_ids = list(dict.fromkeys(request.student_ids))
+
+    async def generate_lines():
+        async with AsyncSessionLocal() as db:
+            verified = valid = 0
+            async for result in BulkVerifyService.verify(
+                student_ids,
+                db,
+                contract_service,
+                ipfs_service,
+                encryption_service,
+                compression,
+                verify_cache
+            ):
+                verified += result["success"]
+                valid += result["success"] and result["valid"]
+                yield json.dumps(result) + "\n"
+            yield json.dumps({
+                "count": len(student_ids),
+                "verified": verified,
+                "valid": valid,
+                "failed": len(student_ids) - verified
+            }) + "\n"
+
+    return StreamingResponse(generate_lines(), media_type="application/x-ndjson")
+
 @router.post("/verify-public", response_model=PublicVerifyResponse)
-async def verify_certificate_public(request: PublicVerifyRequest):
+async def verify_certificate_public(
+    request: PublicVerifyRequest,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    contract_service: AsyncContractService = Depends(get_async_contract_service),
+    ipfs_service: AsyncIPFSService = Depends(get_async_ipfs_service),
+    encryption_service: AESEncryptionService = Depends(get_encryption_service),
+    compression: CompressionService = Depends(get_compression_service),
+    verify_memo: PublicVerifyMemo = Depends(get_verify_memo)
+):
+    """
+    Verify a certificate from its QR-code link (cid, key, hash)
+    The payload check is served from memory for repeated links and shared between
+    concurrent identical requests, reported in X-Verify-Cache (memory, coalesced or miss);
+    cohort state is read from the chain on every request
+    """
     try:
         file_url = ipfs_service.get_gateway_url(request.ipfs_cid)
 
-        # 1. Download encrypted data
-        encrypted_data = ipfs_service.get_file(request.ipfs_cid)
-        if not encrypted_data:
-            return PublicVerifyResponse(
-                success=False,
-                valid=False,
-                message="Failed to retrieve certificate from IPFS",
-                file_url=file_url
-            )
-
-        # 2. Decrypt
-        try:
-            decrypted_data = encryption_service.decrypt(
-                encrypted_data,
-                request.aes_key
-            )
-            certificate_text = decrypted_data.decode("utf-8")
-        except Exception:
-            return PublicVerifyResponse(
-                success=False,
-                valid=False,
-                message="Invalid AES key",
-                file_url=file_url
-            )
-
-        # 3. Verify hash
-        calculated_hash = hashlib.sha256(decrypted_data).hexdigest()
-        if calculated_hash != request.cert_hash:
+        # 1-3. Download, decrypt and verify the hash, memoised per (cid, key, hash)
+        async def check_payload():
+            encrypted_data = await ipfs_service.get_file(request.ipfs_cid)
+            if not encrypted_data:
+                return {"message": "Failed to retrieve certificate from IPFS"}, False
+
+            # Decryption, decompression and hashing are CPU-bound; keep them off the loop
+            def decrypt_and_hash():
+                decrypted_data = encryption_service.decrypt(
+                    encrypted_data,
+                    request.aes_key,
+                    compression
+                )
+                return decrypted_data.decode("utf-8"), hashlib.sha256(decrypted_data).hexdigest()
+
+            try:
+                certificate_text, calculated_hash = await run_in_threadpool(decrypt_and_hash)
+            except Exception:
+                return {"message": "Invalid AES key"}, True
+            if calculated_hash != request.cert_hash:
+                return {"message": "Certificate hash mismatch"}, True
+            return {"message": None, "certificate_text": certificate_text}, True
+
+        checked, tier = await verify_memo.get_or_load(
+            memo_key(request.ipfs_cid, request.aes_key, request.cert_hash),
+            check_payload
+        )
+        response.headers["X-Verify-Cache"] = tier
+        if checked["message"]:
             return PublicVerifyResponse(
                 success=False,
                 valid=False,
-                message="Certificate hash mismatch",
+                message=checked["message"],
                 file_url=file_url
             )
+        certificate_text = checked["certificate_text"]
 
         # # 4. Verify on blockchain
         # if not contract_service.is_hash_issued(request.cert_hash):
@@ -258,6 +386,29 @@ async def verify_certificate_public(request: PublicVerifyRequest):
             f"&key={quote(request.aes_key)}"
             f"&hash={quote(request.cert_hash)}"
         )
+
+        # 4. Cohort certificates: check the Merkle proof against the anchored root
+        is_valid = True
+        if request.cohort_id:
+            if not request.student_id:
+                raise HTTPException(status_code=400, detail="student_id is required to verify a cohort certificate")
+            state = await CohortService.get_certificate_state(
+                db,
+                contract_service,
+                request.student_id,
+                request.cohort_id,
+                request.cert_hash,
+                request.merkle_proof
+            )
+            if not state["exists"]:
+                return PublicVerifyResponse(
+                    success=False,
+                    valid=False,
+                    message="Certificate not anchored in cohort",
+                    file_url=file_url
+                )
+            is_valid = state["isValid"]
+            verify_url += f"&student={quote(request.student_id)}&cohort={quote(request.cohort_id)}"
         certificate_text_with_url = (
             certificate_text
             + "\n\nVerifikasi Keaslian Ijazah:\n"
@@ -265,56 +416,182 @@ async def verify_certificate_public(request: PublicVerifyRequest):
         )
         return PublicVerifyResponse(
             success=True,
-            valid=True,
-            message="Certificate verified successfully",
+            valid=is_valid,
+            message="Certificate verified successfully"
+            if is_valid else "Certificate has been revoked or is not yet issued",
             certificate_text=certificate_text_with_url,
             file_url=verify_url
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/key/{student_id}")
-async def get_certificate_key(student_id: str, db: Session = Depends(get_db)):
+async def get_certificate_key(student_id: str, db: AsyncSession = Depends(get_async_db)):
     """
     Get AES key for a certificate (admin only in production)
     """
-    cert_key = db.query(CertificateKey).filter(CertificateKey.student_id == student_id).first()
+    cert_key = await CertificateService.get_certificate_by_nim(db, student_id)
     if not cert_key:
         raise HTTPException(status_code=404, detail="Key not found")
     
     return {"student_id": student_id, "aes_key": cert_key.aes_key}
 
+@router.get("/cohort/{cohort_id}")
+async def get_cohort(
+    cohort_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    contract_service: AsyncContractService = Depends(get_async_contract_service)
+):
+    """
+    Get a cohort's Merkle root for signing (proposeCohort / signCohortIssuance)
+    and its on-chain state once proposed
+    """
+    cohort = await CohortService.get_cohort(db, cohort_id)
+    if not cohort:
+        raise HTTPException(status_code=404, detail="Cohort not found")
+    state = await contract_service.get_cohort_state(cohort_id)
+    return {
+        "cohort_id": cohort.cohort_id,
+        "merkle_root": cohort.merkle_root,
+        "size": cohort.size,
+        "anchored": state["exists"] and state["cohort"]["merkleRoot"] == cohort.merkle_root,
+        "blockchain": state["cohort"]
+    }
+
+@router.get("/cohort/{cohort_id}/proof/{student_id}")
+async def get_cohort_proof(cohort_id: str, student_id: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get the Merkle proof of a certificate under its cohort root
+    """
+    member = await CohortService.get_member(db, student_id)
+    if not member or member.cohort_id != cohort_id:
+        raise HTTPException(status_code=404, detail="Certificate not found in cohort")
+    return CohortService.member_to_dict(member)
+
 @router.get("/blockchain/all")
-async def get_all_certificates_from_blockchain():
-    """Get all certificates from blockchain smart contract"""
+async def get_all_certificates_from_blockchain(
+    cursor: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    format: str = Query("ndjson", pattern="^(ndjson|columnar)$"),
+    contract_service: AsyncContractService = Depends(get_async_contract_service)
+):
+    """
+    Stream certificates from blockchain smart contract as NDJSON
+    One certificate per line, then a summary line {"next_cursor", "count"}.
+    If a page cannot be read, the stream ends with {"error", "next_cursor"} instead of
+    the summary; resume from that `next_cursor`
+    With `limit`, one page starting at `cursor` is returned; pass `next_cursor` back as
+    `cursor` for the next page. Without `limit`, every certificate from `cursor` is streamed.
+    Served from the event index, with `indexed_block` in the summary, when INDEXER_ENABLED is set
+    With `format=columnar`, one JSON object of parallel arrays (studentIds, certHashes, ...)
+    plus the summary fields is returned instead
+    """
+    if format == "columnar":
+        return await get_certificate_columns(contract_service, cursor, limit)
+
+    async def generate_lines():
+        db = AsyncSessionLocal() if INDEXER_ENABLED else None
+        try:
+            page_size = limit or CERTIFICATE_PAGE_SIZE
+            offset = cursor
+            count = 0
+            next_cursor = None
+            while True:
+                if db is not None:
+                    page = await CertificateIndexService.get_certificates_page(db, offset, page_size)
+                else:
+                    try:
+                        page = await contract_service.get_certificates_page(offset, page_size)
+                    except Exception as e:
+                        print(f"Error getting certificates page: {str(e)}")
+                        yield json.dumps({"error": "Failed to read certificates from blockchain", "next_cursor": offset}) + "\n"
+                        return
+                for certificate in page:
+                    yield json.dumps(certificate) + "\n"
+                count += len(page)
+                offset += len(page)
+                if len(page) < page_size:
+                    break
+                if limit:
+                    next_cursor = offset
+                    break
+
+            summary = {"next_cursor": next_cursor, "count": count}
+            if db is not None:
+                summary["indexed_block"] = await CertificateIndexService.get_indexed_block(db)
+            yield json.dumps(summary) + "\n"
+        finally:
+            if db is not None:
+                await db.close()
+
+    return StreamingResponse(generate_lines(), media_type="application/x-ndjson")
+
+async def get_certificate_columns(
+    contract_service: AsyncContractService,
+    cursor: int,
+    limit: Optional[int]
+) -> Response:
+    """
+    Columnar variant of /blockchain/all for dashboards and exports
+    Pages are appended column by column and serialized once with orjson
+    """
+    db = AsyncSessionLocal() if INDEXER_ENABLED else None
     try:
-        certificates = contract_service.get_all_certificates()
-        return {
-            "success": True,
-            "certificates": certificates,
-            "count": len(certificates)
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to fetch certificates from blockchain: {str(e)}"
-        )
+        page_size = limit or CERTIFICATE_PAGE_SIZE
+        offset = cursor
+        columns = None
+        next_cursor = None
+        while True:
+            if db is not None:
+                page = await CertificateIndexService.get_certificate_columns(db, offset, page_size)
+            else:
+                try:
+                    page = await contract_service.get_certificate_columns(offset, page_size)
+                except Exception as e:
+                    print(f"Error getting certificate columns: {str(e)}")
+                    raise HTTPException(status_code=500, detail="Failed to read certificates from blockchain")
+            if columns is None:
+                columns = page
+            else:
+                for name, values in page.items():
+                    columns[name].extend(values)
+            page_count = len(page["studentIds"])
+            offset += page_count
+            if page_count < page_size:
+                break
+            if limit:
+                next_cursor = offset
+                break
+
+        payload = {**columns, "next_cursor": next_cursor, "count": len(columns["studentIds"])}
+        if db is not None:
+            payload["indexed_block"] = await CertificateIndexService.get_indexed_block(db)
+        return Response(content=orjson.dumps(payload), media_type="application/json")
+    finally:
+        if db is not None:
+            await db.close()
 
 @router.post("/sign/prepare", response_model=SignCertificateResponse)
 async def prepare_certificate_signing(
     request: SignCertificateRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    contract_service: AsyncContractService = Depends(get_async_contract_service)
 ):
     """
     Prepare certificate data for signing
     Returns certificate hash and blockchain data for frontend to sign
     """
     try:
-        if not contract_service.certificate_exists(request.student_id):
+        state = await contract_service.get_certificate_state(request.student_id)
+        if not state["exists"]:
+            state = await CohortService.get_certificate_state(db, contract_service, request.student_id)
+        if not state["exists"]:
             raise HTTPException(status_code=404, detail="Certificate not found on blockchain")
         
-        cert_data = contract_service.get_certificate(request.student_id)
+        cert_data = state["certificate"]
         if not cert_data:
             raise HTTPException(status_code=404, detail="Failed to retrieve certificate data")
         
@@ -331,3 +608,194 @@ async def prepare_certificate_signing(
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to prepare signing: {str(e)}")
+
+@router.post("/signatures", response_model=CertificateSignaturesResponse)
+async def get_certificate_signatures(
+    request: CertificateSignaturesRequest,
+    contract_service: AsyncContractService = Depends(get_async_contract_service)
+):
+    """
+    Get issue and revoke signatures for many certificates at once (audit export)
+    """
+    signatures = await contract_service.get_certificate_signatures_bulk(request.student_ids)
+    return CertificateSignaturesResponse(success=True, signatures=signatures)
+
+@router.get("/rpc/stats")
+def get_rpc_stats(contract_service: AsyncContractService = Depends(get_async_contract_service)):
+    """
+    Per-endpoint latency, error and hedging statistics of the RPC pool
+    """
+    return {"endpoints": contract_service.w3.provider.pool.stats()}
+
+@router.get("/ipfs-cache/stats")
+def get_ipfs_cache_stats(blob_cache: BlobCache = Depends(get_blob_cache)):
+    """
+    Hit ratio, bytes saved and size of the on-disk IPFS blob cache
+    """
+    return blob_cache.stats()
+
+async def stream_decrypted(
+    ipfs_service: AsyncIPFSService,
+    encryption_service: AESEncryptionService,
+    ipfs_cid: str,
+    aes_key: str,
+    expected_hash: Optional[str],
+    media_type: str,
+    filename: str,
+    compression: Optional[CompressionService] = None
+) -> StreamingResponse:
+    """
+    Decrypt an IPFS payload into a spool, check its sha256 and stream it to the client
+    Nothing is sent before the whole payload has been verified
+    """
+    try:
+        spool, digest, size = await PayloadStreamService.download_decrypt(
+            ipfs_service, encryption_service, ipfs_cid, aes_key, compression
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid decryption key")
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Failed to retrieve file from IPFS: {str(e)}")
+
+    if expected_hash and digest != expected_hash.lower():
+        spool.close()
+        raise HTTPException(status_code=409, detail="File hash mismatch")
+
+    return StreamingResponse(
+        PayloadStreamService.iter_spool(spool),
+        media_type=media_type,
+        headers={
+            "Content-Length": str(size),
+            "Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}",
+            "X-Content-SHA256": digest
+        }
+    )
+
+@router.get("/download/{student_id}")
+async def download_certificate(
+    student_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    contract_service: AsyncContractService = Depends(get_async_contract_service),
+    ipfs_service: AsyncIPFSService = Depends(get_async_ipfs_service),
+    encryption_service: AESEncryptionService = Depends(get_encryption_service),
+    compression: CompressionService = Depends(get_compression_service)
+):
+    """
+    Stream the decrypted certificate after checking it against the on-chain hash
+    """
+    state = await contract_service.get_certificate_state(student_id)
+    cert_data = state["certificate"]
+    if not state["exists"] or not cert_data:
+        raise HTTPException(status_code=404, detail="Certificate not found on blockchain")
+
+    certificate_key = await CertificateService.get_certificate_by_nim(db, student_id)
+    if not certificate_key:
+        raise HTTPException(status_code=404, detail="AES key not found")
+
+    return await stream_decrypted(
+        ipfs_service,
+        encryption_service,
+        cert_data["ipfsCID"],
+        certificate_key.aes_key,
+        cert_data["certHash"],
+        "text/plain; charset=utf-8",
+        f"certificate_{student_id}.txt",
+        compression
+    )
+
+@router.post("/attachment", response_model=AttachmentUploadResponse)
+async def upload_attachment(
+    student_id: str = Form(...),
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_async_db),
+    ipfs_service: AsyncIPFSService = Depends(get_async_ipfs_service),
+    encryption_service: AESEncryptionService = Depends(get_encryption_service)
+):
+    """
+    Encrypt an attachment (scanned PDF, transcript) with the certificate key and upload it
+    The file is read, encrypted and uploaded chunk by chunk
+    """
+    certificate_key = await CertificateService.get_certificate_by_nim(db, student_id)
+    if not certificate_key:
+        raise HTTPException(status_code=404, detail="AES key not found")
+
+    async def read_chunks() -> AsyncIterator[bytes]:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            yield chunk
+
+    filename = file.filename or "attachment"
+    ipfs_cid, sha256, size = await PayloadStreamService.encrypt_upload(
+        ipfs_service,
+        encryption_service,
+        read_chunks(),
+        certificate_key.aes_key,
+        f"attachment_{student_id}.enc"
+    )
+    if not ipfs_cid:
+        raise HTTPException(status_code=500, detail="Failed to upload to IPFS")
+
+    return AttachmentUploadResponse(
+        success=True,
+        message="Attachment encrypted and uploaded",
+        student_id=student_id,
+        ipfs_cid=ipfs_cid,
+        sha256=sha256,
+        size=size,
+        filename=filename
+    )
+
+@router.get("/attachment/{student_id}/{ipfs_cid}")
+async def download_attachment(
+    student_id: str,
+    ipfs_cid: str,
+    sha256: Optional[str] = Query(None, pattern="^[0-9a-fA-F]{64}$"),
+    filename: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    ipfs_service: AsyncIPFSService = Depends(get_async_ipfs_service),
+    encryption_service: AESEncryptionService = Depends(get_encryption_service)
+):
+    """
+    Stream a decrypted attachment, checked against `sha256` when given
+    """
+    certificate_key = await CertificateService.get_certificate_by_nim(db, student_id)
+    if not certificate_key:
+        raise HTTPException(status_code=404, detail="AES key not found")
+
+    filename = filename or f"attachment_{student_id}"
+    return await stream_decrypted(
+        ipfs_service,
+        encryption_service,
+        ipfs_cid,
+        certificate_key.aes_key,
+        sha256,
+        mimetypes.guess_type(filename)[0] or "application/octet-stream",
+        filename
+    )
+
+@router.get("/verify-cache/stats")
+def get_verify_cache_stats(verify_cache: VerificationCache = Depends(get_verification_cache)):
+    """
+    Hit ratio, invalidations and event watcher lag of the verification result cache
+    """
+    return verify_cache.stats()
+
+@router.get("/verify-memo/stats")
+def get_verify_memo_stats(verify_memo: PublicVerifyMemo = Depends(get_verify_memo)):
+    """
+    Hit ratio, coalesced requests and memory use of the /verify-public memo
+    """
+    return verify_memo.stats()
+
+@router.get("/compression/stats")
+def get_compression_stats(compression: CompressionService = Depends(get_compression_service)):
+    """
+    Whether payload compression is on and which dictionary new certificates use
+    """
+    return compression.stats()
+
+@router.get("/ipfs-pin/stats")
+def get_ipfs_pin_stats(pin_queue: PinQueue = Depends(get_pin_queue)):
+    """
+    Pending, pinned, retried and mismatched background IPFS uploads
+    """
+    return pin_queue.stats()
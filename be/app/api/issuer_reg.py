@@ -1,8 +1,8 @@
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.connection import get_db
+from app.database.connection import get_async_db
 from app.services.issuer_registration import IssuerRegistrationService
 from app.models.Issuer_registration import IssuerStatus
 from app.schemas.issuer_registration import (
@@ -18,11 +18,11 @@ router = APIRouter()
     response_model=IssuerRegistrationResponse,
     status_code=status.HTTP_201_CREATED,
 )
-def create_registration(
+async def create_registration(
     data: IssuerRegistrationCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    existing_registration = IssuerRegistrationService.get_by_wallet(
+    existing_registration = await IssuerRegistrationService.get_by_wallet(
         db, data.wallet_address
     )
     if existing_registration:
@@ -31,7 +31,7 @@ def create_registration(
             detail="Issuer registration with this wallet address already exists",
         )
     try:
-        return IssuerRegistrationService.create_registration(
+        return await IssuerRegistrationService.create_registration(
             db=db,
             name=data.name,
             wallet_address=data.wallet_address,
@@ -46,11 +46,11 @@ def create_registration(
     "/issuer-registrations/{id_registration}",
     response_model=IssuerRegistrationResponse,
 )
-def get_registration(
+async def get_registration(
     id_registration: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    registration = IssuerRegistrationService.get_by_id(db, id_registration)
+    registration = await IssuerRegistrationService.get_by_id(db, id_registration)
     if not registration:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -62,7 +62,7 @@ def get_registration(
     "/issuer-registrations",
     response_model=IssuerRegistrationListResponse,
 )
-def get_registrations(
+async def get_registrations(
     name: Optional[str] = Query(None),
     status: Optional[IssuerStatus] = Query(None),
     start_date: Optional[int] = Query(None, description="Unix timestamp"),
@@ -70,9 +70,9 @@ def get_registrations(
     sort: str = Query("latest", regex="^(latest|oldest)$"),
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return IssuerRegistrationService.get_all(
+    return await IssuerRegistrationService.get_all(
         db=db,
         name=name,
         status=status,
@@ -88,11 +88,11 @@ def get_registrations(
     "/issuer-registrations/{id_registration}/accept",
     response_model=IssuerRegistrationResponse,
 )
-def accept_registration(
+async def accept_registration(
     id_registration: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    registration = IssuerRegistrationService.accept_registration(
+    registration = await IssuerRegistrationService.accept_registration(
         db, id_registration
     )
     if not registration:
@@ -106,11 +106,11 @@ def accept_registration(
     "/issuer-registrations/{id_registration}/reject",
     response_model=IssuerRegistrationResponse,
 )
-def reject_registration(
+async def reject_registration(
     id_registration: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    registration = IssuerRegistrationService.reject_registration(
+    registration = await IssuerRegistrationService.reject_registration(
         db, id_registration
     )
     if not registration:
@@ -124,11 +124,11 @@ def reject_registration(
     "/issuer-registrations/{id_registration}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-def delete_registration(
+async def delete_registration(
     id_registration: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    success = IssuerRegistrationService.delete_registration(
+    success = await IssuerRegistrationService.delete_registration(
         db, id_registration
     )
     if not success:
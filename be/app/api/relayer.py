@@ -0,0 +1,184 @@
+import asyncio
+import json
+from typing import Dict
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from web3 import Web3
+
+from app.database.connection import get_async_db
+from app.schemas.relayer import (
+    RelayProposeRequest,
+    RelayProposeBatchRequest,
+    RelaySignRequest,
+    RelayRevokeRequest,
+    RelayTransactionResponse
+)
+from app.services.async_read_contract import AsyncContractService
+from app.services.container import get_async_contract_service, get_contract_service, get_relayer
+from app.services.read_contract import ContractService
+from app.services.relayer import TransactionRelayer
+from app.services.session import SessionService
+
+router = APIRouter(tags=["relayer"])
+
+async def require_issuer_session(
+    authorization: str = Header(...),
+    db: AsyncSession = Depends(get_async_db),
+    contract_service: ContractService = Depends(get_contract_service)
+) -> str:
+    """
+    Relayed transactions spend the server wallet's funds and sign as an issuer, so
+    they need a Bearer session token of an active issuer
+    """
+    scheme, _, token = authorization.partition(" ")
+    session = await SessionService.validate_session_token(db, token) if scheme.lower() == "bearer" else None
+    if not session or not await run_in_threadpool(contract_service.is_issuer, session.wallet_address):
+        raise HTTPException(status_code=401, detail="Issuer session required")
+    return session.wallet_address
+
+async def require_certificate_issuer(contract_service: AsyncContractService, student_id: str, wallet: str) -> Dict:
+    """
+    The relayer's signature counts toward the multisig threshold, so only an issuer of
+    the certificate itself may ask for it
+    Returns: the certificate data
+    """
+    cert_data = await contract_service.get_certificate(student_id)
+    if not cert_data:
+        raise HTTPException(status_code=404, detail="Certificate not found on blockchain")
+    issuers = {Web3.to_checksum_address(issuer) for issuer in cert_data["issuerWallets"]}
+    if Web3.to_checksum_address(wallet) not in issuers:
+        raise HTTPException(status_code=403, detail="Only issuers of this certificate can relay its signatures")
+    return cert_data
+
+def require_listed_issuer(certificate: RelayProposeRequest, wallet: str) -> None:
+    """
+    The relayer signs a proposal as an issuer, so the session wallet must be listed
+    on the certificate as well
+    """
+    try:
+        listed = {Web3.to_checksum_address(issuer) for issuer in certificate.issuer_wallets}
+    except ValueError:
+        raise HTTPException(status_code=400, detail="issuer_wallets must be addresses")
+    if Web3.to_checksum_address(wallet) not in listed:
+        raise HTTPException(status_code=403, detail="The session wallet must be one of the issuer wallets")
+
+async def relay(call) -> Dict:
+    try:
+        return await call
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to relay transaction: {str(e)}")
+
+@router.post("/propose", response_model=RelayTransactionResponse)
+async def relay_propose(
+    request: RelayProposeRequest,
+    wallet: str = Depends(require_issuer_session),
+    relayer: TransactionRelayer = Depends(get_relayer)
+):
+    """
+    Propose a certificate prepared by /issue from the relayer wallet, which signs its
+    hash as the first issuer
+    The session wallet must be one of the certificate's issuers
+    Returns once the node has accepted the transaction; poll /tx/{tx_hash} for the receipt
+    """
+    require_listed_issuer(request, wallet)
+    return await relay(relayer.propose_certificate(
+        request.student_id,
+        request.cert_hash,
+        request.ipfs_cid,
+        request.issuer_wallets,
+        request.requires_all_signatures
+    ))
+
+@router.post("/propose/batch")
+async def relay_propose_batch(
+    request: RelayProposeBatchRequest,
+    wallet: str = Depends(require_issuer_session),
+    relayer: TransactionRelayer = Depends(get_relayer)
+):
+    """
+    Propose many certificates; they share nonces, fee estimates and send batches
+    The session wallet must be one of the issuers of each certificate
+    Streams NDJSON in completion order: {"student_id", "success", "transaction" or "error"}
+    per certificate, then a summary line {"count", "submitted", "failed"}
+    """
+    async def propose_one(certificate: RelayProposeRequest) -> Dict:
+        try:
+            require_listed_issuer(certificate, wallet)
+            record = await relayer.propose_certificate(
+                certificate.student_id,
+                certificate.cert_hash,
+                certificate.ipfs_cid,
+                certificate.issuer_wallets,
+                certificate.requires_all_signatures
+            )
+            return {"student_id": certificate.student_id, "success": True, "transaction": record}
+        except HTTPException as e:
+            return {"student_id": certificate.student_id, "success": False, "error": e.detail}
+        except Exception as e:
+            return {"student_id": certificate.student_id, "success": False, "error": str(e)}
+
+    async def generate_lines():
+        tasks = [asyncio.ensure_future(propose_one(certificate)) for certificate in request.certificates]
+        submitted = 0
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                submitted += result["success"]
+                yield json.dumps(result) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+        count = len(request.certificates)
+        yield json.dumps({"count": count, "submitted": submitted, "failed": count - submitted}) + "\n"
+
+    return StreamingResponse(generate_lines(), media_type="application/x-ndjson")
+
+@router.post("/sign", response_model=RelayTransactionResponse)
+async def relay_sign_issuance(
+    request: RelaySignRequest,
+    wallet: str = Depends(require_issuer_session),
+    relayer: TransactionRelayer = Depends(get_relayer),
+    contract_service: AsyncContractService = Depends(get_async_contract_service)
+):
+    """
+    Add the relayer wallet's issuance signature to a proposed certificate
+    The session wallet must be one of the certificate's issuers
+    """
+    cert_data = await require_certificate_issuer(contract_service, request.student_id, wallet)
+    return await relay(relayer.sign_issuance(request.student_id, cert_data["certHash"]))
+
+@router.post("/revoke", response_model=RelayTransactionResponse)
+async def relay_sign_revocation(
+    request: RelayRevokeRequest,
+    wallet: str = Depends(require_issuer_session),
+    relayer: TransactionRelayer = Depends(get_relayer),
+    contract_service: AsyncContractService = Depends(get_async_contract_service)
+):
+    """
+    Add the relayer wallet's revocation signature to an issued certificate
+    The session wallet must be one of the certificate's issuers
+    """
+    await require_certificate_issuer(contract_service, request.student_id, wallet)
+    return await relay(relayer.sign_revocation(request.student_id, request.reason))
+
+@router.get("/tx/{tx_hash}", response_model=RelayTransactionResponse)
+def get_relayed_transaction(tx_hash: str, relayer: TransactionRelayer = Depends(get_relayer)):
+    """
+    Status of a relayed transaction, by its original or replacement hash
+    """
+    record = relayer.get_transaction(tx_hash)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    return record
+
+@router.get("/stats")
+def get_relayer_stats(relayer: TransactionRelayer = Depends(get_relayer)):
+    """
+    Nonce, fee, queue and receipt counters of the transaction relayer
+    """
+    return relayer.stats()
@@ -0,0 +1,67 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from app.schemas.template import (
+    TemplatePublishRequest,
+    TemplateResponse,
+    TemplateDetailResponse,
+    TemplateListResponse,
+)
+from app.services.compression import CompressionService
+from app.services.container import get_compression_service, get_template_registry
+from app.services.template_registry import TemplateRegistry
+
+router = APIRouter()
+
+@router.get("/templates", response_model=TemplateListResponse)
+async def list_templates(templates: TemplateRegistry = Depends(get_template_registry)):
+    """
+    List every template version, newest first per template
+    """
+    return TemplateListResponse(templates=await run_in_threadpool(templates.list_versions))
+
+@router.get("/templates/{template_id}", response_model=TemplateListResponse)
+async def list_template_versions(template_id: str, templates: TemplateRegistry = Depends(get_template_registry)):
+    """
+    List the versions of one template, newest first
+    """
+    versions = await run_in_threadpool(templates.list_versions, template_id)
+    if not versions:
+        raise HTTPException(status_code=404, detail="Template not found")
+    return TemplateListResponse(templates=versions)
+
+@router.get("/templates/{template_id}/{version}", response_model=TemplateDetailResponse)
+async def get_template(template_id: str, version: int, templates: TemplateRegistry = Depends(get_template_registry)):
+    """
+    Get one template version with its body
+    Verifiers can fetch the same body from IPFS by `ipfs_cid` and re-render the certificate
+    """
+    for row in await run_in_threadpool(templates.list_versions, template_id):
+        if row.version == version:
+            return row
+    raise HTTPException(status_code=404, detail="Template not found")
+
+@router.post("/templates", response_model=TemplateResponse, status_code=201)
+async def publish_template(
+    request: TemplatePublishRequest,
+    background_tasks: BackgroundTasks,
+    templates: TemplateRegistry = Depends(get_template_registry),
+    compression: CompressionService = Depends(get_compression_service)
+):
+    """
+    Publish the next version of a template and pin its body to IPFS
+    Placeholders: {student_name} {student_id} {birth_place} {birth_date} {degree} {issue_date}
+    The payload compression dictionary is retrained on the new version in the background
+    """
+    try:
+        published = await run_in_threadpool(
+            templates.publish,
+            request.template_id,
+            request.body,
+            request.faculty,
+            request.degree_title
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    background_tasks.add_task(compression.ensure_dictionary, templates)
+    return published
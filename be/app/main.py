@@ -5,8 +5,10 @@ from app.api.auth import router as auth_router
 from app.api.student import router as student_router
 from app.api.certificate import router as certificate_router
 from app.api.issuer_reg import router as issuer_registration_router
+from app.api.template import router as template_router
+from app.api.relayer import router as relayer_router
 from app.utils.config import settings
-from app.database.connection import engine, Base
+from app.database.connection import async_engine, engine, Base
 
 # Import all models to ensure they are registered with Base
 from app.models.user import User
@@ -15,6 +17,12 @@ from app.models.session import Session
 from app.models.student import Student
 from app.models.certificate import Certificate
 from app.models.Issuer_registration import Issuer_registration
+from app.models.certificate_index import IndexedCertificate, IndexedCertificateEvent, IndexerCheckpoint
+from app.models.cohort import Cohort, CohortMember
+from app.models.certificate_template import CertificateTemplate
+from app.models.compression_dictionary import CompressionDictionary
+from app.services.indexer import CertificateIndexer, INDEXER_ENABLED
+from app.services.container import container
 
 # Create all tables
 Base.metadata.create_all(bind=engine)
@@ -34,6 +42,39 @@ app.include_router(auth_router, prefix="/api/auth", tags=["authentication"])
 app.include_router(student_router, prefix="/api", tags=["students"])
 app.include_router(certificate_router, prefix="/api/certificate", tags=["certificates"])
 app.include_router(issuer_registration_router, prefix="/api", tags=["issuer-registrations"])
+app.include_router(template_router, prefix="/api/certificate", tags=["templates"])
+app.include_router(relayer_router, prefix="/api/relayer", tags=["relayer"])
+
+certificate_indexer = None
+
+@app.on_event("startup")
+def start_certificate_indexer():
+    global certificate_indexer
+    if INDEXER_ENABLED:
+        certificate_indexer = CertificateIndexer()
+        certificate_indexer.start()
+
+@app.on_event("startup")
+def start_pin_queue():
+    # Resume background IPFS uploads left by a previous run
+    container.get("pin_queue").start()
+
+@app.on_event("startup")
+def publish_default_template():
+    # First run: the built-in ijazah template becomes version 1 of the default template
+    container.get("templates").ensure_default()
+    # Train the payload compression dictionary on the published templates if needed
+    container.get("compression").ensure_dictionary(container.get("templates"))
+
+@app.on_event("shutdown")
+def stop_certificate_indexer():
+    if certificate_indexer:
+        certificate_indexer.stop()
+
+@app.on_event("shutdown")
+async def close_services():
+    await container.close()
+    await async_engine.dispose()
 
 @app.get("/")
 def read_root():
@@ -4,5 +4,7 @@ from app.models.nonce import Nonce
 from app.models.session import Session
 from app.models.user import User
 from app.models.Issuer_registration import Issuer_registration
+from app.models.certificate_index import IndexedCertificate, IndexedCertificateEvent, IndexerCheckpoint
 
-__all__ = ["Student", "Certificate", "Nonce", "Session", "User", "Issuer_registration"]
\ No newline at end of file
+__all__ = ["Student", "Certificate", "Nonce", "Session", "User", "Issuer_registration",
+           "IndexedCertificate", "IndexedCertificateEvent", "IndexerCheckpoint"]
\ No newline at end of file
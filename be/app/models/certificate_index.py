@@ -0,0 +1,52 @@
+from sqlalchemy import Column, String, Integer, BigInteger, Boolean, Text
+from app.database.connection import Base
+
+class IndexedCertificate(Base):
+    """
+    Indexed_certificates table
+    Current certificate state rebuilt from contract events.
+    Keyed by keccak256(studentId) because studentId is an indexed string in every event
+    """
+    __tablename__ = "indexed_certificates"
+
+    student_id_hash = Column(String, primary_key=True, index=True)
+    student_id = Column(String, nullable=True, index=True)
+    cert_hash = Column(String, nullable=False)
+    ipfs_cid = Column(String, nullable=False)
+    proposer = Column(String, nullable=True)
+    issuer_wallets = Column(Text, nullable=False, default="[]")  # JSON list of addresses
+    requires_all_signatures = Column(Boolean, nullable=False, default=True)
+    issue_signature_count = Column(Integer, nullable=False, default=0)
+    revoke_signature_count = Column(Integer, nullable=False, default=0)
+    is_valid = Column(Boolean, nullable=False, default=False)
+    revoke_reason = Column(String, nullable=False, default="")
+    timestamp_issued = Column(BigInteger, nullable=False)
+    timestamp_last_updated = Column(BigInteger, nullable=False)
+    proposed_block = Column(BigInteger, nullable=False, index=True)
+    proposed_log_index = Column(Integer, nullable=False)
+    last_block = Column(BigInteger, nullable=False)
+
+class IndexedCertificateEvent(Base):
+    """
+    Indexed_certificate_events table
+    Raw certificate events, one row per applied log
+    """
+    __tablename__ = "indexed_certificate_events"
+
+    tx_hash = Column(String, primary_key=True)
+    log_index = Column(Integer, primary_key=True)
+    block_number = Column(BigInteger, nullable=False, index=True)
+    event = Column(String, nullable=False)
+    student_id_hash = Column(String, nullable=False, index=True)
+    issuer = Column(String, nullable=True)
+    data = Column(Text, nullable=False, default="{}")  # JSON of the non-indexed event args
+
+class IndexerCheckpoint(Base):
+    """
+    Indexer_checkpoints table
+    Last fully applied block per indexer
+    """
+    __tablename__ = "indexer_checkpoints"
+
+    name = Column(String, primary_key=True)
+    block_number = Column(BigInteger, nullable=False)
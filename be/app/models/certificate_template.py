@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, Integer, BigInteger, Text
+from app.database.connection import Base
+
+class CertificateTemplate(Base):
+    """
+    Certificate_templates table
+    One row per published template version. Versions are immutable; the body is
+    pinned to IPFS under ipfs_cid so verifiers can fetch it without trusting the backend
+    """
+    __tablename__ = "certificate_templates"
+
+    template_id = Column(String, primary_key=True, index=True)
+    version = Column(Integer, primary_key=True)
+    faculty = Column(String, nullable=False, default="")
+    degree_title = Column(String, nullable=False, default="")
+    body = Column(Text, nullable=False)
+    ipfs_cid = Column(String, nullable=False)
+    sha256 = Column(String, nullable=False)
+    created_at = Column(BigInteger, nullable=False)
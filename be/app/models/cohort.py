@@ -0,0 +1,29 @@
+from sqlalchemy import Column, String, Integer, BigInteger, Text
+from app.database.connection import Base
+
+class Cohort(Base):
+    """
+    Cohorts table
+    Merkle root built over a batch of certificates, to be anchored with proposeCohort
+    """
+    __tablename__ = "cohorts"
+
+    cohort_id = Column(String, primary_key=True, index=True)
+    merkle_root = Column(String, nullable=False)
+    size = Column(Integer, nullable=False)
+    created_at = Column(BigInteger, nullable=False)
+
+class CohortMember(Base):
+    """
+    Cohort_members table
+    Merkle proof of one certificate, stored next to its key in certificate_keys.
+    Cohort certificates are not stored on chain individually, so the hash and CID live here
+    """
+    __tablename__ = "cohort_members"
+
+    student_id = Column(String, primary_key=True, index=True)
+    cohort_id = Column(String, nullable=False, index=True)
+    leaf_index = Column(Integer, nullable=False)
+    cert_hash = Column(String, nullable=False)
+    ipfs_cid = Column(String, nullable=False)
+    merkle_proof = Column(Text, nullable=False, default="[]")  # JSON list of hex siblings
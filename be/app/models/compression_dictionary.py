@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, BigInteger, LargeBinary, Text
+from app.database.connection import Base
+
+class CompressionDictionary(Base):
+    """
+    Compression_dictionaries table
+    zstd dictionaries trained on the certificate templates. dict_id is written in the
+    header of every envelope compressed with it, so rows must never be deleted
+    """
+    __tablename__ = "compression_dictionaries"
+
+    dict_id = Column(Integer, primary_key=True, autoincrement=True)
+    data = Column(LargeBinary, nullable=False)
+    trained_on = Column(Text, nullable=False, default="[]")  # JSON list of "template_id:version"
+    created_at = Column(BigInteger, nullable=False)
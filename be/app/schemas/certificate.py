@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 
 class IssueCertificateRequest(BaseModel):
@@ -10,6 +10,9 @@ class IssueCertificateRequest(BaseModel):
     issue_date: str
     issuer_wallets: List[str]
     requires_all_signatures: bool = True
+    # Default template, latest version when not given
+    template_id: Optional[str] = None
+    template_version: Optional[int] = None
 
 class IssueCertificateResponse(BaseModel):
     success: bool
@@ -18,6 +21,9 @@ class IssueCertificateResponse(BaseModel):
     ipfs_cid: Optional[str] = None
     cert_hash: Optional[str] = None
     aes_key: Optional[str] = None
+    template_id: Optional[str] = None
+    template_version: Optional[int] = None
+    template_cid: Optional[str] = None
 
 class VerifyCertificateRequest(BaseModel):
     student_id: str
@@ -30,10 +36,18 @@ class VerifyCertificateResponse(BaseModel):
     ipfs_cid: Optional[str] = None
     file_url: Optional[str] = None
 
+class BatchVerifyRequest(BaseModel):
+    student_ids: List[str] = Field(..., min_length=1, max_length=1000)
+
 class PublicVerifyRequest(BaseModel):
     ipfs_cid: str
     aes_key: str
     cert_hash: str
+    # Cohort certificates: checked by Merkle proof against the anchored cohort root.
+    # Without merkle_proof, the proof stored for student_id is used
+    cohort_id: Optional[str] = None
+    student_id: Optional[str] = None
+    merkle_proof: Optional[List[str]] = None
 
 class PublicVerifyResponse(BaseModel):
     success: bool
@@ -51,4 +65,20 @@ class SignCertificateResponse(BaseModel):
     student_id: Optional[str] = None
     cert_hash: Optional[str] = None
     ipfs_cid: Optional[str] = None
-    certificate_data: Optional[dict] = None
\ No newline at end of file
+    certificate_data: Optional[dict] = None
+
+class CertificateSignaturesRequest(BaseModel):
+    student_ids: List[str] = Field(..., min_length=1, max_length=1000)
+
+class CertificateSignaturesResponse(BaseModel):
+    success: bool
+    signatures: dict
+
+class AttachmentUploadResponse(BaseModel):
+    success: bool
+    message: str
+    student_id: str
+    ipfs_cid: Optional[str] = None
+    sha256: Optional[str] = None
+    size: Optional[int] = None
+    filename: Optional[str] = None
@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+
+class RelayProposeRequest(BaseModel):
+    student_id: str
+    cert_hash: str
+    ipfs_cid: str
+    # Must include the relayer wallet and the session wallet, and need more than the
+    # relayer's signature to issue
+    issuer_wallets: List[str]
+    requires_all_signatures: bool = True
+
+class RelayProposeBatchRequest(BaseModel):
+    certificates: List[RelayProposeRequest] = Field(..., min_length=1, max_length=1000)
+
+class RelaySignRequest(BaseModel):
+    student_id: str
+
+class RelayRevokeRequest(BaseModel):
+    student_id: str
+    reason: str
+
+class RelayTransactionResponse(BaseModel):
+    tx_hash: str
+    nonce: int
+    function: str
+    student_id: Optional[str] = None
+    # pending, confirmed, reverted or dropped
+    status: str
+    submitted_at: int
+    block_number: Optional[int] = None
+    gas_used: Optional[int] = None
+    error: Optional[str] = None
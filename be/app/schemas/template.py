@@ -0,0 +1,26 @@
+from typing import List
+from pydantic import BaseModel, Field
+
+class TemplatePublishRequest(BaseModel):
+    template_id: str = Field(..., min_length=1, max_length=64, pattern="^[a-z0-9-]+$")
+    body: str = Field(..., min_length=1)
+    faculty: str = ""
+    degree_title: str = ""
+
+class TemplateResponse(BaseModel):
+    template_id: str
+    version: int
+    faculty: str
+    degree_title: str
+    ipfs_cid: str
+    sha256: str
+    created_at: int
+
+    class Config:
+        from_attributes = True
+
+class TemplateDetailResponse(TemplateResponse):
+    body: str
+
+class TemplateListResponse(BaseModel):
+    templates: List[TemplateResponse]
@@ -0,0 +1,229 @@
+import asyncio
+import os
+import secrets
+from typing import AsyncIterable, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+from fastapi.concurrency import run_in_threadpool
+
+from app.services.blob_cache import BlobCache
+from app.services.ipfs import IPFS_ADD_BATCH_SIZE, parse_add_response, split_batch_files
+from app.services.unixfs import add_params
+
+class AsyncIPFSService:
+    """
+    Non-blocking counterpart of IPFSService for async routes
+    One httpx client with a keep-alive pool is shared by every request; blob cache
+    disk reads and writes run in the threadpool
+    """
+
+    def __init__(self, blob_cache: Optional[BlobCache] = None):
+        self.blob_cache = blob_cache
+        self.ipfs_url = os.getenv('IPFS_URL', 'http://127.0.0.1:5001')
+        self.gateway_url = os.getenv('IPFS_GATEWAY', 'http://127.0.0.1:8080/ipfs')
+        self.pool_size = int(os.getenv('IPFS_POOL_SIZE', '20'))
+        self.chunk_size = int(os.getenv('IPFS_CHUNK_SIZE', str(256 * 1024)))
+        self.timeout = httpx.Timeout(
+            float(os.getenv('IPFS_READ_TIMEOUT', '30')),
+            connect=float(os.getenv('IPFS_CONNECT_TIMEOUT', '5'))
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def slots(self) -> asyncio.Semaphore:
+        """
+        httpcore rescans its whole wait queue on every release, so bursts are queued
+        here instead and only `pool_size` requests ever reach the pool
+        Created on first use: on Python 3.9 a semaphore binds the current thread's event
+        loop, and the container may build this service in a threadpool worker
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size)
+        return self._slots
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Created on first use, inside the running event loop"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.ipfs_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size
+                )
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def upload_file(self, file_content: bytes, filename: str) -> Optional[str]:
+        """
+        Upload file to IPFS and return CID
+        """
+        try:
+            async with self.slots:
+                response = await self.client.post(
+                    '/api/v0/add',
+                    params=add_params(),
+                    files={'file': (filename, file_content)}
+                )
+            response.raise_for_status()
+            cid = response.json()['Hash']
+            if self.blob_cache:
+                await run_in_threadpool(self.blob_cache.put, cid, file_content)
+            print(f"File uploaded to IPFS: {cid}")
+            return cid
+        except Exception as e:
+            print(f"Error uploading to IPFS: {str(e)}")
+            return None
+
+    async def upload_many(self, files: List[Tuple[str, bytes]], wrap_with_directory: bool = False) -> Dict:
+        """
+        Upload many files with one multipart /api/v0/add per IPFS_ADD_BATCH_SIZE files
+        Batches are sent concurrently; see IPFSService.upload_many for the semantics
+        Returns: {"cids": {filename: CID}, "errors": {filename: error}, "directory": CID or None}
+        """
+        valid, errors = split_batch_files(files)
+        batch_size = max(len(valid) if wrap_with_directory else IPFS_ADD_BATCH_SIZE, 1)
+        batches = [valid[start:start + batch_size] for start in range(0, len(valid), batch_size)]
+
+        async def upload_batch(batch: List[Tuple[str, bytes]]) -> Tuple[Dict[str, str], Optional[str]]:
+            try:
+                async with self.slots:
+                    response = await self.client.post(
+                        '/api/v0/add',
+                        params={**add_params(), 'wrap-with-directory': 'true' if wrap_with_directory else 'false'},
+                        files=[('file', (filename, content)) for filename, content in batch]
+                    )
+                response.raise_for_status()
+                return parse_add_response(response.text)
+            except Exception as e:
+                print(f"Error uploading batch to IPFS: {str(e)}")
+                if wrap_with_directory:
+                    errors.update({filename: str(e) for filename, _ in batch})
+                    return {}, None
+                results = await asyncio.gather(*[self.upload_file(content, filename) for filename, content in batch])
+                batch_cids = {}
+                for (filename, _), cid in zip(batch, results):
+                    if cid:
+                        batch_cids[filename] = cid
+                    else:
+                        errors[filename] = "Upload failed"
+                return batch_cids, None
+
+        cids = {}
+        directory = None
+        for batch, (batch_cids, batch_directory) in zip(batches, await asyncio.gather(*[upload_batch(batch) for batch in batches])):
+            directory = batch_directory or directory
+            for filename, content in batch:
+                cid = batch_cids.get(filename)
+                if cid is None:
+                    errors.setdefault(filename, "Missing from IPFS response")
+                    continue
+                cids[filename] = cid
+                if self.blob_cache:
+                    await run_in_threadpool(self.blob_cache.put, cid, content)
+
+        print(f"Uploaded {len(cids)} files to IPFS, {len(errors)} failed")
+        return {"cids": cids, "errors": errors, "directory": directory}
+
+    async def get_file(self, cid: str) -> Optional[bytes]:
+        """
+        Retrieve file from IPFS by CID
+        """
+        if self.blob_cache:
+            cached = await run_in_threadpool(self.blob_cache.get, cid)
+            if cached is not None:
+                return cached
+        try:
+            async with self.slots:
+                response = await self.client.post('/api/v0/cat', params={"arg": cid})
+            response.raise_for_status()
+            if self.blob_cache:
+                await run_in_threadpool(self.blob_cache.put, cid, response.content)
+            return response.content
+        except Exception as e:
+            print(f"Error retrieving from IPFS: {str(e)}")
+            return None
+
+    async def iter_file(self, cid: str) -> AsyncIterator[bytes]:
+        """
+        Stream a file from IPFS in IPFS_CHUNK_SIZE chunks, from the blob cache when present
+        A complete download is staged into the cache as it streams
+        Raises on errors, since a failure can happen after chunks were yielded
+        """
+        cached = await run_in_threadpool(self.blob_cache.open, cid) if self.blob_cache else None
+        if cached is not None:
+            try:
+                while chunk := await run_in_threadpool(cached.read, self.chunk_size):
+                    yield chunk
+            finally:
+                cached.close()
+            return
+
+        writer = await run_in_threadpool(self.blob_cache.writer, cid) if self.blob_cache else None
+        try:
+            async with self.slots:
+                async with self.client.stream('POST', '/api/v0/cat', params={"arg": cid}) as response:
+                    response.raise_for_status()
+                    async for chunk in response.aiter_bytes(self.chunk_size):
+                        if writer:
+                            await run_in_threadpool(writer.write, chunk)
+                        yield chunk
+            if writer:
+                await run_in_threadpool(writer.commit)
+        finally:
+            if writer:
+                writer.abort()
+
+    async def upload_stream(self, chunks: AsyncIterable[bytes], filename: str) -> Optional[str]:
+        """
+        Upload a file to IPFS from an async iterable of chunks and return the CID
+        The multipart body is streamed, so the file is never held in memory
+        """
+        boundary = secrets.token_hex(16)
+        writer = await run_in_threadpool(self.blob_cache.writer) if self.blob_cache else None
+
+        async def body() -> AsyncIterator[bytes]:
+            yield (
+                f'--{boundary}\r\n'
+                f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+                'Content-Type: application/octet-stream\r\n\r\n'
+            ).encode()
+            async for chunk in chunks:
+                if writer:
+                    await run_in_threadpool(writer.write, chunk)
+                yield chunk
+            yield f'\r\n--{boundary}--\r\n'.encode()
+
+        try:
+            async with self.slots:
+                response = await self.client.post(
+                    '/api/v0/add',
+                    params=add_params(),
+                    content=body(),
+                    headers={'Content-Type': f'multipart/form-data; boundary={boundary}'}
+                )
+            response.raise_for_status()
+            cid = response.json()['Hash']
+            if writer:
+                await run_in_threadpool(writer.commit, cid)
+            print(f"File uploaded to IPFS: {cid}")
+            return cid
+        except Exception as e:
+            print(f"Error uploading to IPFS: {str(e)}")
+            return None
+        finally:
+            if writer:
+                writer.abort()
+
+    def get_gateway_url(self, cid: str) -> str:
+        """
+        Get public gateway URL for CID
+        """
+        return f"{self.gateway_url}/{cid}"
@@ -0,0 +1,357 @@
+import asyncio
+import os
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import aiohttp
+from dotenv import load_dotenv
+from web3 import AsyncWeb3, Web3
+
+from app.services.read_contract import (
+    CONTRACT_ABI,
+    MULTICALL3_ABI,
+    MULTICALL3_ADDRESS,
+    aggregate3_request,
+    aggregate3_results,
+    batch_responses_to_results,
+    decode_batch_results,
+    direct_call_requests,
+    encode_batch_calls,
+    format_certificate,
+    format_certificate_columns,
+    format_certificate_list,
+    format_cohort,
+    format_signatures,
+    signature_calls,
+)
+from app.services.rpc_pool import AsyncPooledHTTPProvider, rpc_urls_from_env
+
+load_dotenv()
+
+class AsyncContractService:
+    """
+    Non-blocking counterpart of ContractService for async routes
+    All calls share one aiohttp session, so concurrent requests reuse pooled connections
+    """
+
+    def __init__(self):
+        self.rpc_urls = rpc_urls_from_env()
+        self.contract_address = os.getenv('CONTRACT_ADDRESS')
+
+        if not self.rpc_urls:
+            raise ValueError("SEPOLIA_URLS or SEPOLIA_URL environment variable is not set")
+        if not self.contract_address:
+            raise ValueError("CONTRACT_ADDRESS environment variable is not set")
+
+        self.pool_size = int(os.getenv('RPC_POOL_SIZE', '100'))
+        self.timeout = float(os.getenv('RPC_TIMEOUT', '30'))
+
+        self.w3 = AsyncWeb3(AsyncPooledHTTPProvider(self.rpc_urls))
+        # The validation middleware fetches eth_chainId before every eth_call to check a
+        # chainId field that read-only calls never set
+        self.w3.middleware_onion.remove("validation")
+        self.contract = self.w3.eth.contract(
+            address=Web3.to_checksum_address(self.contract_address),
+            abi=CONTRACT_ABI
+        )
+        self.multicall = self.w3.eth.contract(
+            address=Web3.to_checksum_address(os.getenv('MULTICALL3_ADDRESS', MULTICALL3_ADDRESS)),
+            abi=MULTICALL3_ABI
+        )
+
+        self.batch_size = int(os.getenv('MULTICALL_BATCH_SIZE', '200'))
+        self.batch_concurrency = int(os.getenv('MULTICALL_CONCURRENCY', '4'))
+        # Checked on the first batched read; None until then
+        self._multicall_deployed: Optional[bool] = None
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock: Optional[asyncio.Lock] = None
+
+    # ========== SESSION ==========
+
+    async def _ensure_session(self) -> None:
+        """Create the shared aiohttp session on first use, inside the running event loop"""
+        if self._session is not None and not self._session.closed:
+            return
+        if self._session_lock is None:
+            self._session_lock = asyncio.Lock()
+        async with self._session_lock:
+            if self._session is not None and not self._session.closed:
+                return
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            await self.w3.provider.cache_async_session(self._session)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    # ========== BATCHED READS ==========
+
+    async def multicall_deployed(self) -> bool:
+        """
+        Whether Multicall3 has code on this chain, checked once
+        A fresh Hardhat node has none, so batches fall back to JSON-RPC batch requests
+        """
+        if self._multicall_deployed is None:
+            await self._ensure_session()
+            self._multicall_deployed = len(await self.w3.eth.get_code(self.multicall.address)) > 0
+            if not self._multicall_deployed:
+                print(f"Multicall3 is not deployed at {self.multicall.address}, batching reads as JSON-RPC batches")
+        return self._multicall_deployed
+
+    async def batch_call(self, calls: List[Tuple[str, list]]) -> List[Optional[tuple]]:
+        """
+        Execute several view calls in one round trip: a single eth_call through Multicall3,
+        or one JSON-RPC batch of eth_calls where Multicall3 is not deployed
+        Calls are split into MULTICALL_BATCH_SIZE chunks, at most MULTICALL_CONCURRENCY in flight
+        Returns: decoded outputs in the same order, None for calls that reverted
+        """
+        if not calls:
+            return []
+        await self._ensure_session()
+        use_multicall = await self.multicall_deployed()
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+
+        async def call_chunk(chunk: List[Tuple[str, list]]) -> List[Optional[tuple]]:
+            async with semaphore:
+                if use_multicall:
+                    return_data = await self.w3.eth.call(
+                        aggregate3_request(self.multicall.address, self.w3.codec, encode_batch_calls(self.contract, chunk))
+                    )
+                    results = aggregate3_results(self.w3.codec, return_data)
+                else:
+                    responses = await self.w3.provider.make_batch_request(direct_call_requests(self.contract, chunk))
+                    results = batch_responses_to_results(responses)
+            return decode_batch_results(self.w3.codec, chunk, results)
+
+        chunks = [calls[start:start + self.batch_size] for start in range(0, len(calls), self.batch_size)]
+        decoded = []
+        for chunk_results in await asyncio.gather(*[call_chunk(chunk) for chunk in chunks]):
+            decoded.extend(chunk_results)
+        return decoded
+
+    # ========== CERTIFICATE READ FUNCTIONS ==========
+
+    async def certificate_exists(self, student_id: str) -> bool:
+        """
+        Check if a certificate exists for a student ID
+        """
+        try:
+            await self._ensure_session()
+            return await self.contract.functions.certificateExistsFor(student_id).call()
+        except Exception as e:
+            print(f"Error checking certificate existence: {str(e)}")
+            return False
+
+    async def certificates_exist(self, student_ids: List[str]) -> Dict[str, Optional[bool]]:
+        """
+        Check existence of many certificates in batched Multicall3 calls
+        Returns: {student_id: exists}, None where the check itself failed
+        """
+        try:
+            results = await self.batch_call([("certificateExistsFor", [student_id]) for student_id in student_ids])
+            return {
+                student_id: bool(result[0]) if result else None
+                for student_id, result in zip(student_ids, results)
+            }
+        except Exception as e:
+            print(f"Error checking certificate existence: {str(e)}")
+            return {student_id: None for student_id in student_ids}
+
+    async def is_certificate_valid(self, student_id: str) -> bool:
+        """
+        Check if a certificate is valid (not revoked)
+        """
+        try:
+            await self._ensure_session()
+            return await self.contract.functions.isCertificateValid(student_id).call()
+        except Exception as e:
+            print(f"Error checking certificate validity: {str(e)}")
+            return False
+
+    async def get_certificate(self, student_id: str) -> Optional[Dict]:
+        """
+        Get full certificate details
+        Returns: Certificate data dictionary or None if not found
+        """
+        try:
+            await self._ensure_session()
+            cert = await self.contract.functions.getCertificate(student_id).call()
+            return format_certificate(cert)
+        except Exception as e:
+            print(f"Error getting certificate: {str(e)}")
+            return None
+
+    async def get_certificate_state(self, student_id: str) -> Dict:
+        """
+        Get existence, validity and full details of a certificate in one round trip
+        Returns: {exists, isValid, certificate}
+        """
+        try:
+            exists, cert = await self.batch_call([
+                ("certificateExistsFor", [student_id]),
+                ("getCertificate", [student_id])
+            ])
+            certificate = format_certificate(cert) if cert else None
+            return {
+                "exists": bool(exists and exists[0]),
+                "isValid": bool(certificate and certificate["isValid"]),
+                "certificate": certificate
+            }
+        except Exception as e:
+            print(f"Error getting certificate state: {str(e)}")
+            return {"exists": False, "isValid": False, "certificate": None}
+
+    async def get_cohort_state(self, cohort_id: str, leaf: Optional[bytes] = None) -> Dict:
+        """
+        Get a cohort and, given a certificate leaf, its revocation status in one round trip
+        Returns: {exists, cohort, revoked}
+        """
+        try:
+            calls = [("getCohort", [cohort_id])]
+            if leaf is not None:
+                calls.append(("isCohortCertificateRevoked", [cohort_id, leaf]))
+            results = await self.batch_call(calls)
+            cohort = format_cohort(results[0]) if results[0] else None
+            return {
+                "exists": cohort is not None,
+                "cohort": cohort,
+                "revoked": bool(leaf is not None and results[1] and results[1][0])
+            }
+        except Exception as e:
+            print(f"Error getting cohort state: {str(e)}")
+            return {"exists": False, "cohort": None, "revoked": False}
+
+    async def get_certificate_states(self, student_ids: List[str]) -> Dict[str, Optional[Dict]]:
+        """
+        get_certificate_state for many certificates in batched Multicall3 calls
+        Returns: {student_id: {exists, isValid, certificate}}, None where the read failed
+        """
+        try:
+            results = await self.batch_call([
+                call
+                for student_id in student_ids
+                for call in (("certificateExistsFor", [student_id]), ("getCertificate", [student_id]))
+            ])
+        except Exception as e:
+            print(f"Error getting certificate states: {str(e)}")
+            return {student_id: None for student_id in student_ids}
+        states = {}
+        for index, student_id in enumerate(student_ids):
+            exists, cert = results[2 * index], results[2 * index + 1]
+            if exists is None:
+                states[student_id] = None
+                continue
+            certificate = format_certificate(cert) if cert else None
+            states[student_id] = {
+                "exists": bool(exists[0]),
+                "isValid": bool(certificate and certificate["isValid"]),
+                "certificate": certificate
+            }
+        return states
+
+    async def get_cohort_states(self, members: List[Tuple[str, bytes]]) -> Dict[Tuple[str, bytes], Dict]:
+        """
+        get_cohort_state for many (cohort_id, leaf) pairs: one getCohort per distinct
+        cohort and one isCohortCertificateRevoked per pair, in batched calls
+        Returns: {(cohort_id, leaf): {exists, cohort, revoked}}
+        """
+        cohort_ids = list(dict.fromkeys(cohort_id for cohort_id, _ in members))
+        not_found = {"exists": False, "cohort": None, "revoked": False}
+        try:
+            results = await self.batch_call(
+                [("getCohort", [cohort_id]) for cohort_id in cohort_ids]
+                + [("isCohortCertificateRevoked", [cohort_id, leaf]) for cohort_id, leaf in members]
+            )
+        except Exception as e:
+            print(f"Error getting cohort states: {str(e)}")
+            return {member: not_found for member in members}
+        cohorts = {
+            cohort_id: format_cohort(result) if result else None
+            for cohort_id, result in zip(cohort_ids, results)
+        }
+        return {
+            (cohort_id, leaf): {
+                "exists": cohorts[cohort_id] is not None,
+                "cohort": cohorts[cohort_id],
+                "revoked": bool(revoked and revoked[0])
+            }
+            for (cohort_id, leaf), revoked in zip(members, results[len(cohort_ids):])
+        }
+
+    async def get_all_certificate_signatures(self, student_id: str) -> Dict[str, List[Dict]]:
+        """
+        Get all signatures (issue and revoke) for a certificate
+        One call for the issuer list, one batched call for every signature
+        """
+        try:
+            cert = await self.get_certificate(student_id)
+            if not cert:
+                return {"issueSignatures": [], "revokeSignatures": []}
+
+            results = await self.batch_call(signature_calls(student_id, cert["issuerWallets"]))
+            return format_signatures(cert["issuerWallets"], results)
+        except Exception as e:
+            print(f"Error getting all signatures: {str(e)}")
+            return {"issueSignatures": [], "revokeSignatures": []}
+
+    async def get_certificate_signatures_bulk(self, student_ids: List[str]) -> Dict[str, Dict[str, List[Dict]]]:
+        """
+        Get all signatures for many certificates
+        One batched call for every issuer list, one batched call for every signature
+        Returns: {student_id: {issueSignatures, revokeSignatures}}
+        """
+        try:
+            certs = await self.batch_call([("getCertificate", [student_id]) for student_id in student_ids])
+            issuers = {
+                student_id: [str(addr) for addr in cert[3]] if cert else []
+                for student_id, cert in zip(student_ids, certs)
+            }
+            results = await self.batch_call([
+                call
+                for student_id in student_ids
+                for call in signature_calls(student_id, issuers[student_id])
+            ])
+
+            signatures = {}
+            position = 0
+            for student_id in student_ids:
+                count = 2 * len(issuers[student_id])
+                signatures[student_id] = format_signatures(issuers[student_id], results[position:position + count])
+                position += count
+            return signatures
+        except Exception as e:
+            print(f"Error getting bulk signatures: {str(e)}")
+            return {student_id: {"issueSignatures": [], "revokeSignatures": []} for student_id in student_ids}
+
+    async def get_certificates_page(self, offset: int, limit: int) -> List[Dict]:
+        """
+        Get a page of certificates from the smart contract
+        RPC errors are raised: an empty page would read as the end of the listing
+        """
+        await self._ensure_session()
+        result = await self.contract.functions.getCertificatesPage(offset, limit).call()
+        return format_certificate_list(result)
+
+    async def get_certificate_columns(self, offset: int, limit: int) -> Dict[str, list]:
+        """
+        Get a page of certificates as parallel columns, without building per-certificate dicts
+        """
+        await self._ensure_session()
+        result = await self.contract.functions.getCertificatesPage(offset, limit).call()
+        return format_certificate_columns(result)
+
+    async def iter_certificates(self, offset: int = 0, page_size: int = 100) -> AsyncIterator[Dict]:
+        """
+        Iterate over certificates page by page, one eth_call per page
+        """
+        while True:
+            page = await self.get_certificates_page(offset, page_size)
+            for certificate in page:
+                yield certificate
+            if len(page) < page_size:
+                return
+            offset += len(page)
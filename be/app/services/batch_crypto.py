@@ -0,0 +1,68 @@
+import hashlib
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from app.services.compression import DictionaryCompressor
+from app.services.encryption import AESEncryptionService
+from app.services.unixfs import compute_cid
+
+def seal_certificate(plaintext: bytes, compressor: Optional[DictionaryCompressor] = None) -> Tuple[str, bytes, str, str]:
+    """
+    Key generation, compression, encryption, hashing and CID computation for one certificate
+    Module level so process pools can pickle it; cert_hash is over the uncompressed plaintext
+    Returns: (aes_key, encrypted, cert_hash, ipfs_cid)
+    """
+    aes_key = AESEncryptionService.generate_key()
+    encrypted = AESEncryptionService.encrypt(plaintext, aes_key, compressor)
+    return aes_key, encrypted, hashlib.sha256(plaintext).hexdigest(), compute_cid(encrypted)
+
+def _seal_many(plaintexts: List[bytes], compressor: Optional[DictionaryCompressor] = None) -> List[Tuple[str, bytes, str, str]]:
+    return [seal_certificate(plaintext, compressor) for plaintext in plaintexts]
+
+class BatchCryptoEngine:
+    """
+    Seals many rendered certificates across a worker pool, returning results in input order
+    CRYPTO_POOL=process uses every core; threads only overlap where OpenSSL and hashlib
+    release the GIL, which for ijazah-sized payloads is a small share of the work
+    """
+
+    def __init__(self, workers: Optional[int] = None, mode: Optional[str] = None):
+        self.workers = workers or int(os.getenv('CRYPTO_WORKERS') or os.cpu_count() or 1)
+        self.mode = mode or os.getenv('CRYPTO_POOL', 'process')
+        self._executor: Optional[Executor] = None
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == 'process':
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="batch-crypto")
+        return self._executor
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def seal(self, plaintexts: List[bytes], compressor: Optional[DictionaryCompressor] = None) -> List[Dict]:
+        """
+        Generate a key, encrypt, hash and compute the CID of every plaintext
+        With `compressor` each plaintext is dictionary-compressed before encryption
+        Work is split into one slice per worker, or smaller for long batches, so a
+        process pool pickles a few lists instead of one task per certificate
+        Returns: [{aes_key, encrypted, cert_hash, ipfs_cid}] in input order
+        """
+        if not plaintexts:
+            return []
+        if self.workers == 1:
+            sealed = _seal_many(plaintexts, compressor)
+        else:
+            slice_size = max(1, min(256, -(-len(plaintexts) // self.workers)))
+            slices = [plaintexts[i:i + slice_size] for i in range(0, len(plaintexts), slice_size)]
+            sealed = [result for part in self.executor.map(_seal_many, slices, [compressor] * len(slices)) for result in part]
+        return [
+            {"aes_key": aes_key, "encrypted": encrypted, "cert_hash": cert_hash, "ipfs_cid": ipfs_cid}
+            for aes_key, encrypted, cert_hash, ipfs_cid in sealed
+        ]
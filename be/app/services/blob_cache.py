@@ -0,0 +1,195 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import BinaryIO, Dict, Optional
+
+class BlobCache:
+    """
+    CID-keyed on-disk cache for immutable IPFS objects
+    Files live under two levels of shard directories so no directory grows unbounded.
+    Total size is capped at IPFS_CACHE_MAX_BYTES with least-recently-used eviction
+    """
+
+    def __init__(self, root: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.root = root or os.getenv('IPFS_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'certify-ipfs-cache'))
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv('IPFS_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.evictions = 0
+
+        os.makedirs(self.root, exist_ok=True)
+        self._load_index()
+
+    def _path(self, cid: str) -> str:
+        shard = hashlib.sha1(cid.encode()).hexdigest()
+        return os.path.join(self.root, shard[:2], shard[2:4], cid)
+
+    @staticmethod
+    def _valid_cid(cid: str) -> bool:
+        # CIDs are base58/base32 strings; anything else could escape the cache directory
+        return bool(cid) and cid.isascii() and cid.isalnum()
+
+    def _load_index(self) -> None:
+        """Rebuild the LRU order from files left by a previous run, oldest access first"""
+        found = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                if filename.startswith('.'):
+                    os.remove(path)
+                    continue
+                stat = os.stat(path)
+                found.append((stat.st_atime, filename, stat.st_size))
+        for _, cid, size in sorted(found):
+            self._entries[cid] = size
+            self._size += size
+        self._evict()
+
+    def get(self, cid: str) -> Optional[bytes]:
+        """Read a cached object, or None on a miss; blocking, so async callers use a threadpool"""
+        if not self._valid_cid(cid):
+            return None
+        with self._lock:
+            if cid not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(cid)
+        try:
+            with open(self._path(cid), 'rb') as f:
+                data = f.read()
+        except OSError:
+            with self._lock:
+                self._size -= self._entries.pop(cid, 0)
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += len(data)
+        return data
+
+    def put(self, cid: str, data: bytes) -> None:
+        """Store an object; a partial write is never visible under its CID"""
+        if not self._valid_cid(cid) or len(data) > self.max_bytes:
+            return
+        try:
+            writer = self.writer(cid)
+        except OSError as e:
+            print(f"Error writing IPFS cache entry {cid}: {str(e)}")
+            return
+        writer.write(data)
+        writer.commit()
+
+    def open(self, cid: str) -> Optional[BinaryIO]:
+        """Open a cached object for chunked reading, or None on a miss"""
+        if not self._valid_cid(cid):
+            return None
+        with self._lock:
+            if cid not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(cid)
+            size = self._entries[cid]
+        try:
+            f = open(self._path(cid), 'rb')
+        except OSError:
+            with self._lock:
+                self._size -= self._entries.pop(cid, 0)
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += size
+        return f
+
+    def writer(self, cid: Optional[str] = None) -> "BlobWriter":
+        """
+        Write an object in chunks; it becomes visible only on commit()
+        The CID may be given at commit time, e.g. when it is only known after upload
+        """
+        return BlobWriter(self, cid)
+
+    def _commit(self, tmp_path: str, cid: str, size: int) -> None:
+        if not self._valid_cid(cid) or size > self.max_bytes:
+            os.remove(tmp_path)
+            return
+        path = self._path(cid)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing IPFS cache entry {cid}: {str(e)}")
+            return
+        with self._lock:
+            self._size -= self._entries.pop(cid, 0)
+            self._entries[cid] = size
+            self._size += size
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and self._entries:
+            cid, size = self._entries.popitem(last=False)
+            self._size -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(cid))
+            except OSError:
+                pass
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "evictions": self.evictions
+        }
+
+
+class BlobWriter:
+    """Chunked write into a BlobCache, staged in a hidden temp file until commit()"""
+
+    def __init__(self, cache: BlobCache, cid: Optional[str]):
+        self.cache = cache
+        self.cid = cid
+        self.size = 0
+        fd, self._tmp_path = tempfile.mkstemp(dir=cache.root, prefix='.')
+        self._file = os.fdopen(fd, 'wb')
+
+    def write(self, data: bytes) -> None:
+        # Stop staging once the object can no longer fit the cache
+        if self._file is None:
+            return
+        self.size += len(data)
+        if self.size > self.cache.max_bytes:
+            self.abort()
+            return
+        self._file.write(data)
+
+    def commit(self, cid: Optional[str] = None) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        self.cache._commit(self._tmp_path, cid or self.cid, self.size)
+
+    def abort(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        try:
+            os.remove(self._tmp_path)
+        except OSError:
+            pass
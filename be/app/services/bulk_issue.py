@@ -0,0 +1,241 @@
+import asyncio
+import csv
+import io
+import json
+import os
+from typing import AsyncIterator, Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.certificate_key import CertificateKey
+from app.schemas.certificate import IssueCertificateRequest
+from app.services.async_ipfs import AsyncIPFSService
+from app.services.async_read_contract import AsyncContractService
+from app.services.batch_crypto import BatchCryptoEngine
+from app.services.compression import DictionaryCompressor
+from app.services.pin_queue import PinQueue
+from app.services.template_registry import CompiledTemplate, TemplateRegistry
+
+ISSUE_BATCH_CHUNK_SIZE = int(os.getenv('ISSUE_BATCH_CHUNK_SIZE', '500'))
+ISSUE_BATCH_MAX_ROWS = int(os.getenv('ISSUE_BATCH_MAX_ROWS', '20000'))
+
+def parse_issue_rows(content: bytes, format: str) -> List[Dict]:
+    """
+    Parse a CSV (header row) or JSONL upload into raw row dicts
+    CSV issuer_wallets are separated by ';'
+    Raises: ValueError if the upload cannot be read
+    """
+    text = content.decode('utf-8-sig')
+    if format == 'csv':
+        rows = []
+        try:
+            for row in csv.DictReader(io.StringIO(text)):
+                row = {key.strip(): (value or '').strip() for key, value in row.items() if key}
+                wallets = row.get('issuer_wallets', '')
+                row['issuer_wallets'] = [wallet.strip() for wallet in wallets.split(';') if wallet.strip()]
+                if 'requires_all_signatures' in row:
+                    row['requires_all_signatures'] = row['requires_all_signatures'].lower() not in ('false', '0', 'no', '')
+                rows.append(row)
+        except csv.Error as e:
+            raise ValueError(str(e))
+    else:
+        rows = []
+        for number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                rows.append({"_error": f"Invalid JSON on line {number}: {str(e)}"})
+    if len(rows) > ISSUE_BATCH_MAX_ROWS:
+        raise ValueError(f"Upload has {len(rows)} rows, the limit is {ISSUE_BATCH_MAX_ROWS}")
+    return rows
+
+def _failed(row: int, student_id: Optional[str], message: str) -> Dict:
+    return {"row": row, "success": False, "message": message, "student_id": student_id}
+
+class BulkIssueService:
+    """
+    Cohort issuance: validate every row, check existence on chain in batched Multicall3
+    calls, then per ISSUE_BATCH_CHUNK_SIZE rows seal on the crypto pool, upload or queue
+    the blobs and insert the keys in one statement. The next chunk is sealed while the
+    current one is uploaded and stored
+    """
+
+    @staticmethod
+    async def issue(
+        rows: List[Dict],
+        templates: TemplateRegistry,
+        db: AsyncSession,
+        contract_service: AsyncContractService,
+        ipfs_service: AsyncIPFSService,
+        crypto_engine: BatchCryptoEngine,
+        pin_queue: Optional[PinQueue] = None,
+        compressor: Optional[DictionaryCompressor] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Issue every row, yielding one result per row in upload order
+        Results have the IssueCertificateResponse fields plus the 1-based `row`
+        With `pin_queue`, blobs are pinned in the background as in IPFS_PIN_ASYNC
+        With `compressor`, plaintexts are dictionary-compressed before encryption
+        """
+        # Row number -> request, or the failure reported for that row
+        requests: Dict[int, IssueCertificateRequest] = {}
+        failures: Dict[int, Dict] = {}
+        seen = set()
+        for number, raw in enumerate(rows, start=1):
+            if "_error" in raw:
+                failures[number] = _failed(number, None, raw["_error"])
+                continue
+            try:
+                request = IssueCertificateRequest(**raw)
+            except ValidationError as e:
+                problems = "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())
+                failures[number] = _failed(number, raw.get("student_id"), f"Invalid row: {problems}")
+                continue
+            if request.student_id in seen:
+                failures[number] = _failed(number, request.student_id, "Duplicate student ID in upload")
+                continue
+            seen.add(request.student_id)
+            requests[number] = request
+
+        # Resolve every distinct template once; rows naming an unknown one fail
+        def resolve_templates() -> Dict:
+            resolved = {}
+            for key in {(request.template_id, request.template_version) for request in requests.values()}:
+                try:
+                    resolved[key] = templates.get(*key)
+                except ValueError as e:
+                    resolved[key] = str(e)
+            return resolved
+        resolved = await run_in_threadpool(resolve_templates)
+        row_templates: Dict[int, CompiledTemplate] = {}
+        for number, request in list(requests.items()):
+            template = resolved[(request.template_id, request.template_version)]
+            if isinstance(template, str):
+                failures[number] = _failed(number, request.student_id, template)
+                del requests[number]
+            else:
+                row_templates[number] = template
+
+        student_ids = [request.student_id for request in requests.values()]
+        exists = await contract_service.certificates_exist(student_ids) if student_ids else {}
+        prepared = set(await BulkIssueService.existing_keys(db, student_ids))
+        for number, request in list(requests.items()):
+            if exists.get(request.student_id) is None:
+                failures[number] = _failed(number, request.student_id, "Failed to check certificate existence")
+            elif exists[request.student_id]:
+                failures[number] = _failed(number, request.student_id, "Certificate already exists for this student ID")
+            elif request.student_id in prepared:
+                failures[number] = _failed(number, request.student_id, "Certificate already prepared for this student ID")
+            else:
+                continue
+            del requests[number]
+
+        numbers = list(range(1, len(rows) + 1))
+        chunks = [numbers[start:start + ISSUE_BATCH_CHUNK_SIZE] for start in range(0, len(numbers), ISSUE_BATCH_CHUNK_SIZE)]
+
+        def seal(chunk: List[int]):
+            pending = [number for number in chunk if number in requests]
+            plaintexts = [row_templates[number].render(requests[number]).encode('utf-8') for number in pending]
+            return dict(zip(pending, crypto_engine.seal(plaintexts, compressor)))
+
+        next_sealed = asyncio.ensure_future(run_in_threadpool(seal, chunks[0])) if chunks else None
+        try:
+            for index, chunk in enumerate(chunks):
+                sealed = await next_sealed
+                next_sealed = None
+                if index + 1 < len(chunks):
+                    next_sealed = asyncio.ensure_future(run_in_threadpool(seal, chunks[index + 1]))
+
+                results = await BulkIssueService._store_chunk(sealed, requests, row_templates, db, ipfs_service, pin_queue)
+                for number in chunk:
+                    yield failures.get(number) or results[number]
+        finally:
+            if next_sealed is not None:
+                next_sealed.cancel()
+
+    @staticmethod
+    async def _store_chunk(
+        sealed: Dict[int, Dict],
+        requests: Dict[int, IssueCertificateRequest],
+        row_templates: Dict[int, CompiledTemplate],
+        db: AsyncSession,
+        ipfs_service: AsyncIPFSService,
+        pin_queue: Optional[PinQueue]
+    ) -> Dict[int, Dict]:
+        """Upload or queue one sealed chunk and insert its keys; returns results by row"""
+        if not sealed:
+            return {}
+        filenames = {number: f"certificate_{requests[number].student_id}.enc" for number in sealed}
+        cids: Dict[int, Optional[str]] = {}
+        if pin_queue is not None:
+            def queue_all():
+                return {
+                    number: pin_queue.submit(item["encrypted"], item["ipfs_cid"])
+                    for number, item in sealed.items()
+                }
+            cids = await run_in_threadpool(queue_all)
+        else:
+            uploaded = await ipfs_service.upload_many([
+                (filenames[number], item["encrypted"]) for number, item in sealed.items()
+            ])
+            cids = {number: uploaded["cids"].get(filenames[number]) for number in sealed}
+
+        results = {}
+        stored = []
+        for number, item in sealed.items():
+            student_id = requests[number].student_id
+            if not cids[number]:
+                results[number] = _failed(number, student_id, "Failed to upload to IPFS")
+                continue
+            stored.append(number)
+            results[number] = {
+                "row": number,
+                "success": True,
+                "message": "Certificate prepared. Please sign and submit to blockchain.",
+                "student_id": student_id,
+                "ipfs_cid": cids[number],
+                "cert_hash": item["cert_hash"],
+                "aes_key": item["aes_key"],
+                **row_templates[number].to_ref()
+            }
+
+        try:
+            await BulkIssueService.insert_keys(db, [
+                {"student_id": requests[number].student_id, "aes_key": sealed[number]["aes_key"]}
+                for number in stored
+            ])
+        except Exception as e:
+            print(f"Error storing certificate keys: {str(e)}")
+            for number in stored:
+                results[number] = _failed(number, requests[number].student_id, f"Failed to store certificate key: {str(e)}")
+        return results
+
+    # ========== DATABASE ==========
+
+    @staticmethod
+    async def existing_keys(db: AsyncSession, student_ids: List[str]) -> List[str]:
+        """Student IDs that already have a stored key, one IN query per 1000 IDs"""
+        found = []
+        for start in range(0, len(student_ids), 1000):
+            found.extend(await db.scalars(
+                select(CertificateKey.student_id)
+                .where(CertificateKey.student_id.in_(student_ids[start:start + 1000]))
+            ))
+        return found
+
+    @staticmethod
+    async def insert_keys(db: AsyncSession, rows: List[Dict]) -> None:
+        """Insert many certificate keys in a single executemany statement"""
+        if not rows:
+            return
+        try:
+            await db.execute(insert(CertificateKey), rows)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
@@ -0,0 +1,190 @@
+import asyncio
+import hashlib
+import os
+from typing import AsyncIterator, Dict, List, Optional
+from urllib.parse import quote
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.certificate import VerifyCertificateResponse
+from app.services.async_ipfs import AsyncIPFSService
+from app.services.async_read_contract import AsyncContractService
+from app.services.certificate import CertificateService
+from app.services.cohort import CohortService
+from app.services.compression import CompressionService
+from app.services.encryption import AESEncryptionService
+from app.services.merkle import cohort_leaf
+from app.services.verify_cache import VerificationCache
+
+# IPFS fetches and decryptions in flight per batch; the IPFS client pool is shared
+# with every other request, so one batch should not take all of it
+VERIFY_BATCH_CONCURRENCY = int(os.getenv('VERIFY_BATCH_CONCURRENCY', '16'))
+
+class BulkVerifyService:
+    """
+    Verification of many certificates: cached results first, then every on-chain state
+    in batched Multicall3 calls and every AES key in one IN query, then the IPFS
+    downloads and decryptions on a bounded pool, yielding each result as it finishes
+    """
+
+    @staticmethod
+    def check_payload(
+        student_id: str,
+        cert_data: Dict,
+        is_valid: bool,
+        encrypted_data: bytes,
+        aes_key: str,
+        file_url: str,
+        encryption_service: AESEncryptionService,
+        compression: Optional[CompressionService] = None
+    ) -> VerifyCertificateResponse:
+        """Decrypt a downloaded certificate and check it against its on-chain hash"""
+        ipfs_cid = cert_data["ipfsCID"]
+        try:
+            decrypted_data = encryption_service.decrypt(encrypted_data, aes_key, compression)
+            certificate_text = decrypted_data.decode("utf-8")
+        except Exception:
+            return VerifyCertificateResponse(
+                success=False,
+                valid=is_valid,
+                message="Invalid decryption key",
+                ipfs_cid=ipfs_cid,
+                file_url=file_url
+            )
+
+        calculated_hash = hashlib.sha256(decrypted_data).hexdigest()
+        blockchain_hash = cert_data["certHash"]
+
+        if calculated_hash != blockchain_hash:
+            return VerifyCertificateResponse(
+                success=False,
+                valid=False,
+                message="Certificate hash mismatch",
+                ipfs_cid=ipfs_cid,
+                file_url=file_url
+            )
+
+        verify_url = (
+            "http://localhost:3000/verify"
+            f"?cid={quote(ipfs_cid)}"
+            f"&key={quote(aes_key)}"
+            f"&hash={quote(blockchain_hash)}"
+        )
+        if cert_data.get("cohortId"):
+            verify_url += f"&student={quote(student_id)}&cohort={quote(cert_data['cohortId'])}"
+
+        certificate_text_with_url = (
+            certificate_text
+            + "\n\nVerifikasi Keaslian Ijazah:\n"
+            + verify_url
+        )
+
+        return VerifyCertificateResponse(
+            success=True,
+            valid=is_valid,
+            certificate_text=certificate_text_with_url,
+            ipfs_cid=ipfs_cid,
+            file_url=verify_url,
+            message="Certificate verified successfully"
+            if is_valid else "Certificate has been revoked"
+        )
+
+    @staticmethod
+    def cache_result(
+        verify_cache: VerificationCache,
+        token,
+        student_id: str,
+        cert_data: Dict,
+        result: VerifyCertificateResponse
+    ) -> None:
+        """Cache a verified result; failures are retried on the next request"""
+        if not result.success:
+            return
+        leaf = cohort_leaf(student_id, cert_data["certHash"]) if cert_data.get("cohortId") else None
+        verify_cache.put(token, student_id, cert_data["certHash"], result, leaf)
+
+    @staticmethod
+    async def verify(
+        student_ids: List[str],
+        db: AsyncSession,
+        contract_service: AsyncContractService,
+        ipfs_service: AsyncIPFSService,
+        encryption_service: AESEncryptionService,
+        compression: CompressionService,
+        verify_cache: VerificationCache
+    ) -> AsyncIterator[Dict]:
+        """
+        Verify distinct student IDs, yielding results in completion order
+        Results have the VerifyCertificateResponse fields plus `student_id` and `cache`
+        (memory or miss, as in X-Verify-Cache)
+        """
+        pending = []
+        for student_id in student_ids:
+            cached = verify_cache.get(student_id)
+            if cached is not None:
+                yield {"student_id": student_id, "cache": "memory", **cached[0].model_dump()}
+            else:
+                pending.append(student_id)
+        if not pending:
+            return
+
+        token = await run_in_threadpool(verify_cache.begin)
+        states = await contract_service.get_certificate_states(pending)
+        # Anything not issued on its own may belong to a Merkle cohort
+        missing = [student_id for student_id in pending if states[student_id] is not None and not states[student_id]["exists"]]
+        if missing:
+            members = await CohortService.get_members(db, missing)
+            if members:
+                states.update(await CohortService.get_certificate_states(contract_service, list(members.values())))
+        found = [student_id for student_id in pending if states[student_id] is not None and states[student_id]["exists"]]
+        keys = await CertificateService.get_keys_by_nims(db, found)
+
+        slots = asyncio.Semaphore(VERIFY_BATCH_CONCURRENCY)
+
+        async def verify_one(student_id: str) -> Dict:
+            state = states[student_id]
+            if state is None:
+                result = VerifyCertificateResponse(success=False, valid=False, message="Failed to read certificate state")
+            elif not state["exists"]:
+                result = VerifyCertificateResponse(success=False, valid=False, message="Certificate not found on blockchain")
+            elif not state["certificate"]:
+                result = VerifyCertificateResponse(success=False, valid=False, message="Failed to retrieve certificate data")
+            elif student_id not in keys:
+                result = VerifyCertificateResponse(success=False, valid=state["isValid"], message="AES key not found")
+            else:
+                cert_data = state["certificate"]
+                file_url = ipfs_service.get_gateway_url(cert_data["ipfsCID"])
+                async with slots:
+                    encrypted_data = await ipfs_service.get_file(cert_data["ipfsCID"])
+                    if not encrypted_data:
+                        result = VerifyCertificateResponse(
+                            success=False,
+                            valid=state["isValid"],
+                            message="Failed to retrieve certificate from IPFS",
+                            ipfs_cid=cert_data["ipfsCID"],
+                            file_url=file_url
+                        )
+                    else:
+                        # Decryption, decompression and hashing are CPU-bound; keep them off the loop
+                        result = await run_in_threadpool(
+                            BulkVerifyService.check_payload,
+                            student_id,
+                            cert_data,
+                            state["isValid"],
+                            encrypted_data,
+                            keys[student_id],
+                            file_url,
+                            encryption_service,
+                            compression
+                        )
+                        BulkVerifyService.cache_result(verify_cache, token, student_id, cert_data, result)
+            return {"student_id": student_id, "cache": "miss", **result.model_dump()}
+
+        tasks = [asyncio.ensure_future(verify_one(student_id)) for student_id in pending]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -1,22 +1,18 @@
-from typing import Optional
+from typing import Dict, List, Optional
 from app.models.certificate_key import CertificateKey
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 import secrets
 from app.models.certificate import Certificate
-from app.services.read_contract import ContractService
-from app.services.ipfs import IPFSService
 class CertificateService:
     """Service for managing certificate data"""
-    def __init__(self):
-        self.contract_service = ContractService()
-        self.ipfs_service = IPFSService()
     @staticmethod
     def generate_aes_key() -> str:
         """Generate a random AES-256 key (32 bytes = 256 bits)"""
         return secrets.token_hex(32)
     
     @staticmethod
-    def create_certificate(db: Session, nim: str, aes_key: Optional[str] = None) -> CertificateKey:
+    async def create_certificate(db: AsyncSession, nim: str, aes_key: Optional[str] = None) -> CertificateKey:
         """
         Create a new certificate record
         If aes_key is not provided, a random one will be generated
@@ -30,32 +26,38 @@ class CertificateService:
         )
         
         db.add(certificate)
-        db.commit()
-        db.refresh(certificate)
+        await db.commit()
         
         return certificate
     
     @staticmethod
-    def get_certificate_by_nim(db: Session, nim: str) -> Optional[Certificate]:
+    async def get_certificate_by_nim(db: AsyncSession, nim: str) -> Optional[Certificate]:
         """Get certificate by NIM"""
-        return db.query(CertificateKey).filter(CertificateKey.student_id == nim).first()
+        return await db.get(CertificateKey, nim)
     
     @staticmethod
-    def update_aes_key(db: Session, nim: str, new_aes_key: str) -> Optional[CertificateKey]:
+    async def get_keys_by_nims(db: AsyncSession, nims: List[str]) -> Dict[str, str]:
+        """Get the AES keys of many certificates, one IN query per 1000 NIMs"""
+        keys = {}
+        for start in range(0, len(nims), 1000):
+            keys.update((await db.execute(
+                select(CertificateKey.student_id, CertificateKey.aes_key)
+                .where(CertificateKey.student_id.in_(nims[start:start + 1000]))
+            )).all())
+        return keys
+    
+    @staticmethod
+    async def update_aes_key(db: AsyncSession, nim: str, new_aes_key: str) -> Optional[CertificateKey]:
         """Update AES key for a certificate"""
-        certificate = db.query(CertificateKey).filter(CertificateKey.student_id == nim).first()
+        certificate = await db.get(CertificateKey, nim)
         if certificate:
             certificate.aes_key = new_aes_key
-            db.commit()
-            db.refresh(certificate)
+            await db.commit()
         return certificate
     
     @staticmethod
-    def delete_certificate(db: Session, nim: str) -> bool:
+    async def delete_certificate(db: AsyncSession, nim: str) -> bool:
         """Delete certificate by NIM"""
-        certificate = db.query(CertificateKey).filter(CertificateKey.student_id == nim).first()
-        if certificate:
-            db.delete(certificate)
-            db.commit()
-            return True
-        return False
\ No newline at end of file
+        deleted = await db.execute(delete(CertificateKey).where(CertificateKey.student_id == nim))
+        await db.commit()
+        return deleted.rowcount > 0
\ No newline at end of file
@@ -0,0 +1,87 @@
+import json
+from typing import Optional, Dict, List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from web3 import Web3
+
+from app.models.certificate_index import IndexedCertificate, IndexerCheckpoint
+from app.services.read_contract import CERTIFICATE_COLUMNS
+
+class CertificateIndexService:
+    """Service for reading the event-sourced certificate index from request handlers"""
+
+    CHECKPOINT_NAME = "certificates"
+
+    @staticmethod
+    def student_id_hash(student_id: str) -> str:
+        """keccak256 of the student ID, as it appears in the indexed event topic"""
+        return Web3.to_hex(Web3.keccak(text=student_id))
+
+    @staticmethod
+    def to_dict(cert: IndexedCertificate) -> Dict:
+        """Same shape as ContractService.get_certificate"""
+        return {
+            "studentId": cert.student_id,
+            "certHash": cert.cert_hash,
+            "ipfsCID": cert.ipfs_cid,
+            "issuerWallets": json.loads(cert.issuer_wallets),
+            "issueSignatureCount": cert.issue_signature_count,
+            "revokeSignatureCount": cert.revoke_signature_count,
+            "isValid": cert.is_valid,
+            "timestampIssued": cert.timestamp_issued,
+            "timestampLastUpdated": cert.timestamp_last_updated,
+            "revokeReason": cert.revoke_reason,
+            "requiresAllSignatures": cert.requires_all_signatures
+        }
+
+    @staticmethod
+    async def get_indexed_block(db: AsyncSession) -> Optional[int]:
+        """Get the last block fully applied to the index"""
+        checkpoint = await db.get(IndexerCheckpoint, CertificateIndexService.CHECKPOINT_NAME)
+        return checkpoint.block_number if checkpoint else None
+
+    @staticmethod
+    async def get_certificate(db: AsyncSession, student_id: str) -> Optional[Dict]:
+        """Get indexed certificate by student ID"""
+        cert = await db.get(IndexedCertificate, CertificateIndexService.student_id_hash(student_id))
+        return CertificateIndexService.to_dict(cert) if cert else None
+
+    @staticmethod
+    async def get_all_certificates(db: AsyncSession) -> List[Dict]:
+        """Get all indexed certificates in proposal order"""
+        certificates = (await db.execute(
+            select(IndexedCertificate)
+            .order_by(IndexedCertificate.proposed_block, IndexedCertificate.proposed_log_index)
+        )).scalars().all()
+        return [CertificateIndexService.to_dict(cert) for cert in certificates]
+
+    @staticmethod
+    async def get_certificates_page(db: AsyncSession, offset: int, limit: int) -> List[Dict]:
+        """Get a page of indexed certificates in proposal order"""
+        certificates = (await db.execute(
+            select(IndexedCertificate)
+            .order_by(IndexedCertificate.proposed_block, IndexedCertificate.proposed_log_index)
+            .offset(offset)
+            .limit(limit)
+        )).scalars().all()
+        return [CertificateIndexService.to_dict(cert) for cert in certificates]
+
+    @staticmethod
+    async def get_certificate_columns(db: AsyncSession, offset: int, limit: int) -> Dict[str, list]:
+        """Get a page of indexed certificates as parallel columns, selecting only the listed fields"""
+        rows = (await db.execute(
+            select(
+                IndexedCertificate.student_id,
+                IndexedCertificate.cert_hash,
+                IndexedCertificate.ipfs_cid,
+                IndexedCertificate.is_valid,
+                IndexedCertificate.timestamp_issued,
+                IndexedCertificate.timestamp_last_updated,
+                IndexedCertificate.revoke_reason
+            )
+            .order_by(IndexedCertificate.proposed_block, IndexedCertificate.proposed_log_index)
+            .offset(offset)
+            .limit(limit)
+        )).all()
+        columns = list(zip(*rows)) if rows else [()] * len(CERTIFICATE_COLUMNS)
+        return {name: list(values) for name, values in zip(CERTIFICATE_COLUMNS, columns)}
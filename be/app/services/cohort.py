@@ -0,0 +1,164 @@
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.cohort import Cohort, CohortMember
+from app.services.async_read_contract import AsyncContractService
+from app.services.merkle import MerkleTree, cohort_leaf, verify_proof
+
+NOT_FOUND = {"exists": False, "isValid": False, "certificate": None}
+
+class CohortService:
+    """Service for Merkle cohorts: one anchored root standing for many certificates"""
+
+    @staticmethod
+    async def create_cohort(db: AsyncSession, cohort_id: str, members: List[Dict]) -> Cohort:
+        """
+        Build the Merkle tree over members ({student_id, cert_hash, ipfs_cid}) in order
+        and store the root with one proof per member
+        """
+        # Hashing a large cohort takes a while, so the tree is built on the threadpool
+        root, rows = await run_in_threadpool(CohortService._build_tree, cohort_id, members)
+        cohort = Cohort(
+            cohort_id=cohort_id,
+            merkle_root=root,
+            size=len(members),
+            created_at=int(time.time())
+        )
+        try:
+            db.add(cohort)
+            await db.execute(insert(CohortMember), rows)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        return cohort
+
+    @staticmethod
+    def _build_tree(cohort_id: str, members: List[Dict]) -> Tuple[str, List[Dict]]:
+        """Returns: (merkle root, CohortMember rows with their proofs)"""
+        tree = MerkleTree([cohort_leaf(member["student_id"], member["cert_hash"]) for member in members])
+        return "0x" + tree.root.hex(), [
+            {
+                "student_id": member["student_id"],
+                "cohort_id": cohort_id,
+                "leaf_index": index,
+                "cert_hash": member["cert_hash"],
+                "ipfs_cid": member["ipfs_cid"],
+                "merkle_proof": json.dumps(["0x" + sibling.hex() for sibling in tree.proof(index)])
+            }
+            for index, member in enumerate(members)
+        ]
+
+    @staticmethod
+    async def get_cohort(db: AsyncSession, cohort_id: str) -> Optional[Cohort]:
+        """Get cohort by ID"""
+        return await db.get(Cohort, cohort_id)
+
+    @staticmethod
+    async def get_member(db: AsyncSession, student_id: str) -> Optional[CohortMember]:
+        """Get the cohort membership of a student, if the certificate was issued in a cohort"""
+        return await db.get(CohortMember, student_id)
+
+    @staticmethod
+    async def get_members(db: AsyncSession, student_ids: List[str]) -> Dict[str, CohortMember]:
+        """Cohort memberships of many students, one IN query per 1000 IDs"""
+        members = {}
+        for start in range(0, len(student_ids), 1000):
+            for member in await db.scalars(
+                select(CohortMember).where(CohortMember.student_id.in_(student_ids[start:start + 1000]))
+            ):
+                members[member.student_id] = member
+        return members
+
+    # ========== ON-CHAIN STATE ==========
+
+    @staticmethod
+    async def get_certificate_state(
+        db: AsyncSession,
+        contract_service: AsyncContractService,
+        student_id: str,
+        cohort_id: Optional[str] = None,
+        cert_hash: Optional[str] = None,
+        merkle_proof: Optional[list] = None
+    ) -> Dict:
+        """
+        get_certificate_state for a certificate issued in a Merkle cohort
+        The proof (given, or stored for the student) must lead to the root anchored on chain;
+        the certificate is valid once the cohort is issued and while it is not revoked
+        Returns: {exists, isValid, certificate: {studentId, certHash, ipfsCID, cohortId}}
+        """
+        member = await CohortService.get_member(db, student_id)
+        if member is not None and cohort_id in (None, member.cohort_id):
+            cohort_id = member.cohort_id
+            cert_hash = cert_hash or member.cert_hash
+            if merkle_proof is None:
+                merkle_proof = json.loads(member.merkle_proof)
+        if not cohort_id or not cert_hash or merkle_proof is None:
+            return NOT_FOUND
+
+        try:
+            leaf = cohort_leaf(student_id, cert_hash)
+            proof = [bytes.fromhex(sibling.removeprefix("0x")) for sibling in merkle_proof]
+        except ValueError:
+            return NOT_FOUND
+        state = await contract_service.get_cohort_state(cohort_id, leaf)
+        ipfs_cid = member.ipfs_cid if member is not None else None
+        return CohortService._certificate_state(student_id, cohort_id, cert_hash, ipfs_cid, leaf, proof, state)
+
+    @staticmethod
+    async def get_certificate_states(
+        contract_service: AsyncContractService,
+        members: List[CohortMember]
+    ) -> Dict[str, Dict]:
+        """
+        get_certificate_state for many stored members in batched Multicall3 calls
+        Returns: {student_id: {exists, isValid, certificate}}
+        """
+        leaves = {member.student_id: cohort_leaf(member.student_id, member.cert_hash) for member in members}
+        states = await contract_service.get_cohort_states([
+            (member.cohort_id, leaves[member.student_id]) for member in members
+        ])
+        return {
+            member.student_id: CohortService._certificate_state(
+                member.student_id,
+                member.cohort_id,
+                member.cert_hash,
+                member.ipfs_cid,
+                leaves[member.student_id],
+                [bytes.fromhex(sibling.removeprefix("0x")) for sibling in json.loads(member.merkle_proof)],
+                states[(member.cohort_id, leaves[member.student_id])]
+            )
+            for member in members
+        }
+
+    @staticmethod
+    def _certificate_state(student_id, cohort_id, cert_hash, ipfs_cid, leaf, proof, state) -> Dict:
+        if not state["exists"] or not verify_proof(leaf, proof, bytes.fromhex(state["cohort"]["merkleRoot"][2:])):
+            return NOT_FOUND
+        return {
+            "exists": True,
+            "isValid": state["cohort"]["isValid"] and not state["revoked"],
+            "certificate": {
+                "studentId": student_id,
+                "certHash": cert_hash,
+                "ipfsCID": ipfs_cid,
+                "cohortId": cohort_id
+            }
+        }
+
+    @staticmethod
+    def member_to_dict(member: CohortMember) -> Dict:
+        return {
+            "student_id": member.student_id,
+            "cohort_id": member.cohort_id,
+            "leaf_index": member.leaf_index,
+            "leaf": "0x" + cohort_leaf(member.student_id, member.cert_hash).hex(),
+            "cert_hash": member.cert_hash,
+            "ipfs_cid": member.ipfs_cid,
+            "merkle_proof": json.loads(member.merkle_proof)
+        }
@@ -0,0 +1,287 @@
+import json
+import os
+import random
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # compression is optional; envelopes are then written uncompressed
+    zstandard = None
+
+from app.database.connection import SessionLocal
+from app.models.compression_dictionary import CompressionDictionary
+
+PAYLOAD_COMPRESSION = os.getenv('PAYLOAD_COMPRESSION', 'true').lower() == 'true'
+COMPRESSION_LEVEL = int(os.getenv('PAYLOAD_COMPRESSION_LEVEL', '3'))
+DICTIONARY_SIZE = int(os.getenv('COMPRESSION_DICTIONARY_SIZE', str(4 * 1024)))
+# Cap on decompressed output; decompression stops as soon as a crafted envelope passes it
+MAX_DECOMPRESSED_SIZE = int(os.getenv('MAX_DECOMPRESSED_SIZE', str(16 * 1024 * 1024)))
+TRAINING_SAMPLES_PER_TEMPLATE = 500
+
+_SAMPLE_NAMES = ["Budi Santoso", "Siti Rahmawati", "Ahmad Fauzi", "Dewi Lestari", "Rizky Pratama", "Nur Aini Putri"]
+_SAMPLE_PLACES = ["Bandung", "Jakarta", "Surabaya", "Medan", "Yogyakarta", "Makassar"]
+_SAMPLE_DEGREES = ["Teknik Informatika", "Teknik Elektro", "Teknik Sipil", "Teknik Kimia", "Matematika", "Fisika"]
+_SAMPLE_MONTHS = ["Januari", "Februari", "Maret", "April", "Mei", "Juni", "Juli", "Agustus", "September", "Oktober", "November", "Desember"]
+
+class DictionaryCompressor:
+    """
+    zstd compression with one dictionary, identified by its dict_id
+    Picklable, so process pools can receive it; each thread builds its own compressor
+    """
+
+    def __init__(self, dict_id: int, dict_data: bytes, level: int = COMPRESSION_LEVEL):
+        self.dict_id = dict_id
+        self.dict_data = dict_data
+        self.level = level
+        self._local = threading.local()
+
+    def __getstate__(self):
+        return {"dict_id": self.dict_id, "dict_data": self.dict_data, "level": self.level}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def compress(self, data: bytes) -> Tuple[int, bytes]:
+        compressor = getattr(self._local, "compressor", None)
+        if compressor is None:
+            # No dict ID or checksum in the frame: the envelope records the first and
+            # AES-GCM already authenticates the content
+            compressor = zstandard.ZstdCompressor(
+                level=self.level,
+                dict_data=zstandard.ZstdCompressionDict(self.dict_data),
+                write_dict_id=False,
+                write_checksum=False
+            )
+            self._local.compressor = compressor
+        return self.dict_id, compressor.compress(data)
+
+# Largest possible zstd frame header; a longer prefix that still does not parse is not zstd
+MAX_FRAME_HEADER_SIZE = 18
+
+class _BoundedSink:
+    """Collects decompressed output and fails as soon as it passes `limit` bytes"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.size = 0
+        self.chunks = []
+
+    def write(self, data) -> int:
+        self.size += len(data)
+        if self.size > self.limit:
+            raise ValueError("Decryption failed: decompressed payload too large")
+        self.chunks.append(bytes(data))
+        return len(data)
+
+class LimitedDecompressor:
+    """
+    Incremental decompression that never produces more than MAX_DECOMPRESSED_SIZE
+    Output goes through a stream_writer into a sink that raises as soon as the frame's
+    declared content size (which our frames always carry) is passed, so a frame crafted
+    to expand is stopped after at most one output block past the limit
+    """
+
+    def __init__(self, dictionary):
+        self._decompressor = zstandard.ZstdDecompressor(dict_data=dictionary)
+        self._writer = None
+        self._sink: Optional[_BoundedSink] = None
+        self._pending = bytearray()
+
+    def _start(self) -> bool:
+        """Size the sink from the frame header; False until the header has arrived"""
+        try:
+            params = zstandard.get_frame_parameters(bytes(self._pending))
+        except zstandard.ZstdError:
+            if len(self._pending) >= MAX_FRAME_HEADER_SIZE:
+                raise ValueError("Decryption failed: invalid compressed payload")
+            return False
+        if params.content_size == zstandard.CONTENTSIZE_UNKNOWN:
+            raise ValueError("Decryption failed: compressed payload does not declare its size")
+        if params.content_size > MAX_DECOMPRESSED_SIZE:
+            raise ValueError("Decryption failed: decompressed payload too large")
+        self._sink = _BoundedSink(params.content_size)
+        self._writer = self._decompressor.stream_writer(self._sink)
+        return True
+
+    def update(self, data: bytes) -> bytes:
+        if not data:
+            return b''
+        if self._writer is None:
+            self._pending += data
+            if not self._start():
+                return b''
+            data = bytes(self._pending)
+            self._pending.clear()
+        try:
+            self._writer.write(data)
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Decryption failed: {str(e)}")
+        out = b''.join(self._sink.chunks)
+        self._sink.chunks.clear()
+        return out
+
+    def finalize(self) -> bytes:
+        if self._sink is None or self._sink.size != self._sink.limit:
+            raise ValueError("Decryption failed: truncated compressed payload")
+        return b''
+
+class CompressionService:
+    """
+    Dictionary compression applied to certificate plaintext before encryption
+    Dictionaries are trained on renders of the published templates and stored in the
+    database; the newest one compresses, any of them decompresses. cert_hash is always
+    computed over the uncompressed plaintext
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self.enabled = PAYLOAD_COMPRESSION and zstandard is not None
+        self._dictionaries: Dict[int, bytes] = {}
+        self._loaded: Dict[int, object] = {}
+        self._current: Optional[DictionaryCompressor] = None
+        self._current_loaded = False
+        self._lock = threading.Lock()
+
+    # ========== DICTIONARIES ==========
+
+    def _load_current(self) -> None:
+        db = self.session_factory()
+        try:
+            row = db.query(CompressionDictionary).order_by(CompressionDictionary.dict_id.desc()).first()
+        finally:
+            db.close()
+        with self._lock:
+            if row is not None:
+                self._dictionaries[row.dict_id] = row.data
+                self._current = DictionaryCompressor(row.dict_id, row.data)
+            self._current_loaded = True
+
+    def _dictionary(self, dict_id: int):
+        loaded = self._loaded.get(dict_id)
+        if loaded is not None:
+            return loaded
+        data = self._dictionaries.get(dict_id)
+        if data is None:
+            db = self.session_factory()
+            try:
+                row = db.get(CompressionDictionary, dict_id)
+            finally:
+                db.close()
+            if row is None:
+                raise ValueError(f"Decryption failed: unknown compression dictionary {dict_id}")
+            data = row.data
+        loaded = zstandard.ZstdCompressionDict(data)
+        with self._lock:
+            self._dictionaries[dict_id] = data
+            self._loaded[dict_id] = loaded
+        return loaded
+
+    def current(self) -> Optional[DictionaryCompressor]:
+        """Compressor for the newest dictionary, None when compression is off or untrained"""
+        if not self.enabled:
+            return None
+        if not self._current_loaded:
+            self._load_current()
+        return self._current
+
+    def train(self, template_bodies: Dict[str, str]) -> int:
+        """
+        Train and store a new dictionary from renders of {"template_id:version": body}
+        Falls back to a raw-content dictionary of the bodies when the corpus is too
+        uniform for the trainer
+        Returns: the new dict_id
+        """
+        samples = []
+        for body in template_bodies.values():
+            for i in range(TRAINING_SAMPLES_PER_TEMPLATE):
+                samples.append(body.format(
+                    student_name=f"{random.choice(_SAMPLE_NAMES)} {random.choice(_SAMPLE_NAMES).split()[0]}",
+                    student_id=str(random.randint(10000000, 99999999)),
+                    birth_place=random.choice(_SAMPLE_PLACES),
+                    birth_date=f"{random.randint(1, 28)} {random.choice(_SAMPLE_MONTHS)} {random.randint(1995, 2008)}",
+                    degree=random.choice(_SAMPLE_DEGREES),
+                    issue_date=f"{random.randint(1, 28)} {random.choice(_SAMPLE_MONTHS)} {random.randint(2024, 2030)}"
+                ).encode('utf-8'))
+        try:
+            data = zstandard.train_dictionary(DICTIONARY_SIZE, samples).as_bytes()
+        except zstandard.ZstdError as e:
+            print(f"Dictionary training failed, using raw template content: {str(e)}")
+            data = "".join(template_bodies.values()).encode('utf-8')[-DICTIONARY_SIZE:]
+
+        db = self.session_factory()
+        try:
+            row = CompressionDictionary(
+                data=data,
+                trained_on=json.dumps(sorted(template_bodies)),
+                created_at=int(time.time())
+            )
+            db.add(row)
+            db.commit()
+            dict_id = row.dict_id
+        finally:
+            db.close()
+        with self._lock:
+            self._dictionaries[dict_id] = data
+            self._current = DictionaryCompressor(dict_id, data)
+            self._current_loaded = True
+        print(f"Trained compression dictionary {dict_id} on {len(template_bodies)} templates")
+        return dict_id
+
+    def ensure_dictionary(self, templates) -> Optional[int]:
+        """
+        Train a dictionary when none exists or the latest template versions changed
+        `templates` is the TemplateRegistry
+        """
+        if not self.enabled:
+            return None
+        bodies = {}
+        for row in templates.list_versions():
+            bodies.setdefault(row.template_id, (f"{row.template_id}:{row.version}", row.body))
+        corpus = dict(bodies.values())
+        if not corpus:
+            return None
+
+        db = self.session_factory()
+        try:
+            latest = db.query(CompressionDictionary).order_by(CompressionDictionary.dict_id.desc()).first()
+            trained_on = json.loads(latest.trained_on) if latest else None
+        finally:
+            db.close()
+        if trained_on == sorted(corpus):
+            return latest.dict_id
+        return self.train(corpus)
+
+    # ========== CODEC ==========
+
+    def compress(self, data: bytes) -> Tuple[Optional[int], bytes]:
+        """Returns: (dict_id, compressed), or (None, data) when there is nothing to compress with"""
+        compressor = self.current()
+        if compressor is None:
+            return None, data
+        return compressor.compress(data)
+
+    def decompressor(self, dict_id: int) -> LimitedDecompressor:
+        """
+        Raises: ValueError if zstandard is missing or the dictionary is unknown
+        """
+        if zstandard is None:
+            raise ValueError(f"Decryption failed: payload is compressed with dictionary {dict_id} but zstandard is not installed")
+        return LimitedDecompressor(self._dictionary(dict_id))
+
+    def decompress(self, dict_id: int, data: bytes) -> bytes:
+        decompressor = self.decompressor(dict_id)
+        out = decompressor.update(data)
+        decompressor.finalize()
+        return out
+
+    def stats(self) -> Dict:
+        current = self.current()
+        return {
+            "enabled": self.enabled,
+            "zstandard_installed": zstandard is not None,
+            "dict_id": current.dict_id if current else None,
+            "dictionaries_loaded": len(self._loaded)
+        }
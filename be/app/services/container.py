@@ -0,0 +1,121 @@
+import inspect
+import threading
+from typing import Any, Callable, Dict
+
+from app.services.async_ipfs import AsyncIPFSService
+from app.services.async_read_contract import AsyncContractService
+from app.services.batch_crypto import BatchCryptoEngine
+from app.services.blob_cache import BlobCache
+from app.services.compression import CompressionService
+from app.services.encryption import AESEncryptionService
+from app.services.ipfs import IPFSService
+from app.services.pin_queue import PinQueue
+from app.services.read_contract import ContractService
+from app.services.relayer import TransactionRelayer
+from app.services.template_registry import TemplateRegistry
+from app.services.verify_cache import VerificationCache
+from app.services.verify_memo import PublicVerifyMemo
+
+class ServiceContainer:
+    """
+    Builds one shared instance of each client service on first use
+    Nothing is constructed at import time; tests and load runs can `override` a
+    service with a local fake before the first request
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        # Re-entrant so factories can resolve the services they depend on
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        self._factories[name] = factory
+
+    def get(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            if name not in self._instances:
+                self._instances[name] = self._factories[name]()
+            return self._instances[name]
+
+    def override(self, name: str, instance: Any) -> None:
+        """Replace a service, e.g. with a fake for tests or load runs"""
+        with self._lock:
+            self._instances[name] = instance
+
+    def is_built(self, name: str) -> bool:
+        return name in self._instances
+
+    async def close(self) -> None:
+        """
+        Close every built service that holds connections or threads
+        In reverse build order, so services close before the ones they depend on
+        """
+        for instance in reversed(list(self._instances.values())):
+            close = getattr(instance, "close", None)
+            if close is None:
+                continue
+            result = close()
+            if inspect.isawaitable(result):
+                await result
+        self._instances.clear()
+
+
+container = ServiceContainer()
+container.register("contract", ContractService)
+container.register("async_contract", AsyncContractService)
+container.register("blob_cache", BlobCache)
+container.register("ipfs", lambda: IPFSService(container.get("blob_cache")))
+container.register("async_ipfs", lambda: AsyncIPFSService(container.get("blob_cache")))
+container.register("encryption", AESEncryptionService)
+container.register("pin_queue", lambda: PinQueue(container.get("ipfs")))
+container.register("batch_crypto", BatchCryptoEngine)
+container.register("templates", lambda: TemplateRegistry(container.get("pin_queue")))
+container.register("compression", CompressionService)
+container.register("verify_cache", lambda: VerificationCache(container.get("contract")))
+container.register("verify_memo", PublicVerifyMemo)
+container.register("relayer", lambda: TransactionRelayer(container.get("async_contract")))
+
+# FastAPI dependencies
+
+def get_contract_service() -> ContractService:
+    return container.get("contract")
+
+def get_async_contract_service() -> AsyncContractService:
+    return container.get("async_contract")
+
+def get_ipfs_service() -> IPFSService:
+    return container.get("ipfs")
+
+def get_async_ipfs_service() -> AsyncIPFSService:
+    return container.get("async_ipfs")
+
+def get_blob_cache() -> BlobCache:
+    return container.get("blob_cache")
+
+def get_pin_queue() -> PinQueue:
+    return container.get("pin_queue")
+
+def get_encryption_service() -> AESEncryptionService:
+    return container.get("encryption")
+
+def get_batch_crypto() -> BatchCryptoEngine:
+    return container.get("batch_crypto")
+
+def get_template_registry() -> TemplateRegistry:
+    return container.get("templates")
+
+def get_compression_service() -> CompressionService:
+    return container.get("compression")
+
+def get_verification_cache() -> VerificationCache:
+    return container.get("verify_cache")
+
+def get_verify_memo() -> PublicVerifyMemo:
+    return container.get("verify_memo")
+
+def get_relayer() -> TransactionRelayer:
+    return container.get("relayer")
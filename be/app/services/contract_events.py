@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from eth_utils import event_abi_to_log_topic
+from web3 import Web3
+
+class ContractEventWatcher:
+    """
+    Polls the contract for new logs near the chain head and dispatches them to subscribers
+    Meant for cache invalidation, where acting on a log that is later reorged out only
+    costs an extra reload; durable state belongs in the CertificateIndexer instead
+    """
+
+    def __init__(self, contract_service, poll_interval: Optional[float] = None):
+        self.w3 = contract_service.w3
+        self.contract = contract_service.contract
+        self.poll_interval = poll_interval or float(os.getenv("EVENT_POLL_INTERVAL", "5"))
+        # Providers reject eth_getLogs over wide ranges (10k blocks on Infura); a watcher
+        # that fell behind catches up over several polls
+        self.max_block_range = int(os.getenv("EVENT_MAX_BLOCK_RANGE", "2000"))
+
+        self._event_topics = {
+            item["name"]: event_abi_to_log_topic(item)
+            for item in contract_service.contract_abi
+            if item["type"] == "event"
+        }
+        self._subscribers: Dict[bytes, List[Callable]] = {}
+        self._last_block: Optional[int] = None
+        self.last_polled_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, event_name: str, callback: Callable) -> None:
+        """Call `callback(event)` for every new `event_name` log"""
+        topic = self._event_topics[event_name]
+        self._subscribers.setdefault(topic, []).append(callback)
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def last_block(self) -> Optional[int]:
+        """Highest block whose logs have been dispatched"""
+        return self._last_block
+
+    def lag(self) -> Optional[float]:
+        """Seconds since the last poll that reached the head, None if it never polled"""
+        return time.monotonic() - self.last_polled_at if self.last_polled_at is not None else None
+
+    def start(self, from_block: Optional[int] = None) -> None:
+        """Start polling in a daemon thread, from `from_block` or the current head"""
+        with self._lock:
+            if self.is_running:
+                return
+            self._last_block = (from_block - 1) if from_block is not None else self.w3.eth.block_number
+            self.last_polled_at = time.monotonic()
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="contract-event-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_interval)
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                while not self.poll_once() and not self._stop_event.is_set():
+                    pass
+            except Exception as e:
+                print(f"Error polling contract events: {str(e)}")
+
+    def poll_once(self) -> bool:
+        """
+        Fetch and dispatch logs after the last polled block, at most EVENT_MAX_BLOCK_RANGE blocks
+        Returns: True once the head is reached
+        """
+        if not self._subscribers:
+            return True
+        head = self.w3.eth.block_number
+        from_block = self._last_block + 1
+        if from_block > head:
+            self.last_polled_at = time.monotonic()
+            return True
+        to_block = min(head, from_block + self.max_block_range - 1)
+
+        logs = self.w3.eth.get_logs({
+            "address": self.contract.address,
+            "fromBlock": from_block,
+            "toBlock": to_block,
+            "topics": [[Web3.to_hex(topic) for topic in self._subscribers]]
+        })
+        topic_names = {topic: name for name, topic in self._event_topics.items()}
+        for log in sorted(logs, key=lambda log: (log["blockNumber"], log["logIndex"])):
+            topic = bytes(log["topics"][0])
+            event = getattr(self.contract.events, topic_names[topic])().process_log(log)
+            for callback in self._subscribers.get(topic, []):
+                try:
+                    callback(event)
+                except Exception as e:
+                    print(f"Error handling {event['event']} event: {str(e)}")
+
+        self._last_block = to_block
+        if to_block < head:
+            return False
+        self.last_polled_at = time.monotonic()
+        return True
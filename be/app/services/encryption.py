@@ -1,7 +1,258 @@
 from Crypto.Cipher import AES
 from Crypto.Random import get_random_bytes
-from Crypto.Util.Padding import pad, unpad
+from Crypto.Util.Padding import unpad
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import base64
+import os
+import struct
+from typing import Optional
+
+# Envelope: MAGIC | version (1) | chunk size (uint32 BE) | nonce prefix (7) | frames
+# Each frame is AES-256-GCM(chunk) + 16-byte tag. The nonce is prefix | frame counter
+# (uint32 BE) | last-frame flag, and the header is the AAD of every frame, so frames
+# cannot be reordered, truncated or moved between envelopes. Anything without the
+# magic is a legacy AES-256-CBC blob (IV + ciphertext).
+# Version 2 appends the zstd dictionary ID (uint32 BE) to the header: the frames hold
+# the plaintext compressed with that dictionary (see CompressionService).
+MAGIC = b"CRTF"
+ENVELOPE_V1 = 1
+ENVELOPE_V2 = 2
+HEADER_SIZE = 16
+HEADER_SIZE_V2 = 20
+TAG_SIZE = 16
+ENCRYPTION_CHUNK_SIZE = int(os.getenv('ENCRYPTION_CHUNK_SIZE', str(64 * 1024)))
+
+def is_envelope(data: bytes) -> bool:
+    return data[:4] == MAGIC
+
+def _frame_nonce(prefix: bytes, counter: int, final: bool) -> bytes:
+    return prefix + struct.pack(">IB", counter, 1 if final else 0)
+
+def _header_size(header: bytes) -> int:
+    """Size of the header starting `header`, from its version byte (needs 5 bytes)"""
+    return HEADER_SIZE_V2 if header[4] == ENVELOPE_V2 else HEADER_SIZE
+
+def _parse_header(header: bytes):
+    """Returns: (version, chunk size, nonce prefix, dictionary ID or None)"""
+    if len(header) < HEADER_SIZE or header[:4] != MAGIC:
+        raise ValueError("Decryption failed: not an envelope")
+    version, chunk_size = struct.unpack(">BI", header[4:9])
+    if version not in (ENVELOPE_V1, ENVELOPE_V2) or chunk_size == 0:
+        raise ValueError(f"Decryption failed: unsupported envelope version {version}")
+    if version == ENVELOPE_V1:
+        return version, chunk_size, header[9:16], None
+    if len(header) < HEADER_SIZE_V2:
+        raise ValueError("Decryption failed: truncated envelope")
+    return version, chunk_size, header[9:16], struct.unpack(">I", header[16:20])[0]
+
+def _build_header(chunk_size: int, prefix: bytes, dict_id: Optional[int]) -> bytes:
+    if dict_id is None:
+        return MAGIC + struct.pack(">BI", ENVELOPE_V1, chunk_size) + prefix
+    return MAGIC + struct.pack(">BI", ENVELOPE_V2, chunk_size) + prefix + struct.pack(">I", dict_id)
+
+def envelope_dictionary(data: bytes) -> Optional[int]:
+    """Dictionary ID of a compressed (v2) envelope, None for anything else"""
+    if not is_envelope(data) or len(data) < HEADER_SIZE:
+        return None
+    return _parse_header(bytes(data[:_header_size(data)]))[3]
+
+def encrypt_envelope(
+    data: bytes,
+    key: bytes,
+    chunk_size: int = ENCRYPTION_CHUNK_SIZE,
+    dict_id: Optional[int] = None
+) -> bytes:
+    """
+    Whole-buffer envelope encryption, framing through a memoryview without copies
+    `dict_id` marks `data` as compressed with that dictionary (version 2 header)
+    """
+    aead = AESGCM(key)
+    prefix = get_random_bytes(7)
+    header = _build_header(chunk_size, prefix, dict_id)
+    view = memoryview(data)
+    # A zero-length plaintext still gets one (final) frame
+    starts = range(0, max(len(data), 1), chunk_size)
+    last = len(starts) - 1
+    frames = [header]
+    for counter, start in enumerate(starts):
+        frames.append(aead.encrypt(
+            _frame_nonce(prefix, counter, counter == last),
+            view[start:start + chunk_size],
+            header
+        ))
+    return b''.join(frames)
+
+def decrypt_envelope(data: bytes, key: bytes) -> bytes:
+    """
+    Whole-buffer envelope decryption
+    Returns the framed payload, still compressed for version 2 envelopes
+    """
+    header = bytes(data[:_header_size(data)]) if len(data) > 4 else bytes(data)
+    _, chunk_size, prefix, _ = _parse_header(header)
+    aead = AESGCM(key)
+    frame_size = chunk_size + TAG_SIZE
+    view = memoryview(data)[len(header):]
+    if len(view) < TAG_SIZE:
+        raise ValueError("Decryption failed: truncated envelope")
+    starts = range(0, len(view), frame_size)
+    last = len(starts) - 1
+    chunks = []
+    for counter, start in enumerate(starts):
+        try:
+            chunks.append(aead.decrypt(
+                _frame_nonce(prefix, counter, counter == last),
+                view[start:start + frame_size],
+                header
+            ))
+        except InvalidTag:
+            raise ValueError(f"Decryption failed: frame {counter} failed authentication")
+    return b''.join(chunks)
+
+class EnvelopeEncryptor:
+    """Incremental envelope encryption; the last chunk is held back until finalize() marks it"""
+
+    def __init__(self, key: bytes, chunk_size: int = ENCRYPTION_CHUNK_SIZE):
+        self._aead = AESGCM(key)
+        self._chunk_size = chunk_size
+        self._prefix = get_random_bytes(7)
+        self._header = MAGIC + struct.pack(">BI", ENVELOPE_V1, chunk_size) + self._prefix
+        self._pending_header = self._header
+        self._counter = 0
+        self._buffer = bytearray()
+
+    def _frame(self, chunk: bytes, final: bool) -> bytes:
+        frame = self._aead.encrypt(_frame_nonce(self._prefix, self._counter, final), chunk, self._header)
+        self._counter += 1
+        return frame
+
+    def update(self, data: bytes) -> bytes:
+        self._buffer += data
+        out = [self._pending_header]
+        self._pending_header = b''
+        # Strictly greater: a full chunk may still turn out to be the last one
+        while len(self._buffer) > self._chunk_size:
+            out.append(self._frame(bytes(self._buffer[:self._chunk_size]), final=False))
+            del self._buffer[:self._chunk_size]
+        return b''.join(out)
+
+    def finalize(self) -> bytes:
+        out = self._pending_header + self._frame(bytes(self._buffer), final=True)
+        self._pending_header = b''
+        self._buffer.clear()
+        return out
+
+class EnvelopeDecryptor:
+    """
+    Incremental envelope decryption; a tampered frame is rejected as soon as it arrives
+    Version 2 payloads are decompressed on the way out through `compression`
+    """
+
+    def __init__(self, key: bytes, compression=None):
+        self._key = key
+        self._compression = compression
+        self._decompressor = None
+        self._aead = None
+        self._buffer = bytearray()
+
+    def _frame(self, frame: bytes, final: bool) -> bytes:
+        try:
+            plaintext = self._aead.decrypt(_frame_nonce(self._prefix, self._counter, final), frame, self._header)
+        except InvalidTag:
+            raise ValueError(f"Decryption failed: frame {self._counter} failed authentication")
+        self._counter += 1
+        return plaintext
+
+    def update(self, data: bytes) -> bytes:
+        self._buffer += data
+        if self._aead is None:
+            if len(self._buffer) < HEADER_SIZE or len(self._buffer) < _header_size(self._buffer):
+                return b''
+            header_size = _header_size(self._buffer)
+            self._header = bytes(self._buffer[:header_size])
+            _, chunk_size, self._prefix, dict_id = _parse_header(self._header)
+            if dict_id is not None:
+                if self._compression is None:
+                    raise ValueError(f"Decryption failed: payload is compressed with dictionary {dict_id}")
+                self._decompressor = self._compression.decompressor(dict_id)
+            self._frame_size = chunk_size + TAG_SIZE
+            self._aead = AESGCM(self._key)
+            self._counter = 0
+            del self._buffer[:header_size]
+        out = []
+        while len(self._buffer) > self._frame_size:
+            out.append(self._frame(bytes(self._buffer[:self._frame_size]), final=False))
+            del self._buffer[:self._frame_size]
+        return self._decompress(b''.join(out))
+
+    def finalize(self) -> bytes:
+        if self._aead is None or len(self._buffer) < TAG_SIZE:
+            raise ValueError("Decryption failed: truncated envelope")
+        plaintext = self._decompress(self._frame(bytes(self._buffer), final=True))
+        self._buffer.clear()
+        if self._decompressor is not None:
+            plaintext += self._decompressor.finalize()
+        return plaintext
+
+    def _decompress(self, data: bytes) -> bytes:
+        return self._decompressor.update(data) if self._decompressor is not None else data
+
+class LegacyCBCDecryptor:
+    """Incremental AES-256-CBC decryption of IV + ciphertext; the last block is held back for unpad"""
+
+    def __init__(self, key: bytes):
+        self._key = key
+        self._cipher = None
+        self._buffer = bytearray()
+
+    def update(self, data: bytes) -> bytes:
+        self._buffer += data
+        if self._cipher is None:
+            if len(self._buffer) < 16:
+                return b''
+            self._cipher = AES.new(self._key, AES.MODE_CBC, bytes(self._buffer[:16]))
+            del self._buffer[:16]
+        usable = ((len(self._buffer) - 1) // AES.block_size) * AES.block_size
+        if usable <= 0:
+            return b''
+        out = self._cipher.decrypt(bytes(self._buffer[:usable]))
+        del self._buffer[:usable]
+        return out
+
+    def finalize(self) -> bytes:
+        if self._cipher is None or len(self._buffer) != AES.block_size:
+            raise ValueError("Decryption failed: truncated ciphertext")
+        try:
+            return unpad(self._cipher.decrypt(bytes(self._buffer)), AES.block_size)
+        except ValueError as e:
+            raise ValueError(f"Decryption failed: {str(e)}")
+
+class StreamDecryptor:
+    """Picks the envelope or legacy CBC decryptor from the first bytes of the stream"""
+
+    def __init__(self, key: bytes, compression=None):
+        self._key = key
+        self._compression = compression
+        self._inner = None
+        self._buffer = bytearray()
+
+    def update(self, data: bytes) -> bytes:
+        if self._inner is None:
+            self._buffer += data
+            if len(self._buffer) < len(MAGIC):
+                return b''
+            if is_envelope(self._buffer):
+                self._inner = EnvelopeDecryptor(self._key, self._compression)
+            else:
+                self._inner = LegacyCBCDecryptor(self._key)
+            data = bytes(self._buffer)
+            self._buffer.clear()
+        return self._inner.update(data)
+
+    def finalize(self) -> bytes:
+        if self._inner is None:
+            raise ValueError("Decryption failed: truncated ciphertext")
+        return self._inner.finalize()
 
 class AESEncryptionService:
     @staticmethod
@@ -9,35 +260,60 @@ class AESEncryptionService:
         """Generate a random 256-bit AES key"""
         key = get_random_bytes(32)  # 256 bits
         return base64.b64encode(key).decode('utf-8')
-    
+
     @staticmethod
-    def encrypt(data: bytes, key_b64: str) -> bytes:
+    def encrypt(data: bytes, key_b64: str, compression=None) -> bytes:
         """
-        Encrypt data using AES-256-CBC
-        Returns: IV + encrypted data
+        Encrypt data into a chunked AES-256-GCM envelope
+        With `compression` (CompressionService or DictionaryCompressor) the data is
+        dictionary-compressed first and the dictionary ID recorded in the header
+        Returns: header + authenticated frames
         """
         try:
-            key = base64.b64decode(key_b64)
-            iv = get_random_bytes(16)
-            cipher = AES.new(key, AES.MODE_CBC, iv)
-            padded_data = pad(data, AES.block_size)
-            encrypted = cipher.encrypt(padded_data)
-            return iv + encrypted
+            dict_id = None
+            if compression is not None:
+                dict_id, data = compression.compress(data)
+            return encrypt_envelope(data, base64.b64decode(key_b64), dict_id=dict_id)
         except Exception as e:
             raise ValueError(f"Encryption failed: {str(e)}")
-    
+
     @staticmethod
-    def decrypt(encrypted_data: bytes, key_b64: str) -> bytes:
+    def decrypt(encrypted_data: bytes, key_b64: str, compression=None) -> bytes:
         """
-        Decrypt data using AES-256-CBC
-        Expects: IV + encrypted data
+        Decrypt an envelope, or a legacy AES-256-CBC blob (IV + encrypted data)
+        Compressed envelopes need `compression` (CompressionService) to be decompressed
         """
         try:
             key = base64.b64decode(key_b64)
+            if is_envelope(encrypted_data):
+                payload = decrypt_envelope(encrypted_data, key)
+                dict_id = envelope_dictionary(encrypted_data)
+                if dict_id is None:
+                    return payload
+                if compression is None:
+                    raise ValueError(f"Decryption failed: payload is compressed with dictionary {dict_id}")
+                return compression.decompress(dict_id, payload)
             iv = encrypted_data[:16]
             encrypted = encrypted_data[16:]
             cipher = AES.new(key, AES.MODE_CBC, iv)
             decrypted = cipher.decrypt(encrypted)
             return unpad(decrypted, AES.block_size)
         except Exception as e:
-            raise ValueError(f"Decryption failed: {str(e)}")
\ No newline at end of file
+            if str(e).startswith("Decryption failed"):
+                raise
+            raise ValueError(f"Decryption failed: {str(e)}")
+
+    @staticmethod
+    def encryptor(key_b64: str) -> EnvelopeEncryptor:
+        """
+        Incremental encryption for payloads too large to hold in memory
+        Feed chunks to update(), then call finalize() once
+        """
+        return EnvelopeEncryptor(base64.b64decode(key_b64))
+
+    @staticmethod
+    def decryptor(key_b64: str, compression=None) -> StreamDecryptor:
+        """
+        Incremental decryption of envelopes and legacy CBC blobs
+        """
+        return StreamDecryptor(base64.b64decode(key_b64), compression)
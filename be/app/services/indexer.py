@@ -0,0 +1,225 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from eth_abi.exceptions import DecodingError
+from eth_utils import event_abi_to_log_topic
+from sqlalchemy.orm import Session
+from web3 import Web3
+
+from app.database.connection import SessionLocal
+from app.models.certificate_index import IndexedCertificate, IndexedCertificateEvent, IndexerCheckpoint
+from app.services.certificate_index import CertificateIndexService
+from app.services.container import get_contract_service
+from app.services.read_contract import ContractService
+
+INDEXER_ENABLED = os.getenv("INDEXER_ENABLED", "false").lower() == "true"
+
+INDEXED_EVENTS = [
+    "CertificateProposed",
+    "CertificateIssueSigned",
+    "CertificateIssued",
+    "CertificateRevokeSigned",
+    "CertificateRevoked",
+]
+
+class CertificateIndexer:
+    """
+    Background indexer tailing certificate events into Postgres
+    Only blocks at least INDEXER_CONFIRMATIONS deep are applied, so reorgs above
+    that depth never reach the index and nothing has to be rolled back
+    """
+
+    def __init__(self, contract_service: Optional[ContractService] = None):
+        self.contract_service = contract_service or get_contract_service()
+        self.w3 = self.contract_service.w3
+        self.contract = self.contract_service.contract
+
+        self.start_block = int(os.getenv("INDEXER_START_BLOCK", "0"))
+        self.confirmations = int(os.getenv("INDEXER_CONFIRMATIONS", "12"))
+        self.block_range = int(os.getenv("INDEXER_BLOCK_RANGE", "2000"))
+        self.workers = int(os.getenv("INDEXER_WORKERS", "4"))
+        self.poll_interval = float(os.getenv("INDEXER_POLL_INTERVAL", "12"))
+
+        self.topics = {
+            event_abi_to_log_topic(item): item["name"]
+            for item in self.contract_service.contract_abi
+            if item["type"] == "event" and item["name"] in INDEXED_EVENTS
+        }
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ========== LIFECYCLE ==========
+
+    def start(self) -> None:
+        """Start tailing in a daemon thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="certificate-indexer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_interval)
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.sync_once()
+            except Exception as e:
+                print(f"Error indexing certificate events: {str(e)}")
+            self._stop_event.wait(self.poll_interval)
+
+    # ========== SYNC ==========
+
+    def sync_once(self) -> Optional[int]:
+        """
+        Index every confirmed block past the checkpoint
+        Block ranges are fetched in parallel and applied in order, one commit per range
+        Returns: the new checkpoint block
+        """
+        db = SessionLocal()
+        try:
+            target = self.w3.eth.block_number - self.confirmations
+            row = db.get(IndexerCheckpoint, CertificateIndexService.CHECKPOINT_NAME)
+            checkpoint = row.block_number if row else None
+            next_block = checkpoint + 1 if checkpoint is not None else self.start_block
+            if next_block > target:
+                return checkpoint
+
+            ranges = [
+                (from_block, min(from_block + self.block_range - 1, target))
+                for from_block in range(next_block, target + 1, self.block_range)
+            ]
+            window = self.workers * 4
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for i in range(0, len(ranges), window):
+                    batch = ranges[i:i + window]
+                    # map() yields in submission order, so earlier ranges are applied
+                    # while later ones are still being fetched
+                    for (_, to_block), logs in zip(batch, executor.map(self.fetch_logs, batch)):
+                        self._apply_range(db, logs, to_block)
+                        checkpoint = to_block
+
+            return checkpoint
+        finally:
+            db.close()
+
+    def fetch_logs(self, block_range: Tuple[int, int]) -> List[Dict]:
+        """Fetch all indexed certificate events in a block range with one eth_getLogs"""
+        from_block, to_block = block_range
+        return self.w3.eth.get_logs({
+            "address": self.contract.address,
+            "fromBlock": from_block,
+            "toBlock": to_block,
+            "topics": [[Web3.to_hex(topic) for topic in self.topics]]
+        })
+
+    def _apply_range(self, db: Session, logs: List[Dict], to_block: int) -> None:
+        block_timestamps: Dict[int, int] = {}
+        try:
+            for log in sorted(logs, key=lambda log: (log["blockNumber"], log["logIndex"])):
+                self._apply_log(db, log, block_timestamps)
+
+            checkpoint = db.get(IndexerCheckpoint, CertificateIndexService.CHECKPOINT_NAME)
+            if checkpoint:
+                checkpoint.block_number = to_block
+            else:
+                db.add(IndexerCheckpoint(name=CertificateIndexService.CHECKPOINT_NAME, block_number=to_block))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+    def _apply_log(self, db: Session, log: Dict, block_timestamps: Dict[int, int]) -> None:
+        event_name = self.topics[bytes(log["topics"][0])]
+        args = getattr(self.contract.events, event_name)().process_log(log)["args"]
+
+        tx_hash = Web3.to_hex(log["transactionHash"])
+        student_id_hash = Web3.to_hex(args["studentId"])
+        block_number = log["blockNumber"]
+
+        if db.get(IndexedCertificateEvent, (tx_hash, log["logIndex"])):
+            return
+
+        if block_number not in block_timestamps:
+            block_timestamps[block_number] = self.w3.eth.get_block(block_number)["timestamp"]
+        timestamp = block_timestamps[block_number]
+
+        db.add(IndexedCertificateEvent(
+            tx_hash=tx_hash,
+            log_index=log["logIndex"],
+            block_number=block_number,
+            event=event_name,
+            student_id_hash=student_id_hash,
+            issuer=args.get("issuer") or args.get("proposer"),
+            data=json.dumps({
+                key: value.hex() if isinstance(value, bytes) else value
+                for key, value in args.items()
+                if key not in ("studentId", "issuer", "proposer")
+            })
+        ))
+
+        cert = db.get(IndexedCertificate, student_id_hash)
+
+        if event_name == "CertificateProposed":
+            proposal = self._decode_proposal(log["transactionHash"])
+            if cert is None:
+                cert = IndexedCertificate(student_id_hash=student_id_hash)
+                db.add(cert)
+            # Re-proposal after revocation replaces the previous record, as in the contract
+            cert.student_id = proposal.get("studentId")
+            cert.cert_hash = args["certHash"].hex()
+            cert.ipfs_cid = args["ipfsCID"]
+            cert.proposer = args["proposer"]
+            cert.issuer_wallets = json.dumps([str(addr) for addr in proposal.get("issuerWallets", [])])
+            cert.requires_all_signatures = proposal.get("requiresAllSignatures", True)
+            cert.issue_signature_count = 0
+            cert.revoke_signature_count = 0
+            cert.is_valid = False
+            cert.revoke_reason = ""
+            cert.timestamp_issued = timestamp
+            cert.proposed_block = block_number
+            cert.proposed_log_index = log["logIndex"]
+        elif cert is None:
+            print(f"Skipping {event_name} for unknown certificate {student_id_hash}")
+            return
+        elif event_name == "CertificateIssueSigned":
+            cert.issue_signature_count += 1
+        elif event_name == "CertificateIssued":
+            cert.is_valid = True
+        elif event_name == "CertificateRevokeSigned":
+            cert.revoke_signature_count += 1
+            if args["reason"]:
+                cert.revoke_reason = args["reason"]
+        elif event_name == "CertificateRevoked":
+            cert.is_valid = False
+            cert.revoke_reason = args["reason"]
+
+        cert.timestamp_last_updated = timestamp
+        cert.last_block = block_number
+        db.flush()
+
+    def _decode_proposal(self, tx_hash) -> Dict:
+        """
+        Recover the plain studentId and issuer list from the proposeCertificate calldata,
+        since the event only carries the hashed studentId
+        RPC errors are raised so the block range is retried instead of indexed without them
+        Returns: {} only when the transaction is not a direct proposeCertificate call
+        """
+        tx = self.w3.eth.get_transaction(tx_hash)
+        try:
+            function, params = self.contract.decode_function_input(tx["input"])
+        except (ValueError, DecodingError) as e:
+            print(f"Cannot decode proposal {Web3.to_hex(tx_hash)}: {str(e)}")
+            return {}
+        if function.fn_name != "proposeCertificate":
+            print(f"Cannot decode proposal {Web3.to_hex(tx_hash)}: sent through {function.fn_name}")
+            return {}
+        return params
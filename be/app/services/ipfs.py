@@ -1,12 +1,76 @@
 import requests
+import json
 import os
-from typing import Optional
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
 from io import BytesIO
+from requests.adapters import HTTPAdapter
+from app.services.blob_cache import BlobCache
+from app.services.unixfs import add_params
+
+IPFS_ADD_BATCH_SIZE = int(os.getenv('IPFS_ADD_BATCH_SIZE', '500'))
+
+def split_batch_files(files: List[Tuple[str, bytes]]) -> Tuple[List[Tuple[str, bytes]], Dict[str, str]]:
+    """
+    Reject names Kubo would treat as paths
+    Results are keyed by filename, so a name given twice cannot be reported on
+    unambiguously and the whole request is refused with ValueError
+    Returns: (files to send, {filename: error})
+    """
+    counts = Counter(filename for filename, _ in files)
+    duplicates = sorted(filename for filename, count in counts.items() if count > 1)
+    if duplicates:
+        raise ValueError(f"Duplicate filenames: {', '.join(duplicates)}")
+    valid = []
+    errors = {}
+    for filename, content in files:
+        if not filename or '/' in filename or filename in ('.', '..'):
+            errors[filename] = "Invalid filename"
+        else:
+            valid.append((filename, content))
+    return valid, errors
+
+def parse_add_response(text: str) -> Tuple[Dict[str, str], Optional[str]]:
+    """
+    Parse the NDJSON of a multi-file /api/v0/add
+    Returns: ({filename: CID}, CID of the wrapping directory if any)
+    """
+    cids = {}
+    directory = None
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        if entry.get('Name'):
+            cids[entry['Name']] = entry['Hash']
+        else:
+            directory = entry['Hash']
+    return cids, directory
 
 class IPFSService:
-    def __init__(self):
+    """
+    Client for the Kubo HTTP API
+    Holds one keep-alive session, so bursts of uploads and downloads reuse connections.
+    Reads go through the optional CID-keyed blob cache, which uploads warm
+    """
+
+    def __init__(self, blob_cache: Optional[BlobCache] = None):
+        self.blob_cache = blob_cache
         self.ipfs_url = os.getenv('IPFS_URL', 'http://127.0.0.1:5001')
         self.gateway_url = os.getenv('IPFS_GATEWAY', 'http://127.0.0.1:8080/ipfs')
+        self.pool_size = int(os.getenv('IPFS_POOL_SIZE', '20'))
+        self.timeout = (
+            float(os.getenv('IPFS_CONNECT_TIMEOUT', '5')),
+            float(os.getenv('IPFS_READ_TIMEOUT', '30'))
+        )
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def close(self) -> None:
+        self.session.close()
     
     def upload_file(self, file_content: bytes, filename: str) -> Optional[str]:
         """
@@ -16,32 +80,90 @@ class IPFSService:
             files = {
                 'file': (filename, BytesIO(file_content))
             }
-            response = requests.post(
+            response = self.session.post(
                 f'{self.ipfs_url}/api/v0/add',
+                params=add_params(),
                 files=files,
-                timeout=30
+                timeout=self.timeout
             )
             response.raise_for_status()
             result = response.json()
             cid = result['Hash']
+            if self.blob_cache:
+                self.blob_cache.put(cid, file_content)
             print(f"File uploaded to IPFS: {cid}")
             return cid
         except Exception as e:
             print(f"Error uploading to IPFS: {str(e)}")
             return None
     
+    def upload_many(self, files: List[Tuple[str, bytes]], wrap_with_directory: bool = False) -> Dict:
+        """
+        Upload many files with one multipart /api/v0/add per IPFS_ADD_BATCH_SIZE files
+        With `wrap_with_directory`, everything goes in one add so a single directory CID
+        covers the whole set. A failed batch is retried file by file so the error can be
+        attributed to the files that caused it
+        Raises ValueError, before uploading anything, when a filename appears twice
+        Returns: {"cids": {filename: CID}, "errors": {filename: error}, "directory": CID or None}
+        """
+        valid, errors = split_batch_files(files)
+        cids = {}
+        directory = None
+        batch_size = len(valid) if wrap_with_directory else IPFS_ADD_BATCH_SIZE
+
+        for start in range(0, len(valid), max(batch_size, 1)):
+            batch = valid[start:start + batch_size]
+            try:
+                response = self.session.post(
+                    f'{self.ipfs_url}/api/v0/add',
+                    params={**add_params(), 'wrap-with-directory': 'true' if wrap_with_directory else 'false'},
+                    files=[('file', (filename, BytesIO(content))) for filename, content in batch],
+                    timeout=self.timeout
+                )
+                response.raise_for_status()
+                batch_cids, directory = parse_add_response(response.text)
+            except Exception as e:
+                print(f"Error uploading batch to IPFS: {str(e)}")
+                if wrap_with_directory:
+                    errors.update({filename: str(e) for filename, _ in batch})
+                    continue
+                batch_cids = {}
+                for filename, content in batch:
+                    cid = self.upload_file(content, filename)
+                    if cid:
+                        batch_cids[filename] = cid
+                    else:
+                        errors[filename] = "Upload failed"
+
+            for filename, content in batch:
+                cid = batch_cids.get(filename)
+                if cid is None:
+                    errors.setdefault(filename, "Missing from IPFS response")
+                    continue
+                cids[filename] = cid
+                if self.blob_cache:
+                    self.blob_cache.put(cid, content)
+
+        print(f"Uploaded {len(cids)} files to IPFS, {len(errors)} failed")
+        return {"cids": cids, "errors": errors, "directory": directory}
+
     def get_file(self, cid: str) -> Optional[bytes]:
         """
         Retrieve file from IPFS by CID
         """
+        if self.blob_cache:
+            cached = self.blob_cache.get(cid)
+            if cached is not None:
+                return cached
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.ipfs_url}/api/v0/cat",
                 params={"arg": cid},
-                stream=True,
-                timeout=30
+                timeout=self.timeout
             )
             response.raise_for_status()
+            if self.blob_cache:
+                self.blob_cache.put(cid, response.content)
             return response.content
 
         except Exception as e:
@@ -53,4 +175,4 @@ class IPFSService:
         """
         Get public gateway URL for CID
         """
-        return f"{self.gateway_url}/{cid}"
\ No newline at end of file
+        return f"{self.gateway_url}/{cid}"
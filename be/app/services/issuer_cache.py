@@ -0,0 +1,102 @@
+import os
+import threading
+import time
+from typing import Dict, Optional, Set
+
+from app.services.contract_events import ContractEventWatcher
+
+class IssuerCache:
+    """
+    In-process set of active issuer addresses (lowercased, so lookups skip checksumming)
+    Warmed from getIssuerList, kept current by IssuerAdded / IssuerRemoved events and
+    fully reloaded every ISSUER_CACHE_TTL seconds in case an event was missed
+    """
+
+    def __init__(self, contract_service, ttl: Optional[float] = None):
+        self.contract_service = contract_service
+        self.ttl = ttl if ttl is not None else float(os.getenv("ISSUER_CACHE_TTL", "300"))
+        self.watcher = ContractEventWatcher(contract_service)
+        self.watcher.subscribe("IssuerAdded", self._on_issuer_added)
+        self.watcher.subscribe("IssuerRemoved", self._on_issuer_removed)
+
+        self._issuers: Set[str] = set()
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.events_applied = 0
+
+    def is_issuer(self, wallet_address: str) -> Optional[bool]:
+        """
+        Answer from memory, reloading first if the cache is cold or past its TTL
+        Returns: None if the issuer list could not be loaded
+        """
+        if self._is_fresh():
+            self.hits += 1
+        else:
+            self.misses += 1
+            if not self.reload():
+                return None
+        return wallet_address.lower() in self._issuers
+
+    def _is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    def reload(self) -> bool:
+        """Reload active issuers with getIssuerList plus one batched isIssuer per address"""
+        with self._lock:
+            if self._is_fresh():
+                return True
+            try:
+                # Start watching before reading so no event between the read and the
+                # first poll is lost; replaying an add/remove is harmless
+                if not self.watcher.is_running:
+                    self.watcher.start()
+
+                issuer_list = self.contract_service.contract.functions.getIssuerList().call()
+                # getIssuerList keeps removed issuers, so filter on isActive
+                active = self.contract_service.batch_call(
+                    [("isIssuer", [address]) for address in issuer_list]
+                )
+                self._issuers = {
+                    address.lower()
+                    for address, result in zip(issuer_list, active)
+                    if result and result[0]
+                }
+                self._loaded_at = time.monotonic()
+                self.reloads += 1
+                return True
+            except Exception as e:
+                print(f"Error loading issuer cache: {str(e)}")
+                return False
+
+    def invalidate(self) -> None:
+        """Force a reload on the next lookup"""
+        self._loaded_at = None
+
+    # Event handlers take the lock so a concurrent reload cannot overwrite them with older state
+
+    def _on_issuer_added(self, event) -> None:
+        with self._lock:
+            self._issuers = self._issuers | {event["args"]["walletId"].lower()}
+            self.events_applied += 1
+
+    def _on_issuer_removed(self, event) -> None:
+        with self._lock:
+            self._issuers = self._issuers - {event["args"]["walletId"].lower()}
+            self.events_applied += 1
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "issuers": len(self._issuers),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "reloads": self.reloads,
+            "events_applied": self.events_applied,
+            "age_seconds": time.monotonic() - self._loaded_at if self._loaded_at is not None else None,
+            "watching_events": self.watcher.is_running
+        }
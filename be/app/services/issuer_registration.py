@@ -1,7 +1,8 @@
 from typing import Optional, List
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, asc, desc
+from sqlalchemy import and_, asc, desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
+import uuid
 
 from app.models.Issuer_registration import Issuer_registration, IssuerStatus
 from app.services.session import (
@@ -12,8 +13,8 @@ class IssuerRegistrationService:
     """Service for managing issuer registrations"""
 
     @staticmethod
-    def create_registration(
-        db: Session,
+    async def create_registration(
+        db: AsyncSession,
         name: str,
         wallet_address: str,
         created_at: Optional[int] = None,
@@ -22,7 +23,7 @@ class IssuerRegistrationService:
 
         if created_at is None:
             created_at = int(datetime.utcnow().timestamp())
-        session = SessionService.get_session(db, wallet_address)
+        session = await SessionService.get_session(db, wallet_address)
         if not session:
             raise Exception("No active session found for the given wallet address.")
         registration = Issuer_registration(
@@ -35,34 +36,32 @@ class IssuerRegistrationService:
         )
 
         db.add(registration)
-        db.commit()
-        db.refresh(registration)
+        await db.commit()
 
         return registration
 
     @staticmethod
-    def get_by_id(
-        db: Session, id_registration: str
+    async def get_by_id(
+        db: AsyncSession, id_registration: str
     ) -> Optional[Issuer_registration]:
-        return (
-            db.query(Issuer_registration)
-            .filter(Issuer_registration.id_registration == id_registration)
-            .first()
-        )
+        try:
+            return await db.get(Issuer_registration, uuid.UUID(id_registration))
+        except ValueError:
+            return None
     
     @staticmethod
-    def get_by_wallet(
-        db: Session, wallet_address: str
+    async def get_by_wallet(
+        db: AsyncSession, wallet_address: str
     ) -> Optional[Issuer_registration]:
-        return (
-            db.query(Issuer_registration)
-            .filter(Issuer_registration.wallet_address == wallet_address)
-            .first()
+        return await db.scalar(
+            select(Issuer_registration)
+            .where(Issuer_registration.wallet_address == wallet_address)
+            .limit(1)
         )
 
     @staticmethod
-    def get_all(
-        db: Session,
+    async def get_all(
+        db: AsyncSession,
         name: Optional[str] = None,
         status: Optional[IssuerStatus] = None,
         start_date: Optional[int] = None,
@@ -75,37 +74,36 @@ class IssuerRegistrationService:
         Get all registrations with filters + pagination
         """
 
-        query = db.query(Issuer_registration)
+        query = select(Issuer_registration)
 
         # Filters
         if name:
-            query = query.filter(Issuer_registration.name.ilike(f"%{name}%"))
+            query = query.where(Issuer_registration.name.ilike(f"%{name}%"))
 
         if status:
-            query = query.filter(Issuer_registration.status == status)
+            query = query.where(Issuer_registration.status == status)
 
         if start_date:
-            query = query.filter(Issuer_registration.created_at >= start_date)
+            query = query.where(Issuer_registration.created_at >= start_date)
 
         if end_date:
-            query = query.filter(Issuer_registration.created_at <= end_date)
+            query = query.where(Issuer_registration.created_at <= end_date)
+
+        total = await db.scalar(select(func.count()).select_from(query.subquery()))
 
         # Sorting
         if sort == "oldest":
             query = query.order_by(asc(Issuer_registration.created_at))
         else:
             query = query.order_by(desc(Issuer_registration.created_at))
-        
-        total = query.count()
 
         # Pagination
         offset = (page - 1) * page_size
-        items = (
+        items = (await db.scalars(
             query.order_by(Issuer_registration.created_at.desc())
             .offset(offset)
             .limit(page_size)
-            .all()
-        )
+        )).all()
 
         return {
             "total": total,
@@ -115,53 +113,44 @@ class IssuerRegistrationService:
         }
 
     @staticmethod
-    def update_status(
-        db: Session,
+    async def update_status(
+        db: AsyncSession,
         id_registration: str,
         status: IssuerStatus,
     ) -> Optional[Issuer_registration]:
         """Accept or reject issuer registration"""
 
-        registration = (
-            db.query(Issuer_registration)
-            .filter(Issuer_registration.id_registration == id_registration)
-            .first()
-        )
+        registration = await IssuerRegistrationService.get_by_id(db, id_registration)
 
         if not registration:
             return None
 
         registration.status = status
-        db.commit()
-        db.refresh(registration)
+        await db.commit()
 
         return registration
 
     @staticmethod
-    def accept_registration(db: Session, id_registration: str):
-        return IssuerRegistrationService.update_status(
+    async def accept_registration(db: AsyncSession, id_registration: str):
+        return await IssuerRegistrationService.update_status(
             db, id_registration, IssuerStatus.accept
         )
 
     @staticmethod
-    def reject_registration(db: Session, id_registration: str):
-        return IssuerRegistrationService.update_status(
+    async def reject_registration(db: AsyncSession, id_registration: str):
+        return await IssuerRegistrationService.update_status(
             db, id_registration, IssuerStatus.reject
         )
 
     @staticmethod
-    def delete_registration(
-        db: Session, id_registration: str
+    async def delete_registration(
+        db: AsyncSession, id_registration: str
     ) -> bool:
-        registration = (
-            db.query(Issuer_registration)
-            .filter(Issuer_registration.id_registration == id_registration)
-            .first()
-        )
+        registration = await IssuerRegistrationService.get_by_id(db, id_registration)
 
         if not registration:
             return False
 
-        db.delete(registration)
-        db.commit()
+        await db.delete(registration)
+        await db.commit()
         return True
@@ -0,0 +1,50 @@
+from typing import List
+
+from eth_abi import encode
+from eth_utils import keccak
+
+# Mirrors DiplomaContract: leaf = keccak256(abi.encode(studentId, certHash)) and every
+# pair is hashed in sorted order, so a proof is just the list of siblings. An unpaired
+# node is carried up to the next level unchanged
+
+def cohort_leaf(student_id: str, cert_hash: str) -> bytes:
+    """Leaf of a certificate; cert_hash is the sha256 hex stored as bytes32 on chain"""
+    return keccak(encode(['string', 'bytes32'], [student_id, bytes.fromhex(cert_hash.removeprefix('0x'))]))
+
+def _hash_pair(a: bytes, b: bytes) -> bytes:
+    return keccak(a + b) if a < b else keccak(b + a)
+
+class MerkleTree:
+    """Merkle tree over cohort leaves, kept level by level so proofs are cheap to read out"""
+
+    def __init__(self, leaves: List[bytes]):
+        if not leaves:
+            raise ValueError("Cannot build a Merkle tree without leaves")
+        self.levels = [list(leaves)]
+        while len(self.levels[-1]) > 1:
+            level = self.levels[-1]
+            parents = [_hash_pair(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                parents.append(level[-1])
+            self.levels.append(parents)
+
+    @property
+    def root(self) -> bytes:
+        return self.levels[-1][0]
+
+    def proof(self, index: int) -> List[bytes]:
+        """Siblings from the leaf at `index` up to the root"""
+        proof = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                proof.append(level[sibling])
+            index //= 2
+        return proof
+
+def verify_proof(leaf: bytes, proof: List[bytes], root: bytes) -> bool:
+    """Same fold as DiplomaContract._processProof"""
+    computed = leaf
+    for sibling in proof:
+        computed = _hash_pair(computed, sibling)
+    return computed == root
@@ -1,4 +1,5 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.nonce import Nonce
 from typing import Optional  # Add this import for older Python versions
 import time
@@ -7,11 +8,11 @@ class NonceService:
     NONCE_EXPIRY_SECONDS = 300  # 5 minutes
     
     @staticmethod
-    def create_nonce(db: Session, wallet_address: str, nonce: str) -> Nonce:
+    async def create_nonce(db: AsyncSession, wallet_address: str, nonce: str) -> Nonce:
         """Create or update nonce for wallet address"""
         expires_at = int(time.time()) + NonceService.NONCE_EXPIRY_SECONDS
         
-        db_nonce = db.query(Nonce).filter(Nonce.wallet_address == wallet_address).first()
+        db_nonce = await db.get(Nonce, wallet_address)
         
         if db_nonce:
             db_nonce.nonce = nonce
@@ -24,36 +25,33 @@ class NonceService:
             )
             db.add(db_nonce)
         
-        db.commit()
-        db.refresh(db_nonce)
+        await db.commit()
         return db_nonce
     
     @staticmethod
-    def get_nonce(db: Session, wallet_address: str) -> Optional[Nonce]:  # Use Optional for compatibility
+    async def get_nonce(db: AsyncSession, wallet_address: str) -> Optional[Nonce]:  # Use Optional for compatibility
         """Get nonce for wallet address if not expired"""
-        db_nonce = db.query(Nonce).filter(Nonce.wallet_address == wallet_address).first()
+        db_nonce = await db.get(Nonce, wallet_address)
         
         if db_nonce and db_nonce.expires_at > int(time.time()):
             return db_nonce
         
         if db_nonce:
-            db.delete(db_nonce)
-            db.commit()
+            await db.delete(db_nonce)
+            await db.commit()
         
         return None
     
     @staticmethod
-    def delete_nonce(db: Session, wallet_address: str) -> None:
+    async def delete_nonce(db: AsyncSession, wallet_address: str) -> None:
         """Delete nonce after successful verification"""
-        db_nonce = db.query(Nonce).filter(Nonce.wallet_address == wallet_address).first()
-        if db_nonce:
-            db.delete(db_nonce)
-            db.commit()
+        await db.execute(delete(Nonce).where(Nonce.wallet_address == wallet_address))
+        await db.commit()
     
     @staticmethod
-    def cleanup_expired_nonces(db: Session) -> int:
+    async def cleanup_expired_nonces(db: AsyncSession) -> int:
         """Clean up all expired nonces - can be run periodically"""
         current_time = int(time.time())
-        deleted = db.query(Nonce).filter(Nonce.expires_at < current_time).delete()
-        db.commit()
-        return deleted
\ No newline at end of file
+        deleted = await db.execute(delete(Nonce).where(Nonce.expires_at < current_time))
+        await db.commit()
+        return deleted.rowcount
\ No newline at end of file
@@ -0,0 +1,97 @@
+import hashlib
+import os
+import tempfile
+from typing import AsyncIterable, AsyncIterator, BinaryIO, Iterator, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.services.async_ipfs import AsyncIPFSService
+from app.services.encryption import AESEncryptionService
+
+SPOOL_MEMORY_BYTES = int(os.getenv('PAYLOAD_SPOOL_MEMORY_BYTES', str(1024 * 1024)))
+
+class PayloadStreamService:
+    """
+    Constant-memory encrypt/upload and download/decrypt pipelines for large payloads
+    Plaintext is hashed incrementally on the way through, so no step holds a whole file.
+    Per-chunk crypto, hashing and spool writes run in the threadpool, off the event loop
+    """
+
+    @staticmethod
+    async def encrypt_upload(
+        ipfs_service: AsyncIPFSService,
+        encryption_service: AESEncryptionService,
+        chunks: AsyncIterable[bytes],
+        aes_key: str,
+        filename: str
+    ) -> Tuple[Optional[str], str, int]:
+        """
+        Encrypt plaintext chunks and stream the ciphertext to IPFS
+        Returns: (CID or None on failure, sha256 hex of the plaintext, plaintext size)
+        """
+        encryptor = encryption_service.encryptor(aes_key)
+        digest = hashlib.sha256()
+        size = 0
+
+        def seal(chunk: bytes) -> bytes:
+            digest.update(chunk)
+            return encryptor.update(chunk)
+
+        async def ciphertext() -> AsyncIterator[bytes]:
+            nonlocal size
+            async for chunk in chunks:
+                size += len(chunk)
+                encrypted = await run_in_threadpool(seal, chunk)
+                if encrypted:
+                    yield encrypted
+            yield await run_in_threadpool(encryptor.finalize)
+
+        cid = await ipfs_service.upload_stream(ciphertext(), filename)
+        return cid, digest.hexdigest(), size
+
+    @staticmethod
+    async def download_decrypt(
+        ipfs_service: AsyncIPFSService,
+        encryption_service: AESEncryptionService,
+        cid: str,
+        aes_key: str,
+        compression=None
+    ) -> Tuple[BinaryIO, str, int]:
+        """
+        Stream a file from IPFS, decrypt it and spool the plaintext
+        The plaintext stays in memory up to PAYLOAD_SPOOL_MEMORY_BYTES and spills to disk
+        beyond, so it can be checked against its hash before any of it is released
+        Compressed envelopes are decompressed through `compression` (CompressionService)
+        Returns: (spool rewound to the start, sha256 hex of the plaintext, plaintext size)
+        Raises: ValueError if the key or ciphertext is invalid
+        """
+        decryptor = encryption_service.decryptor(aes_key, compression)
+        digest = hashlib.sha256()
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+        size = 0
+
+        def absorb(chunk: Optional[bytes]) -> int:
+            """Decrypt a chunk (None: finish the stream), hash it and spool it, possibly to disk"""
+            plaintext = decryptor.finalize() if chunk is None else decryptor.update(chunk)
+            digest.update(plaintext)
+            spool.write(plaintext)
+            return len(plaintext)
+
+        try:
+            async for chunk in ipfs_service.iter_file(cid):
+                size += await run_in_threadpool(absorb, chunk)
+            size += await run_in_threadpool(absorb, None)
+        except BaseException:
+            spool.close()
+            raise
+        spool.seek(0)
+        return spool, digest.hexdigest(), size
+
+    @staticmethod
+    def iter_spool(spool: BinaryIO, chunk_size: int = 256 * 1024) -> Iterator[bytes]:
+        """Read a spool back in chunks for a StreamingResponse, closing it at the end"""
+        try:
+            while chunk := spool.read(chunk_size):
+                yield chunk
+        finally:
+            spool.close()
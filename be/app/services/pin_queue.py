@@ -0,0 +1,155 @@
+import os
+import queue
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+from app.services.ipfs import IPFSService
+from app.services.unixfs import compute_cid
+
+class PinQueue:
+    """
+    Background add+pin of blobs whose CID was already computed locally
+    Each job is a file named by its CID in IPFS_PIN_QUEUE_DIR, so jobs survive restarts;
+    it is deleted only once Kubo returned the same CID. Failures are retried with
+    exponential backoff, CID mismatches are kept aside for inspection
+    """
+
+    def __init__(self, ipfs_service: IPFSService, spool_dir: Optional[str] = None):
+        self.ipfs_service = ipfs_service
+        self.spool_dir = spool_dir or os.getenv('IPFS_PIN_QUEUE_DIR', os.path.join(tempfile.gettempdir(), 'certify-pin-queue'))
+        self.failed_dir = os.path.join(self.spool_dir, 'failed')
+        self.max_attempts = int(os.getenv('IPFS_PIN_MAX_ATTEMPTS', '8'))
+        self.retry_delay = float(os.getenv('IPFS_PIN_RETRY_DELAY', '2'))
+        self.workers = int(os.getenv('IPFS_PIN_WORKERS', '2'))
+
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._threads = []
+
+        self.pinned = 0
+        self.retries = 0
+        self.failed = 0
+        self.mismatches = 0
+
+        os.makedirs(self.failed_dir, exist_ok=True)
+
+    # ========== LIFECYCLE ==========
+
+    def start(self) -> None:
+        """Start the workers and requeue jobs left by a previous run"""
+        if self._threads:
+            return
+        for filename in os.listdir(self.spool_dir):
+            path = os.path.join(self.spool_dir, filename)
+            if filename.startswith('.'):
+                os.remove(path)
+            elif os.path.isfile(path):
+                self._enqueue(filename, 0)
+        self._stop_event.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"ipfs-pin-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def close(self) -> None:
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=self.retry_delay)
+        self._threads = []
+
+    # ========== JOBS ==========
+
+    def submit(self, data: bytes, cid: Optional[str] = None) -> str:
+        """
+        Persist a blob for background upload and return its CID straight away
+        `cid` skips recomputing a CID the caller already has from compute_cid
+        """
+        if not self._threads:
+            self.start()
+        cid = cid or compute_cid(data)
+        with self._lock:
+            if cid in self._pending:
+                return cid
+        fd, tmp_path = tempfile.mkstemp(dir=self.spool_dir, prefix='.')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, os.path.join(self.spool_dir, cid))
+        # Reads are served from the blob cache until (and after) the pin lands
+        if self.ipfs_service.blob_cache:
+            self.ipfs_service.blob_cache.put(cid, data)
+        self._enqueue(cid, 0)
+        return cid
+
+    def _enqueue(self, cid: str, attempt: int, delay: float = 0.0) -> None:
+        with self._lock:
+            self._pending.add(cid)
+        self._queue.put((time.monotonic() + delay, cid, attempt))
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                due, cid, attempt = self._queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            wait = due - time.monotonic()
+            if wait > 0:
+                # Not due yet: put it back and sleep until it is, or a new job arrives
+                self._queue.put((due, cid, attempt))
+                self._stop_event.wait(min(wait, 1))
+                continue
+            try:
+                self._process(cid, attempt)
+            except Exception as e:
+                print(f"Error pinning {cid}: {str(e)}")
+                self._enqueue(cid, attempt + 1, self.retry_delay * 2 ** attempt)
+
+    def _process(self, cid: str, attempt: int) -> None:
+        path = os.path.join(self.spool_dir, cid)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            with self._lock:
+                self._pending.discard(cid)
+            return
+
+        returned_cid = self.ipfs_service.upload_file(data, cid)
+        if returned_cid is None:
+            if attempt + 1 >= self.max_attempts:
+                print(f"Giving up pinning {cid} after {attempt + 1} attempts")
+                self._set_aside(cid, path)
+                self.failed += 1
+                return
+            self.retries += 1
+            self._enqueue(cid, attempt + 1, self.retry_delay * 2 ** attempt)
+            return
+
+        if returned_cid != cid:
+            print(f"CID mismatch: computed {cid}, IPFS returned {returned_cid}")
+            self._set_aside(cid, path)
+            self.mismatches += 1
+            return
+
+        os.remove(path)
+        with self._lock:
+            self._pending.discard(cid)
+        self.pinned += 1
+
+    def _set_aside(self, cid: str, path: str) -> None:
+        os.replace(path, os.path.join(self.failed_dir, cid))
+        with self._lock:
+            self._pending.discard(cid)
+
+    def stats(self) -> Dict:
+        return {
+            "pending": len(self._pending),
+            "pinned": self.pinned,
+            "retries": self.retries,
+            "failed": self.failed,
+            "mismatches": self.mismatches,
+            "workers_running": any(thread.is_alive() for thread in self._threads)
+        }
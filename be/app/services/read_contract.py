@@ -1,134 +1,570 @@
 from web3 import Web3
-from typing import Optional, Dict, List, Tuple
+from typing import Any, Optional, Dict, List, Tuple, Iterator
 import os
 from dotenv import load_dotenv
+from app.services.issuer_cache import IssuerCache
+from app.services.rpc_pool import PooledHTTPProvider, rpc_urls_from_env
 
 load_dotenv()
 
+# Canonical Multicall3 deployment, available at the same address on Sepolia and most EVM chains
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    }
+]
+
+CONTRACT_ABI = [
+    # Issuer Management - Read Functions
+    {
+        "inputs": [{"name": "walletId", "type": "address"}],
+        "name": "isIssuer",
+        "outputs": [{"name": "", "type": "bool"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "getIssuerList",
+        "outputs": [{"name": "", "type": "address[]"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [{"name": "walletId", "type": "address"}],
+        "name": "getIssuer",
+        "outputs": [
+            {"name": "walletId", "type": "address"},
+            {"name": "publicKey", "type": "string"},
+            {"name": "isActive", "type": "bool"}
+        ],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    # Certificate Management - Read Functions
+    {
+        "inputs": [{"name": "studentId", "type": "string"}],
+        "name": "getCertificate",
+        "outputs": [
+            {"name": "_studentId", "type": "string"},
+            {"name": "certHash", "type": "bytes32"},
+            {"name": "ipfsCID", "type": "string"},
+            {"name": "issuerWallets", "type": "address[]"},
+            {"name": "issueSignatureCount", "type": "uint256"},
+            {"name": "revokeSignatureCount", "type": "uint256"},
+            {"name": "isValid", "type": "bool"},
+            {"name": "timestampIssued", "type": "uint256"},
+            {"name": "timestampLastUpdated", "type": "uint256"},
+            {"name": "revokeReason", "type": "string"},
+            {"name": "requiresAllSignatures", "type": "bool"}
+        ],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"name": "studentId", "type": "string"},
+            {"name": "issuer", "type": "address"}
+        ],
+        "name": "getIssueSignature",
+        "outputs": [{"name": "", "type": "bytes"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"name": "studentId", "type": "string"},
+            {"name": "issuer", "type": "address"}
+        ],
+        "name": "getRevokeSignature",
+        "outputs": [{"name": "", "type": "bytes"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [{"name": "studentId", "type": "string"}],
+        "name": "certificateExistsFor",
+        "outputs": [{"name": "", "type": "bool"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [{"name": "studentId", "type": "string"}],
+        "name": "isCertificateValid",
+        "outputs": [{"name": "", "type": "bool"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "getAllCertificates",
+        "outputs": [
+            {"name": "studentIds", "type": "string[]"},
+            {"name": "certHashes", "type": "bytes32[]"},
+            {"name": "ipfsCIDs", "type": "string[]"},
+            {"name": "isValids", "type": "bool[]"},
+            {"name": "timestampsIssued", "type": "uint256[]"},
+            {"name": "timestampsLastUpdated", "type": "uint256[]"},
+            {"name": "revokeReasons", "type": "string[]"}
+        ],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"name": "offset", "type": "uint256"},
+            {"name": "limit", "type": "uint256"}
+        ],
+        "name": "getCertificatesPage",
+        "outputs": [
+            {"name": "studentIds", "type": "string[]"},
+            {"name": "certHashes", "type": "bytes32[]"},
+            {"name": "ipfsCIDs", "type": "string[]"},
+            {"name": "isValids", "type": "bool[]"},
+            {"name": "timestampsIssued", "type": "uint256[]"},
+            {"name": "timestampsLastUpdated", "type": "uint256[]"},
+            {"name": "revokeReasons", "type": "string[]"}
+        ],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "getCertificateCount",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    # Certificate Management - Write Functions (decoded by the event indexer, sent by the relayer)
+    {
+        "inputs": [
+            {"name": "studentId", "type": "string"},
+            {"name": "certHash", "type": "bytes32"},
+            {"name": "ipfsCID", "type": "string"},
+            {"name": "issuerWallets", "type": "address[]"},
+            {"name": "signature", "type": "bytes"},
+            {"name": "requiresAllSignatures", "type": "bool"}
+        ],
+        "name": "proposeCertificate",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"name": "studentId", "type": "string"},
+            {"name": "signature", "type": "bytes"}
+        ],
+        "name": "signCertificateIssuance",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"name": "studentId", "type": "string"},
+            {"name": "reason", "type": "string"},
+            {"name": "signature", "type": "bytes"}
+        ],
+        "name": "signCertificateRevocation",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    },
+    # Cohort Management - Read Functions
+    {
+        "inputs": [{"name": "cohortId", "type": "string"}],
+        "name": "getCohort",
+        "outputs": [
+            {"name": "_cohortId", "type": "string"},
+            {"name": "merkleRoot", "type": "bytes32"},
+            {"name": "size", "type": "uint256"},
+            {"name": "issuerWallets", "type": "address[]"},
+            {"name": "issueSignatureCount", "type": "uint256"},
+            {"name": "isValid", "type": "bool"},
+            {"name": "timestampIssued", "type": "uint256"},
+            {"name": "timestampLastUpdated", "type": "uint256"},
+            {"name": "requiresAllSignatures", "type": "bool"}
+        ],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [{"name": "cohortId", "type": "string"}],
+        "name": "cohortExistsFor",
+        "outputs": [{"name": "", "type": "bool"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"name": "cohortId", "type": "string"},
+            {"name": "leaf", "type": "bytes32"}
+        ],
+        "name": "isCohortCertificateRevoked",
+        "outputs": [{"name": "", "type": "bool"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    # Events
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "walletId", "type": "address"},
+            {"indexed": False, "name": "publicKey", "type": "string"}
+        ],
+        "name": "IssuerAdded",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "walletId", "type": "address"}
+        ],
+        "name": "IssuerRemoved",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "studentId", "type": "string"},
+            {"indexed": False, "name": "certHash", "type": "bytes32"},
+            {"indexed": False, "name": "ipfsCID", "type": "string"},
+            {"indexed": True, "name": "proposer", "type": "address"}
+        ],
+        "name": "CertificateProposed",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "studentId", "type": "string"},
+            {"indexed": True, "name": "issuer", "type": "address"}
+        ],
+        "name": "CertificateIssueSigned",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "studentId", "type": "string"},
+            {"indexed": False, "name": "certHash", "type": "bytes32"},
+            {"indexed": False, "name": "ipfsCID", "type": "string"}
+        ],
+        "name": "CertificateIssued",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "studentId", "type": "string"},
+            {"indexed": True, "name": "issuer", "type": "address"},
+            {"indexed": False, "name": "reason", "type": "string"}
+        ],
+        "name": "CertificateRevokeSigned",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "studentId", "type": "string"},
+            {"indexed": False, "name": "reason", "type": "string"}
+        ],
+        "name": "CertificateRevoked",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "cohortId", "type": "string"},
+            {"indexed": True, "name": "leaf", "type": "bytes32"},
+            {"indexed": True, "name": "issuer", "type": "address"},
+            {"indexed": False, "name": "reason", "type": "string"}
+        ],
+        "name": "CohortCertificateRevokeSigned",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "cohortId", "type": "string"},
+            {"indexed": True, "name": "leaf", "type": "bytes32"},
+            {"indexed": False, "name": "studentId", "type": "string"},
+            {"indexed": False, "name": "reason", "type": "string"}
+        ],
+        "name": "CohortCertificateRevoked",
+        "type": "event"
+    }
+]
+
+OUTPUT_TYPES = {
+    item["name"]: [output["type"] for output in item["outputs"]]
+    for item in CONTRACT_ABI
+    if item["type"] == "function"
+}
+
+INPUT_TYPES = {
+    item["name"]: [arg["type"] for arg in item["inputs"]]
+    for item in CONTRACT_ABI
+    if item["type"] == "function"
+}
+
+# contract.encode_abi resolves the function from the ABI on every call, which dominates
+# a large batch; selectors are computed once and the arguments encoded directly
+SELECTORS = {
+    name: Web3.keccak(text=f"{name}({','.join(types)})")[:4]
+    for name, types in INPUT_TYPES.items()
+}
+
+
+def encode_call(codec, fn_name: str, args: list) -> bytes:
+    """Calldata of a DiplomaContract function call"""
+    return SELECTORS[fn_name] + codec.encode(INPUT_TYPES[fn_name], list(args))
+
+AGGREGATE3_SELECTOR = Web3.keccak(text="aggregate3((address,bool,bytes)[])")[:4]
+
+def aggregate3_request(multicall_address: str, codec, entries: List[tuple]) -> Dict[str, str]:
+    """eth_call transaction for Multicall3 aggregate3, encoded without web3's per-argument normalizers"""
+    data = AGGREGATE3_SELECTOR + codec.encode(["(address,bool,bytes)[]"], [entries])
+    return {"to": multicall_address, "data": "0x" + data.hex()}
+
+def aggregate3_results(codec, return_data: bytes) -> List[tuple]:
+    """(success, return data) per call of an aggregate3 result"""
+    return list(codec.decode(["(bool,bytes)[]"], bytes(return_data))[0])
+
+def encode_batch_calls(contract, calls: List[Tuple[str, list]]) -> List[tuple]:
+    """Build Multicall3 aggregate3 entries for (function name, args) calls, allowing each to fail"""
+    return [
+        (contract.address, True, encode_call(contract.w3.codec, fn_name, args))
+        for fn_name, args in calls
+    ]
+
+def decode_batch_results(codec, calls: List[Tuple[str, list]], results: List[tuple]) -> List[Optional[tuple]]:
+    """Decode aggregate3 results in call order, None for calls that reverted"""
+    decoded = []
+    for (fn_name, _), (success, return_data) in zip(calls, results):
+        if not success or not return_data:
+            decoded.append(None)
+            continue
+        decoded.append(codec.decode(OUTPUT_TYPES[fn_name], return_data))
+    return decoded
+
+def direct_call_requests(contract, calls: List[Tuple[str, list]]) -> List[Tuple[str, list]]:
+    """JSON-RPC eth_call requests for (function name, args) calls, for nodes without Multicall3"""
+    return [
+        ("eth_call", [{"to": contract.address, "data": "0x" + encode_call(contract.w3.codec, fn_name, args).hex()}, "latest"])
+        for fn_name, args in calls
+    ]
+
+def batch_responses_to_results(responses: Any) -> List[tuple]:
+    """Turn a JSON-RPC batch of eth_call responses into aggregate3-style (success, returnData) results"""
+    if not isinstance(responses, list):
+        raise ValueError(f"Batch request failed: {responses}")
+    return [
+        (True, Web3.to_bytes(hexstr=response["result"])) if "result" in response else (False, b"")
+        for response in responses
+    ]
+
+def signature_calls(student_id: str, issuer_wallets: List[str]) -> List[Tuple[str, list]]:
+    """Issue and revoke signature lookups for every issuer of a certificate, interleaved"""
+    calls = []
+    for issuer in issuer_wallets:
+        checksum_address = Web3.to_checksum_address(issuer)
+        calls.append(("getIssueSignature", [student_id, checksum_address]))
+        calls.append(("getRevokeSignature", [student_id, checksum_address]))
+    return calls
+
+def format_signatures(issuer_wallets: List[str], results: List[Optional[tuple]]) -> Dict[str, List[Dict]]:
+    """Pair the results of signature_calls with their issuers, skipping empty signatures"""
+    issue_sigs = []
+    revoke_sigs = []
+    for i, issuer in enumerate(issuer_wallets):
+        issue_sig, revoke_sig = results[2 * i], results[2 * i + 1]
+        if issue_sig and issue_sig[0]:
+            issue_sigs.append({"issuer": issuer, "signature": issue_sig[0].hex()})
+        if revoke_sig and revoke_sig[0]:
+            revoke_sigs.append({"issuer": issuer, "signature": revoke_sig[0].hex()})
+    return {
+        "issueSignatures": issue_sigs,
+        "revokeSignatures": revoke_sigs
+    }
+
+def format_certificate(cert: tuple) -> Dict:
+    """Convert a getCertificate result tuple into a dictionary"""
+    return {
+        "studentId": cert[0],
+        "certHash": cert[1].hex(),
+        "ipfsCID": cert[2],
+        "issuerWallets": [str(addr) for addr in cert[3]],
+        "issueSignatureCount": cert[4],
+        "revokeSignatureCount": cert[5],
+        "isValid": cert[6],
+        "timestampIssued": cert[7],
+        "timestampLastUpdated": cert[8],
+        "revokeReason": cert[9],
+        "requiresAllSignatures": cert[10]
+    }
+
+def format_cohort(cohort: tuple) -> Dict:
+    """Convert a getCohort result tuple into a dictionary"""
+    return {
+        "cohortId": cohort[0],
+        "merkleRoot": "0x" + cohort[1].hex(),
+        "size": cohort[2],
+        "issuerWallets": [str(addr) for addr in cohort[3]],
+        "issueSignatureCount": cohort[4],
+        "isValid": cohort[5],
+        "timestampIssued": cohort[6],
+        "timestampLastUpdated": cohort[7],
+        "requiresAllSignatures": cohort[8]
+    }
+
+CERTIFICATE_COLUMNS = (
+    "studentIds",
+    "certHashes",
+    "ipfsCIDs",
+    "isValids",
+    "timestampsIssued",
+    "timestampsLastUpdated",
+    "revokeReasons",
+)
+
+def hex_column(values) -> List[str]:
+    """Hex-encode a column of bytes32 values with one .hex() call instead of one per value"""
+    joined = b"".join(values).hex()
+    return [joined[i:i + 64] for i in range(0, len(joined), 64)]
+
+def format_certificate_columns(result: tuple) -> Dict[str, list]:
+    """Keep the parallel arrays of getAllCertificates / getCertificatesPage as named columns"""
+    columns = dict(zip(CERTIFICATE_COLUMNS, (list(column) for column in result)))
+    columns["certHashes"] = hex_column(result[1])
+    return columns
+
+def format_certificate_list(result: tuple) -> List[Dict]:
+    """Convert the parallel arrays of getAllCertificates / getCertificatesPage into dictionaries"""
+    cert_hashes = hex_column(result[1])
+    certificates = []
+    for i in range(len(result[0])):
+        certificates.append({
+            "studentId": result[0][i],
+            "certHash": cert_hashes[i],
+            "ipfsCID": result[2][i],
+            "isValid": result[3][i],
+            "timestampIssued": result[4][i],
+            "timestampLastUpdated": result[5][i],
+            "revokeReason": result[6][i]
+        })
+    return certificates
+
+
 class ContractService:
     def __init__(self):
-        rpc_url = os.getenv('SEPOLIA_URL')
+        rpc_urls = rpc_urls_from_env()
         self.contract_address = os.getenv('CONTRACT_ADDRESS')
         
-        if not rpc_url:
-            raise ValueError("SEPOLIA_URL environment variable is not set")
+        if not rpc_urls:
+            raise ValueError("SEPOLIA_URLS or SEPOLIA_URL environment variable is not set")
         if not self.contract_address:
             raise ValueError("CONTRACT_ADDRESS environment variable is not set")
         
-        print(f"Loaded SEPOLIA_URL: {rpc_url}")
+        print(f"Loaded RPC endpoints: {', '.join(rpc_urls)}")
         print(f"Loaded CONTRACT_ADDRESS: {self.contract_address}")
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+        self.w3 = Web3(PooledHTTPProvider(rpc_urls))
+        # The validation middleware fetches eth_chainId before every eth_call to check a
+        # chainId field that read-only calls never set
+        self.w3.middleware_onion.remove("validation")
         
-        self.contract_abi = [
-            # Issuer Management - Read Functions
-            {
-                "inputs": [{"name": "walletId", "type": "address"}],
-                "name": "isIssuer",
-                "outputs": [{"name": "", "type": "bool"}],
-                "stateMutability": "view",
-                "type": "function"
-            },
-            {
-                "inputs": [],
-                "name": "getIssuerList",
-                "outputs": [{"name": "", "type": "address[]"}],
-                "stateMutability": "view",
-                "type": "function"
-            },
-            {
-                "inputs": [{"name": "walletId", "type": "address"}],
-                "name": "getIssuer",
-                "outputs": [
-                    {"name": "walletId", "type": "address"},
-                    {"name": "publicKey", "type": "string"},
-                    {"name": "isActive", "type": "bool"}
-                ],
-                "stateMutability": "view",
-                "type": "function"
-            },
-            # Certificate Management - Read Functions
-            {
-                "inputs": [{"name": "studentId", "type": "string"}],
-                "name": "getCertificate",
-                "outputs": [
-                    {"name": "_studentId", "type": "string"},
-                    {"name": "certHash", "type": "bytes32"},
-                    {"name": "ipfsCID", "type": "string"},
-                    {"name": "issuerWallets", "type": "address[]"},
-                    {"name": "issueSignatureCount", "type": "uint256"},
-                    {"name": "revokeSignatureCount", "type": "uint256"},
-                    {"name": "isValid", "type": "bool"},
-                    {"name": "timestampIssued", "type": "uint256"},
-                    {"name": "timestampLastUpdated", "type": "uint256"},
-                    {"name": "revokeReason", "type": "string"},
-                    {"name": "requiresAllSignatures", "type": "bool"}
-                ],
-                "stateMutability": "view",
-                "type": "function"
-            },
-            {
-                "inputs": [
-                    {"name": "studentId", "type": "string"},
-                    {"name": "issuer", "type": "address"}
-                ],
-                "name": "getIssueSignature",
-                "outputs": [{"name": "", "type": "bytes"}],
-                "stateMutability": "view",
-                "type": "function"
-            },
-            {
-                "inputs": [
-                    {"name": "studentId", "type": "string"},
-                    {"name": "issuer", "type": "address"}
-                ],
-                "name": "getRevokeSignature",
-                "outputs": [{"name": "", "type": "bytes"}],
-                "stateMutability": "view",
-                "type": "function"
-            },
-            {
-                "inputs": [{"name": "studentId", "type": "string"}],
-                "name": "certificateExistsFor",
-                "outputs": [{"name": "", "type": "bool"}],
-                "stateMutability": "view",
-                "type": "function"
-            },
-            {
-                "inputs": [{"name": "studentId", "type": "string"}],
-                "name": "isCertificateValid",
-                "outputs": [{"name": "", "type": "bool"}],
-                "stateMutability": "view",
-                "type": "function"
-            },
-            {
-                "inputs": [],
-                "name": "getAllCertificates",
-                "outputs": [
-                    {"name": "studentIds", "type": "string[]"},
-                    {"name": "certHashes", "type": "bytes32[]"},
-                    {"name": "ipfsCIDs", "type": "string[]"},
-                    {"name": "isValids", "type": "bool[]"},
-                    {"name": "timestampsIssued", "type": "uint256[]"},
-                    {"name": "timestampsLastUpdated", "type": "uint256[]"},
-                    {"name": "revokeReasons", "type": "string[]"}
-                ],
-                "stateMutability": "view",
-                "type": "function"
-            }
-        ]
+        self.contract_abi = CONTRACT_ABI
         
         self.contract = self.w3.eth.contract(
             address=Web3.to_checksum_address(self.contract_address),
             abi=self.contract_abi
         )
+        
+        self.multicall = self.w3.eth.contract(
+            address=Web3.to_checksum_address(os.getenv('MULTICALL3_ADDRESS', MULTICALL3_ADDRESS)),
+            abi=MULTICALL3_ABI
+        )
+        self.batch_size = int(os.getenv('MULTICALL_BATCH_SIZE', '200'))
+        # Checked on the first batched read; None until then
+        self._multicall_deployed: Optional[bool] = None
+        
+        self.issuer_cache = IssuerCache(self)
+    
+    def close(self) -> None:
+        self.issuer_cache.watcher.stop()
+        self.w3.provider.close()
+    
+    # ========== BATCHED READS ==========
+    
+    def multicall_deployed(self) -> bool:
+        """
+        Whether Multicall3 has code on this chain, checked once
+        A fresh Hardhat node has none, so batches fall back to JSON-RPC batch requests
+        """
+        if self._multicall_deployed is None:
+            self._multicall_deployed = len(self.w3.eth.get_code(self.multicall.address)) > 0
+            if not self._multicall_deployed:
+                print(f"Multicall3 is not deployed at {self.multicall.address}, batching reads as JSON-RPC batches")
+        return self._multicall_deployed
+    
+    def batch_call(self, calls: List[Tuple[str, list]]) -> List[Optional[tuple]]:
+        """
+        Execute several view calls in one round trip: a single eth_call through Multicall3,
+        or one JSON-RPC batch of eth_calls where Multicall3 is not deployed
+        calls: list of (function name, args), split into MULTICALL_BATCH_SIZE chunks
+        Returns: decoded outputs in the same order, None for calls that reverted
+        """
+        decoded = []
+        for start in range(0, len(calls), self.batch_size):
+            chunk = calls[start:start + self.batch_size]
+            if self.multicall_deployed():
+                return_data = self.w3.eth.call(
+                    aggregate3_request(self.multicall.address, self.w3.codec, encode_batch_calls(self.contract, chunk))
+                )
+                results = aggregate3_results(self.w3.codec, return_data)
+            else:
+                responses = self.w3.provider.make_batch_request(direct_call_requests(self.contract, chunk))
+                results = batch_responses_to_results(responses)
+            decoded.extend(decode_batch_results(self.w3.codec, chunk, results))
+        return decoded
     
     # ========== ISSUER READ FUNCTIONS ==========
     
     def is_issuer(self, wallet_address: str) -> bool:
         """
         Check if an address is an active issuer
+        Answered from the issuer cache, falling back to the contract if it cannot be loaded
         """
         try:
+            cached = self.issuer_cache.is_issuer(wallet_address)
+            if cached is not None:
+                return cached
             checksum_address = Web3.to_checksum_address(wallet_address)
             return self.contract.functions.isIssuer(checksum_address).call()
         except Exception as e:
@@ -205,23 +641,31 @@ class ContractService:
         """
         try:
             cert = self.contract.functions.getCertificate(student_id).call()
-            return {
-                "studentId": cert[0],
-                "certHash": cert[1].hex(),
-                "ipfsCID": cert[2],
-                "issuerWallets": [str(addr) for addr in cert[3]],
-                "issueSignatureCount": cert[4],
-                "revokeSignatureCount": cert[5],
-                "isValid": cert[6],
-                "timestampIssued": cert[7],
-                "timestampLastUpdated": cert[8],
-                "revokeReason": cert[9],
-                "requiresAllSignatures": cert[10]
-            }
+            return format_certificate(cert)
         except Exception as e:
             print(f"Error getting certificate: {str(e)}")
             return None
     
+    def get_certificate_state(self, student_id: str) -> Dict:
+        """
+        Get existence, validity and full details of a certificate in one round trip
+        Returns: {exists, isValid, certificate}
+        """
+        try:
+            exists, cert = self.batch_call([
+                ("certificateExistsFor", [student_id]),
+                ("getCertificate", [student_id])
+            ])
+            certificate = format_certificate(cert) if cert else None
+            return {
+                "exists": bool(exists and exists[0]),
+                "isValid": bool(certificate and certificate["isValid"]),
+                "certificate": certificate
+            }
+        except Exception as e:
+            print(f"Error getting certificate state: {str(e)}")
+            return {"exists": False, "isValid": False, "certificate": None}
+    
     def get_issue_signature(self, student_id: str, issuer_address: str) -> Optional[str]:
         """
         Get the issue signature from a specific issuer for a certificate
@@ -249,32 +693,48 @@ class ContractService:
     def get_all_certificate_signatures(self, student_id: str) -> Dict[str, List[Dict]]:
         """
         Get all signatures (issue and revoke) for a certificate
+        One call for the issuer list, one batched call for every signature
         """
         try:
             cert = self.get_certificate(student_id)
             if not cert:
                 return {"issueSignatures": [], "revokeSignatures": []}
             
-            issue_sigs = []
-            revoke_sigs = []
-            
-            for issuer in cert["issuerWallets"]:
-                issue_sig = self.get_issue_signature(student_id, issuer)
-                if issue_sig:
-                    issue_sigs.append({"issuer": issuer, "signature": issue_sig})
-                
-                revoke_sig = self.get_revoke_signature(student_id, issuer)
-                if revoke_sig:
-                    revoke_sigs.append({"issuer": issuer, "signature": revoke_sig})
-            
-            return {
-                "issueSignatures": issue_sigs,
-                "revokeSignatures": revoke_sigs
-            }
+            results = self.batch_call(signature_calls(student_id, cert["issuerWallets"]))
+            return format_signatures(cert["issuerWallets"], results)
         except Exception as e:
             print(f"Error getting all signatures: {str(e)}")
             return {"issueSignatures": [], "revokeSignatures": []}
     
+    def get_certificate_signatures_bulk(self, student_ids: List[str]) -> Dict[str, Dict[str, List[Dict]]]:
+        """
+        Get all signatures for many certificates
+        One batched call for every issuer list, one batched call for every signature
+        Returns: {student_id: {issueSignatures, revokeSignatures}}
+        """
+        try:
+            certs = self.batch_call([("getCertificate", [student_id]) for student_id in student_ids])
+            issuers = {
+                student_id: [str(addr) for addr in cert[3]] if cert else []
+                for student_id, cert in zip(student_ids, certs)
+            }
+            results = self.batch_call([
+                call
+                for student_id in student_ids
+                for call in signature_calls(student_id, issuers[student_id])
+            ])
+            
+            signatures = {}
+            position = 0
+            for student_id in student_ids:
+                count = 2 * len(issuers[student_id])
+                signatures[student_id] = format_signatures(issuers[student_id], results[position:position + count])
+                position += count
+            return signatures
+        except Exception as e:
+            print(f"Error getting bulk signatures: {str(e)}")
+            return {student_id: {"issueSignatures": [], "revokeSignatures": []} for student_id in student_ids}
+    
     def get_all_certificates(self) -> List[Dict]:
         """
         Get all certificates from the smart contract
@@ -282,20 +742,46 @@ class ContractService:
         """
         try:
             result = self.contract.functions.getAllCertificates().call()
-            
-            certificates = []
-            for i in range(len(result[0])):
-                certificates.append({
-                    "studentId": result[0][i],
-                    "certHash": result[1][i].hex(),
-                    "ipfsCID": result[2][i],
-                    "isValid": result[3][i],
-                    "timestampIssued": result[4][i],
-                    "timestampLastUpdated": result[5][i],
-                    "revokeReason": result[6][i]
-                })
-            
-            return certificates
+            return format_certificate_list(result)
         except Exception as e:
             print(f"Error getting all certificates: {str(e)}")
-            return []
\ No newline at end of file
+            return []
+    
+    def get_certificate_count(self) -> int:
+        """
+        Get total number of certificates
+        """
+        try:
+            return self.contract.functions.getCertificateCount().call()
+        except Exception as e:
+            print(f"Error getting certificate count: {str(e)}")
+            return 0
+    
+    def get_certificates_page(self, offset: int, limit: int) -> List[Dict]:
+        """
+        Get a page of certificates from the smart contract
+        Returns: List of at most `limit` certificate dictionaries starting at `offset`
+        RPC errors are raised: an empty page would read as the end of the listing
+        """
+        result = self.contract.functions.getCertificatesPage(offset, limit).call()
+        return format_certificate_list(result)
+    
+    def get_certificate_columns(self, offset: int, limit: int) -> Dict[str, list]:
+        """
+        Get a page of certificates as parallel columns, without building per-certificate dicts
+        Returns: {studentIds, certHashes, ipfsCIDs, isValids, ...}
+        RPC errors are raised: empty columns would read as the end of the listing
+        """
+        result = self.contract.functions.getCertificatesPage(offset, limit).call()
+        return format_certificate_columns(result)
+    
+    def iter_certificates(self, offset: int = 0, page_size: int = 100) -> Iterator[Dict]:
+        """
+        Iterate over certificates page by page, one eth_call per page
+        """
+        while True:
+            page = self.get_certificates_page(offset, page_size)
+            yield from page
+            if len(page) < page_size:
+                return
+            offset += len(page)
@@ -0,0 +1,587 @@
+import asyncio
+import math
+import os
+import statistics
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Set
+
+from dotenv import load_dotenv
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from web3 import Web3
+from web3.exceptions import ContractLogicError
+
+from app.services.async_read_contract import AsyncContractService
+
+load_dotenv()
+
+# Used when gas estimation fails for a reason other than a revert (same limits as the frontend)
+DEFAULT_GAS_LIMITS = {
+    "proposeCertificate": 500000,
+    "signCertificateIssuance": 200000,
+    "signCertificateRevocation": 200000
+}
+TRANSFER_GAS = 21000
+
+# Node errors meaning this exact transaction is already in the pool
+KNOWN_TX_ERRORS = ("already known", "known transaction", "already imported")
+# Node errors meaning the nonce has been used by another transaction
+NONCE_TOO_LOW_ERRORS = ("nonce too low", "nonce is too low")
+
+# Replacements must raise both fee fields by at least 10% to be accepted by geth
+FEE_BUMP_NUMERATOR = 9
+FEE_BUMP_DENOMINATOR = 8
+
+# Fields of a transaction record returned to callers
+RECORD_FIELDS = (
+    "tx_hash",
+    "nonce",
+    "function",
+    "student_id",
+    "status",
+    "submitted_at",
+    "block_number",
+    "gas_used",
+    "error"
+)
+
+def revoke_message(student_id: str, reason: str) -> str:
+    """Text signed for a revocation, as built by the frontend"""
+    return f"Revoke certificate for student {student_id}: {reason}"
+
+def issued_on_proposal(issuer_wallets: List[str], requires_all_signatures: bool) -> bool:
+    """Whether the proposer's signature alone meets the threshold of _checkAndIssueCertificate"""
+    if requires_all_signatures:
+        return len(issuer_wallets) == 1
+    return 1 > len(issuer_wallets) // 2
+
+def _error_message(response: Dict) -> Optional[str]:
+    error = response.get("error")
+    if error is None:
+        return None
+    return error.get("message", str(error)) if isinstance(error, dict) else str(error)
+
+def _matches(message: str, patterns: tuple) -> bool:
+    message = message.lower()
+    return any(pattern in message for pattern in patterns)
+
+class TransactionRelayer:
+    """
+    Sends certificate transactions from the server's issuer wallet (RELAYER_PRIVATE_KEY)
+    Nonces are handed out in memory, fees come from a cached eth_feeHistory estimate, and
+    queued transactions are signed locally and sent in order as one JSON-RPC batch per
+    round trip. A background task follows receipts, re-prices transactions that sit in
+    the pool too long and fills nonces left unused by rejected sends
+    The contract authorizes by msg.sender, so the relayer acts as its own issuer: its
+    wallet must be registered on chain and listed in every certificate it signs
+    """
+
+    def __init__(self, contract_service: AsyncContractService):
+        private_key = os.getenv('RELAYER_PRIVATE_KEY')
+        if not private_key:
+            raise ValueError("RELAYER_PRIVATE_KEY environment variable is not set")
+
+        self.contract_service = contract_service
+        self.w3 = contract_service.w3
+        self.contract = contract_service.contract
+        self.account = Account.from_key(private_key)
+        self.address = self.account.address
+
+        self.batch_size = int(os.getenv('RELAYER_BATCH_SIZE', '50'))
+        self.max_pending = int(os.getenv('RELAYER_MAX_PENDING', '64'))
+        self.gas_margin = float(os.getenv('RELAYER_GAS_MARGIN', '1.2'))
+        self.fee_ttl = float(os.getenv('RELAYER_FEE_TTL', '12'))
+        self.fee_percentile = float(os.getenv('RELAYER_FEE_PERCENTILE', '50'))
+        self.min_priority_fee = Web3.to_wei(float(os.getenv('RELAYER_MIN_PRIORITY_FEE_GWEI', '1')), 'gwei')
+        max_fee = os.getenv('RELAYER_MAX_FEE_GWEI')
+        self.max_fee = Web3.to_wei(float(max_fee), 'gwei') if max_fee else None
+        self.poll_interval = float(os.getenv('RELAYER_POLL_INTERVAL', '2'))
+        self.replace_after = float(os.getenv('RELAYER_REPLACE_AFTER', '90'))
+        self.send_retries = int(os.getenv('RELAYER_SEND_RETRIES', '3'))
+        self.history_size = int(os.getenv('RELAYER_HISTORY_SIZE', '10000'))
+
+        self.chain_id: Optional[int] = None
+        # Next nonce to hand out; None until loaded from the pending transaction count
+        self._nonce: Optional[int] = None
+        # Nonces below self._nonce that no sent transaction holds
+        self._free_nonces: Set[int] = set()
+        self._fees: Optional[Dict] = None
+        self._fees_at = 0.0
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._retry: Deque[Dict] = deque()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._sender: Optional[asyncio.Task] = None
+        self._tracker: Optional[asyncio.Task] = None
+
+        # Sent and not yet mined, by nonce
+        self._pending: Dict[int, Dict] = {}
+        # Every record by each of its transaction hashes, oldest first
+        self._history: "OrderedDict[str, Dict]" = OrderedDict()
+
+        self.counters = {
+            "submitted": 0,
+            "confirmed": 0,
+            "reverted": 0,
+            "dropped": 0,
+            "failed": 0,
+            "replaced": 0,
+            "gaps_filled": 0,
+            "resyncs": 0,
+            "batches": 0
+        }
+
+    # ========== LIFECYCLE ==========
+
+    def _ensure_started(self) -> None:
+        """Start the sender and receipt tracker inside the running event loop"""
+        if self._sender is not None and not self._sender.done():
+            return
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_pending - len(self._pending))
+        self._sender = asyncio.ensure_future(self._run_sender())
+        self._tracker = asyncio.ensure_future(self._run_tracker())
+
+    async def close(self) -> None:
+        for task in (self._sender, self._tracker):
+            if task is not None:
+                task.cancel()
+        for item in list(self._retry) + self._drain_queue():
+            if not item["future"].done():
+                item["future"].set_exception(RuntimeError("Relayer is shutting down"))
+        self._retry.clear()
+        self._sender = self._tracker = None
+
+    def _drain_queue(self) -> List[Dict]:
+        items = []
+        while self._queue is not None and not self._queue.empty():
+            items.append(self._queue.get_nowait())
+        return items
+
+    # ========== CERTIFICATE TRANSACTIONS ==========
+
+    def sign_text(self, text: str) -> bytes:
+        """personal_sign of `text` by the relayer wallet, as MetaMask produces it"""
+        return self.account.sign_message(encode_defunct(text=text)).signature
+
+    async def propose_certificate(
+        self,
+        student_id: str,
+        cert_hash: str,
+        ipfs_cid: str,
+        issuer_wallets: List[str],
+        requires_all_signatures: bool = True
+    ) -> Dict:
+        """
+        Propose a certificate, signing its hash as the first issuer
+        `cert_hash` is the hex SHA-256 returned by /issue
+        """
+        cert_hash = cert_hash[2:] if cert_hash.startswith("0x") else cert_hash
+        try:
+            cert_hash_bytes = bytes.fromhex(cert_hash)
+        except ValueError:
+            raise ValueError("cert_hash must be a hex string")
+        if len(cert_hash_bytes) != 32:
+            raise ValueError("cert_hash must be 32 bytes")
+        try:
+            wallets = [Web3.to_checksum_address(wallet) for wallet in issuer_wallets]
+        except ValueError:
+            raise ValueError("issuer_wallets must be addresses")
+        if self.address not in wallets:
+            raise ValueError(f"Relayer wallet {self.address} must be one of the issuer wallets")
+        if issued_on_proposal(wallets, requires_all_signatures):
+            raise ValueError("The relayer's signature alone would issue the certificate; list more issuer wallets")
+
+        return await self.submit(
+            "proposeCertificate",
+            [student_id, cert_hash_bytes, ipfs_cid, wallets, self.sign_text(cert_hash), requires_all_signatures],
+            student_id
+        )
+
+    async def sign_issuance(self, student_id: str, cert_hash: str) -> Dict:
+        """Add the relayer's issuance signature to a proposed certificate"""
+        return await self.submit("signCertificateIssuance", [student_id, self.sign_text(cert_hash)], student_id)
+
+    async def sign_revocation(self, student_id: str, reason: str) -> Dict:
+        """Add the relayer's revocation signature to an issued certificate"""
+        return await self.submit(
+            "signCertificateRevocation",
+            [student_id, reason, self.sign_text(revoke_message(student_id, reason))],
+            student_id
+        )
+
+    async def submit(self, function_name: str, args: list, student_id: Optional[str] = None) -> Dict:
+        """
+        Queue a contract call and return its record once the node has accepted it
+        Raises ValueError when the call would revert, RuntimeError when the node rejects it
+        """
+        self._ensure_started()
+        gas = await self._estimate_gas(function_name, args)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put({
+            "function": function_name,
+            "student_id": student_id,
+            "data": self.contract.encode_abi(function_name, args=args),
+            "gas": gas,
+            "future": future
+        })
+        return self._public(await future)
+
+    async def _estimate_gas(self, function_name: str, args: list) -> int:
+        await self.contract_service._ensure_session()
+        try:
+            estimate = await self.contract.functions[function_name](*args).estimate_gas({"from": self.address})
+        except ContractLogicError as e:
+            raise ValueError(f"Transaction would revert: {e.message or str(e)}")
+        except Exception as e:
+            print(f"Error estimating gas for {function_name}: {str(e)}")
+            return DEFAULT_GAS_LIMITS.get(function_name, 300000)
+        return math.ceil(estimate * self.gas_margin)
+
+    # ========== NONCES AND FEES ==========
+
+    async def _sync_nonce(self) -> None:
+        """Reload the next nonce from the node, forgetting the unused ones"""
+        self._nonce = await self.w3.eth.get_transaction_count(self.address, "pending")
+        self._free_nonces.clear()
+        self.counters["resyncs"] += 1
+
+    def _allocate_nonce(self) -> int:
+        if self._free_nonces:
+            nonce = min(self._free_nonces)
+            self._free_nonces.discard(nonce)
+            return nonce
+        nonce = self._nonce
+        self._nonce += 1
+        return nonce
+
+    def _release_nonce(self, nonce: int) -> None:
+        """Return an unused nonce; the counter rolls back over free nonces at the top"""
+        self._free_nonces.add(nonce)
+        while self._nonce - 1 in self._free_nonces:
+            self._nonce -= 1
+            self._free_nonces.discard(self._nonce)
+
+    async def _current_fees(self) -> Dict:
+        """
+        EIP-1559 fees from the last RELAYER_FEE_TTL seconds: the tip at RELAYER_FEE_PERCENTILE
+        of recent blocks, and room for the base fee to double. Legacy gasPrice when the
+        node has no fee history
+        """
+        if self._fees is not None and time.monotonic() - self._fees_at < self.fee_ttl:
+            return self._fees
+        try:
+            history = await self.w3.eth.fee_history(5, "latest", [self.fee_percentile])
+            base_fee = history["baseFeePerGas"][-1]
+            rewards = [reward[0] for reward in history.get("reward") or [] if reward]
+            tip = max(int(statistics.median(rewards)) if rewards else 0, self.min_priority_fee)
+            fees = {"maxFeePerGas": 2 * base_fee + tip, "maxPriorityFeePerGas": tip}
+            if self.max_fee is not None and fees["maxFeePerGas"] > self.max_fee:
+                fees = {"maxFeePerGas": self.max_fee, "maxPriorityFeePerGas": min(tip, self.max_fee)}
+        except Exception as e:
+            print(f"Error reading fee history, using gasPrice: {str(e)}")
+            gas_price = await self.w3.eth.gas_price
+            fees = {"gasPrice": min(gas_price, self.max_fee) if self.max_fee is not None else gas_price}
+        self._fees = fees
+        self._fees_at = time.monotonic()
+        return fees
+
+    def _bumped_fees(self, tx: Dict, fees: Dict) -> Dict:
+        """Fees for a replacement: current fees, but at least 12.5% above the pooled ones"""
+        bumped = {}
+        for field, value in tx.items():
+            if field in ("maxFeePerGas", "maxPriorityFeePerGas", "gasPrice"):
+                minimum = -(-value * FEE_BUMP_NUMERATOR // FEE_BUMP_DENOMINATOR)
+                bumped[field] = max(minimum, fees.get(field, 0))
+        if "maxFeePerGas" in bumped:
+            bumped["maxFeePerGas"] = max(bumped["maxFeePerGas"], bumped["maxPriorityFeePerGas"])
+        return bumped
+
+    # ========== SUBMISSION ==========
+
+    def _build(self, item: Dict, nonce: int, fees: Dict) -> Dict:
+        tx = {
+            "chainId": self.chain_id,
+            "nonce": nonce,
+            "to": self.contract.address,
+            "value": 0,
+            "data": item["data"],
+            "gas": item["gas"],
+            **fees
+        }
+        if "maxFeePerGas" in fees:
+            tx["type"] = 2
+        return tx
+
+    async def _rpc_batch(self, method: str, params_list: List[list]) -> List[Dict]:
+        """One JSON-RPC batch of `method` calls, responses in request order"""
+        await self.contract_service._ensure_session()
+        responses = await self.w3.provider.make_batch_request([(method, params) for params in params_list])
+        if not isinstance(responses, list):
+            raise RuntimeError(_error_message(responses) or "Batch request failed")
+        return responses
+
+    async def _run_sender(self) -> None:
+        while True:
+            try:
+                items = await self._next_batch()
+                if items is None:
+                    await self._fill_gaps()
+                    continue
+                await self._send_batch(items)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error in relayer sender: {str(e)}")
+                await asyncio.sleep(self.poll_interval)
+
+    async def _next_batch(self) -> Optional[List[Dict]]:
+        """Up to RELAYER_BATCH_SIZE queued calls, holding one pending slot each; None when idle"""
+        if self._retry:
+            first = self._retry.popleft()
+        else:
+            try:
+                first = await asyncio.wait_for(self._queue.get(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                return None
+        await self._slots.acquire()
+        items = [first]
+        while len(items) < self.batch_size and not self._slots.locked():
+            if self._retry:
+                items.append(self._retry.popleft())
+            elif not self._queue.empty():
+                items.append(self._queue.get_nowait())
+            else:
+                break
+            await self._slots.acquire()
+
+        live = []
+        for item in items:
+            if item["future"].done():
+                # The caller went away before the transaction was signed
+                self._slots.release()
+            else:
+                live.append(item)
+        return live
+
+    async def _send_batch(self, items: List[Dict]) -> None:
+        if not items:
+            return
+        try:
+            if self.chain_id is None:
+                self.chain_id = await self.w3.eth.chain_id
+            if self._nonce is None:
+                await self._sync_nonce()
+            fees = await self._current_fees()
+        except Exception:
+            # Nothing was signed yet: put the calls back for the next attempt
+            for item in reversed(items):
+                self._slots.release()
+                self._retry.appendleft(item)
+            raise
+
+        signed = []
+        for item in items:
+            tx = self._build(item, self._allocate_nonce(), fees)
+            signed.append((item, tx, self.account.sign_transaction(tx)))
+        self.counters["batches"] += 1
+
+        responses = None
+        for attempt in range(self.send_retries + 1):
+            try:
+                responses = await self._rpc_batch(
+                    "eth_sendRawTransaction",
+                    [[Web3.to_hex(signed_tx.raw_transaction)] for _, _, signed_tx in signed]
+                )
+                break
+            except Exception as e:
+                print(f"Error sending relayer batch (attempt {attempt + 1}): {str(e)}")
+                if attempt < self.send_retries:
+                    await asyncio.sleep(0.5 * 2 ** attempt)
+        if responses is None:
+            for item, tx, _ in reversed(signed):
+                self._release_nonce(tx["nonce"])
+                self._fail(item, RuntimeError("RPC endpoints unavailable"))
+            return
+
+        rejected = False
+        resync = False
+        for (item, tx, signed_tx), response in zip(signed, responses):
+            error = _error_message(response)
+            if error is None or _matches(error, KNOWN_TX_ERRORS):
+                self._track(item, tx, Web3.to_hex(signed_tx.hash))
+            elif _matches(error, NONCE_TOO_LOW_ERRORS) or rejected:
+                # The nonce was used elsewhere, or this send only failed because an
+                # earlier one left a gap: sign again with a fresh nonce
+                resync = resync or _matches(error, NONCE_TOO_LOW_ERRORS)
+                self._release_nonce(tx["nonce"])
+                self._slots.release()
+                self._retry.append(item)
+            else:
+                rejected = True
+                self._release_nonce(tx["nonce"])
+                self._fail(item, RuntimeError(error))
+        if resync:
+            await self._sync_nonce()
+
+    def _fail(self, item: Dict, error: Exception) -> None:
+        self.counters["failed"] += 1
+        self._slots.release()
+        if not item["future"].done():
+            item["future"].set_exception(error)
+
+    def _track(self, item: Optional[Dict], tx: Dict, tx_hash: str) -> Dict:
+        record = {
+            "tx_hash": tx_hash,
+            "nonce": tx["nonce"],
+            "function": item["function"] if item else "fillNonce",
+            "student_id": item["student_id"] if item else None,
+            "status": "pending",
+            "submitted_at": int(time.time()),
+            "block_number": None,
+            "gas_used": None,
+            "error": None,
+            "hashes": [tx_hash],
+            "tx": tx,
+            "sent_at": time.monotonic(),
+            "misses": 0,
+            # Nonce fillers are sent outside the pending limit
+            "holds_slot": item is not None
+        }
+        self._pending[tx["nonce"]] = record
+        self._remember(tx_hash, record)
+        self.counters["submitted"] += 1
+        if item is not None and not item["future"].done():
+            item["future"].set_result(record)
+        return record
+
+    def _remember(self, tx_hash: str, record: Dict) -> None:
+        self._history[tx_hash] = record
+        while len(self._history) > self.history_size:
+            self._history.popitem(last=False)
+
+    async def _fill_gaps(self) -> None:
+        """While idle, spend nonces freed by rejected sends on zero-value self-transfers"""
+        if not self._free_nonces:
+            return
+        fees = await self._current_fees()
+        for nonce in sorted(self._free_nonces):
+            tx = {
+                "chainId": self.chain_id,
+                "nonce": nonce,
+                "to": self.address,
+                "value": 0,
+                "gas": TRANSFER_GAS,
+                **fees
+            }
+            if "maxFeePerGas" in fees:
+                tx["type"] = 2
+            signed_tx = self.account.sign_transaction(tx)
+            response = (await self._rpc_batch("eth_sendRawTransaction", [[Web3.to_hex(signed_tx.raw_transaction)]]))[0]
+            error = _error_message(response)
+            if error is None or _matches(error, KNOWN_TX_ERRORS):
+                self._free_nonces.discard(nonce)
+                self._track(None, tx, Web3.to_hex(signed_tx.hash))
+                self.counters["gaps_filled"] += 1
+            elif _matches(error, NONCE_TOO_LOW_ERRORS):
+                self._free_nonces.discard(nonce)
+            else:
+                print(f"Error filling nonce {nonce}: {error}")
+                return
+
+    # ========== RECEIPTS ==========
+
+    async def _run_tracker(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if not self._pending:
+                continue
+            try:
+                await self._poll_receipts()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error polling relayer receipts: {str(e)}")
+
+    async def _poll_receipts(self) -> None:
+        """
+        Settle every pending transaction whose nonce the chain has used, fetching their
+        receipts in one batch, and re-price the ones that have waited too long
+        """
+        confirmed_nonce = await self.w3.eth.get_transaction_count(self.address, "latest")
+        mined = [record for nonce, record in self._pending.items() if nonce < confirmed_nonce]
+        if mined:
+            hashes = [tx_hash for record in mined for tx_hash in record["hashes"]]
+            responses = await self._rpc_batch("eth_getTransactionReceipt", [[tx_hash] for tx_hash in hashes])
+            receipts = {
+                tx_hash: response.get("result")
+                for tx_hash, response in zip(hashes, responses)
+                if response.get("result")
+            }
+            for record in mined:
+                receipt = next((receipts[tx_hash] for tx_hash in record["hashes"] if tx_hash in receipts), None)
+                if receipt is not None:
+                    record["tx_hash"] = receipt["transactionHash"]
+                    record["block_number"] = int(receipt["blockNumber"], 16)
+                    record["gas_used"] = int(receipt["gasUsed"], 16)
+                    self._settle(record, "confirmed" if int(receipt["status"], 16) == 1 else "reverted")
+                else:
+                    # Another endpoint may not have the receipt yet; give it a few polls
+                    record["misses"] += 1
+                    if record["misses"] >= 3:
+                        record["error"] = "Nonce used by another transaction"
+                        self._settle(record, "dropped")
+
+        now = time.monotonic()
+        for record in list(self._pending.values()):
+            if record["nonce"] >= confirmed_nonce and now - record["sent_at"] > self.replace_after:
+                await self._replace(record)
+
+    def _settle(self, record: Dict, status: str) -> None:
+        record["status"] = status
+        self.counters[status] += 1
+        del self._pending[record["nonce"]]
+        if record["holds_slot"]:
+            self._slots.release()
+
+    async def _replace(self, record: Dict) -> None:
+        """Re-send a transaction stuck in the pool at the same nonce with higher fees"""
+        tx = {**record["tx"], **self._bumped_fees(record["tx"], await self._current_fees())}
+        signed_tx = self.account.sign_transaction(tx)
+        response = (await self._rpc_batch("eth_sendRawTransaction", [[Web3.to_hex(signed_tx.raw_transaction)]]))[0]
+        error = _error_message(response)
+        record["sent_at"] = time.monotonic()
+        if error is not None and not _matches(error, KNOWN_TX_ERRORS):
+            print(f"Error replacing relayer transaction {record['tx_hash']}: {error}")
+            return
+        tx_hash = Web3.to_hex(signed_tx.hash)
+        record["tx"] = tx
+        record["tx_hash"] = tx_hash
+        record["hashes"].append(tx_hash)
+        self._remember(tx_hash, record)
+        self.counters["replaced"] += 1
+
+    # ========== STATUS ==========
+
+    @staticmethod
+    def _public(record: Dict) -> Dict:
+        return {field: record[field] for field in RECORD_FIELDS}
+
+    def get_transaction(self, tx_hash: str) -> Optional[Dict]:
+        """Record of a relayed transaction by any of its hashes, None if unknown or evicted"""
+        record = self._history.get(tx_hash.lower())
+        return self._public(record) if record is not None else None
+
+    def stats(self) -> Dict:
+        return {
+            "address": self.address,
+            "chain_id": self.chain_id,
+            "next_nonce": self._nonce,
+            "free_nonces": sorted(self._free_nonces),
+            "queued": (self._queue.qsize() if self._queue is not None else 0) + len(self._retry),
+            "pending": len(self._pending),
+            "max_pending": self.max_pending,
+            "fees": self._fees,
+            **self.counters
+        }
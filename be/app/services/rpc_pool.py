@@ -0,0 +1,379 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
+
+from web3.providers import AsyncHTTPProvider, HTTPProvider, JSONBaseProvider
+from web3.providers.async_base import AsyncJSONBaseProvider
+
+# Idempotent reads that may be duplicated to a second endpoint
+HEDGED_METHODS = {
+    "eth_call",
+    "eth_getLogs",
+    "eth_blockNumber",
+    "eth_chainId",
+    "eth_getBlockByNumber",
+    "eth_getBlockByHash",
+    "eth_getTransactionByHash",
+    "eth_getTransactionReceipt",
+    "eth_getTransactionCount",
+    "eth_getBalance",
+    "eth_getCode",
+    "eth_estimateGas",
+    "eth_gasPrice",
+    "eth_maxPriorityFeePerGas",
+    "eth_feeHistory",
+}
+
+# JSON-RPC error codes that describe the endpoint rather than the request
+ENDPOINT_ERROR_CODES = {-32005, 429}
+
+# Latency assumed for endpoints that have failed without ever answering (seconds)
+UNKNOWN_LATENCY = 10.0
+
+
+def rpc_urls_from_env() -> List[str]:
+    """RPC endpoints from SEPOLIA_URLS (comma separated), falling back to SEPOLIA_URL"""
+    urls = [url.strip() for url in os.getenv('SEPOLIA_URLS', '').split(',') if url.strip()]
+    if not urls and os.getenv('SEPOLIA_URL'):
+        urls = [os.getenv('SEPOLIA_URL')]
+    return urls
+
+
+class EndpointUnavailable(Exception):
+    """Raised internally when an endpoint answers with a rate limit or overload error"""
+
+
+class RPCEndpoint:
+    """Health statistics of a single RPC endpoint"""
+
+    def __init__(self, url: str, alpha: float, window: int):
+        self.url = url
+        self.alpha = alpha
+        self.latency_ewma: Optional[float] = None
+        self.error_ewma = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.in_flight = 0
+        self.latencies = deque(maxlen=window)
+
+    def record(self, latency: float, ok: bool) -> None:
+        self.requests += 1
+        self.error_ewma = self.alpha * (0.0 if ok else 1.0) + (1 - self.alpha) * self.error_ewma
+        if ok:
+            self.latencies.append(latency)
+            if self.latency_ewma is None:
+                self.latency_ewma = latency
+            else:
+                self.latency_ewma = self.alpha * latency + (1 - self.alpha) * self.latency_ewma
+        else:
+            self.errors += 1
+
+    @property
+    def score(self) -> float:
+        """Lower is healthier; untried endpoints score 0 so they get probed first"""
+        if self.latency_ewma is None:
+            # Never answered: rank as a slow endpoint so it is only used for failover
+            return 0.0 if self.requests == 0 else UNKNOWN_LATENCY * (1 + 10 * self.error_ewma)
+        return self.latency_ewma * (1 + 10 * self.error_ewma)
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(percentile * len(ordered)))]
+
+    def stats(self) -> Dict:
+        return {
+            "url": self.url,
+            "score": self.score,
+            "latency_ewma_ms": self.latency_ewma * 1000 if self.latency_ewma is not None else None,
+            "error_ewma": self.error_ewma,
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "hedges_sent": self.hedges_sent,
+            "hedges_won": self.hedges_won,
+        }
+
+
+class RPCEndpointPool:
+    """
+    Shared health state for a set of RPC endpoints
+    Sync and async providers built from the same URLs record into the same pool
+    """
+
+    _shared: Dict[Tuple[str, ...], "RPCEndpointPool"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, urls: List[str]):
+        if not urls:
+            raise ValueError("At least one RPC URL is required")
+        alpha = float(os.getenv('RPC_EWMA_ALPHA', '0.2'))
+        window = int(os.getenv('RPC_LATENCY_WINDOW', '200'))
+        self.endpoints = [RPCEndpoint(url, alpha, window) for url in urls]
+        self.hedge_percentile = float(os.getenv('RPC_HEDGE_PERCENTILE', '0.95'))
+        self.hedge_min_delay = float(os.getenv('RPC_HEDGE_MIN_DELAY', '0.05'))
+        self.hedge_default_delay = float(os.getenv('RPC_HEDGE_DEFAULT_DELAY', '1.0'))
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, urls: List[str]) -> "RPCEndpointPool":
+        key = tuple(urls)
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(urls)
+            return cls._shared[key]
+
+    def ranked(self) -> List[RPCEndpoint]:
+        """Endpoints from healthiest to least healthy"""
+        with self._lock:
+            return sorted(self.endpoints, key=lambda endpoint: (endpoint.score, endpoint.in_flight))
+
+    def begin(self, endpoint: RPCEndpoint) -> None:
+        with self._lock:
+            endpoint.in_flight += 1
+
+    def finish(self, endpoint: RPCEndpoint, latency: float, ok: bool) -> None:
+        with self._lock:
+            endpoint.in_flight -= 1
+            endpoint.record(latency, ok)
+
+    def abandon(self, endpoint: RPCEndpoint) -> None:
+        """End a request that was cancelled, e.g. the losing leg of a hedge, without scoring it"""
+        with self._lock:
+            endpoint.in_flight -= 1
+
+    def hedge_delay(self, endpoint: RPCEndpoint) -> float:
+        """How long to wait on `endpoint` before sending a duplicate elsewhere"""
+        with self._lock:
+            if len(endpoint.latencies) < 10:
+                return self.hedge_default_delay
+            return max(self.hedge_min_delay, endpoint.latency_percentile(self.hedge_percentile))
+
+    def record_hedge(self, endpoint: RPCEndpoint, won: bool = False) -> None:
+        with self._lock:
+            if won:
+                endpoint.hedges_won += 1
+            else:
+                endpoint.hedges_sent += 1
+
+    def stats(self) -> List[Dict]:
+        with self._lock:
+            return [endpoint.stats() for endpoint in self.endpoints]
+
+
+def _check_response(response: Any) -> Any:
+    if isinstance(response, dict) and isinstance(response.get("error"), dict):
+        if response["error"].get("code") in ENDPOINT_ERROR_CODES:
+            raise EndpointUnavailable(response["error"].get("message", "endpoint unavailable"))
+    return response
+
+
+class PooledHTTPProvider(JSONBaseProvider):
+    """
+    Web3 provider spreading requests over several HTTP endpoints
+    Requests go to the healthiest endpoint and fail over down the ranking. Hedged reads
+    send a duplicate to the next endpoint once the first passes its latency percentile
+    """
+
+    def __init__(self, urls: List[str], **kwargs: Any):
+        super().__init__(**kwargs)
+        self.pool = RPCEndpointPool.shared(urls)
+        self.providers = {url: HTTPProvider(url) for url in urls}
+        self.executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('RPC_HEDGE_WORKERS', '32')),
+            thread_name_prefix="rpc-hedge"
+        )
+
+    def _send(self, endpoint: RPCEndpoint, method: str, params: Any) -> Any:
+        self.pool.begin(endpoint)
+        start = time.perf_counter()
+        try:
+            response = _check_response(self.providers[endpoint.url].make_request(method, params))
+        except Exception:
+            self.pool.finish(endpoint, time.perf_counter() - start, ok=False)
+            raise
+        self.pool.finish(endpoint, time.perf_counter() - start, ok=True)
+        return response
+
+    def make_request(self, method, params):
+        endpoints = self.pool.ranked()
+        if method in HEDGED_METHODS and len(endpoints) > 1:
+            return self._hedged_request(method, params, endpoints)
+        return self._failover_request(method, params, endpoints)
+
+    def make_batch_request(self, batch_requests):
+        last_error = None
+        for endpoint in self.pool.ranked():
+            self.pool.begin(endpoint)
+            start = time.perf_counter()
+            try:
+                response = _check_response(self.providers[endpoint.url].make_batch_request(batch_requests))
+            except Exception as e:
+                self.pool.finish(endpoint, time.perf_counter() - start, ok=False)
+                last_error = e
+                continue
+            self.pool.finish(endpoint, time.perf_counter() - start, ok=True)
+            return response
+        raise last_error
+
+    def _failover_request(self, method: str, params: Any, endpoints: List[RPCEndpoint]) -> Any:
+        last_error = None
+        for endpoint in endpoints:
+            try:
+                return self._send(endpoint, method, params)
+            except Exception as e:
+                last_error = e
+        raise last_error
+
+    def _hedged_request(self, method: str, params: Any, endpoints: List[RPCEndpoint]) -> Any:
+        primary = endpoints[0]
+        remaining = list(endpoints[1:])
+        delay = self.pool.hedge_delay(primary)
+        pending = {self.executor.submit(self._send, primary, method, params): primary}
+        hedged = set()
+        last_error = None
+
+        while pending:
+            done, _ = wait(pending, timeout=delay if remaining else None, return_when=FIRST_COMPLETED)
+            for future in done:
+                endpoint = pending.pop(future)
+                try:
+                    response = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                if endpoint in hedged:
+                    self.pool.record_hedge(endpoint, won=True)
+                return response
+
+            # Timed out: hedge to the next endpoint. Everything failed: fail over to it
+            if remaining and (not done or not pending):
+                endpoint = remaining.pop(0)
+                if not done:
+                    hedged.add(endpoint)
+                    self.pool.record_hedge(endpoint)
+                pending[self.executor.submit(self._send, endpoint, method, params)] = endpoint
+
+        raise last_error
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return any(provider.is_connected(show_traceback) for provider in self.providers.values())
+
+    def close(self) -> None:
+        """Stop the hedge threads; a losing leg still waiting on its endpoint is not awaited"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class AsyncPooledHTTPProvider(AsyncJSONBaseProvider):
+    """Asyncio counterpart of PooledHTTPProvider; hedges are tasks and losers are cancelled"""
+
+    def __init__(self, urls: List[str], **kwargs: Any):
+        super().__init__(**kwargs)
+        self.pool = RPCEndpointPool.shared(urls)
+        self.providers = {url: AsyncHTTPProvider(url) for url in urls}
+
+    async def cache_async_session(self, session):
+        """Share one aiohttp session across every endpoint"""
+        for provider in self.providers.values():
+            await provider.cache_async_session(session)
+        return session
+
+    async def _send(self, endpoint: RPCEndpoint, method: str, params: Any) -> Any:
+        self.pool.begin(endpoint)
+        start = time.perf_counter()
+        try:
+            response = _check_response(await self.providers[endpoint.url].make_request(method, params))
+        except asyncio.CancelledError:
+            self.pool.abandon(endpoint)
+            raise
+        except Exception:
+            self.pool.finish(endpoint, time.perf_counter() - start, ok=False)
+            raise
+        self.pool.finish(endpoint, time.perf_counter() - start, ok=True)
+        return response
+
+    async def make_request(self, method, params):
+        endpoints = self.pool.ranked()
+        if method in HEDGED_METHODS and len(endpoints) > 1:
+            return await self._hedged_request(method, params, endpoints)
+
+        last_error = None
+        for endpoint in endpoints:
+            try:
+                return await self._send(endpoint, method, params)
+            except Exception as e:
+                last_error = e
+        raise last_error
+
+    async def make_batch_request(self, batch_requests):
+        last_error = None
+        for endpoint in self.pool.ranked():
+            self.pool.begin(endpoint)
+            start = time.perf_counter()
+            try:
+                response = _check_response(
+                    await self.providers[endpoint.url].make_batch_request(batch_requests)
+                )
+            except asyncio.CancelledError:
+                self.pool.abandon(endpoint)
+                raise
+            except Exception as e:
+                self.pool.finish(endpoint, time.perf_counter() - start, ok=False)
+                last_error = e
+                continue
+            self.pool.finish(endpoint, time.perf_counter() - start, ok=True)
+            return response
+        raise last_error
+
+    async def _hedged_request(self, method: str, params: Any, endpoints: List[RPCEndpoint]) -> Any:
+        primary = endpoints[0]
+        remaining = list(endpoints[1:])
+        delay = self.pool.hedge_delay(primary)
+        pending = {asyncio.ensure_future(self._send(primary, method, params)): primary}
+        hedged = set()
+        last_error = None
+
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, timeout=delay if remaining else None, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    endpoint = pending.pop(task)
+                    try:
+                        response = task.result()
+                    except Exception as e:
+                        last_error = e
+                        continue
+                    if endpoint in hedged:
+                        self.pool.record_hedge(endpoint, won=True)
+                    return response
+
+                if remaining and (not done or not pending):
+                    endpoint = remaining.pop(0)
+                    if not done:
+                        hedged.add(endpoint)
+                        self.pool.record_hedge(endpoint)
+                    pending[asyncio.ensure_future(self._send(endpoint, method, params))] = endpoint
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise last_error
+
+    async def is_connected(self, show_traceback: bool = False) -> bool:
+        for provider in self.providers.values():
+            if await provider.is_connected(show_traceback):
+                return True
+        return False
+
+    async def disconnect(self) -> None:
+        for provider in self.providers.values():
+            await provider.disconnect()
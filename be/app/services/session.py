@@ -1,4 +1,5 @@
-from sqlalchemy.orm import Session as DBSession
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession as DBSession
 from app.models.session import Session
 from typing import Optional
 import time
@@ -37,7 +38,7 @@ class SessionService:
             return None
     
     @staticmethod
-    def create_session(
+    async def create_session(
         db: DBSession, 
         wallet_address: str, 
         public_key_x: str, 
@@ -46,7 +47,7 @@ class SessionService:
         jwt_token: str
     ) -> Session:
         """Create session for authenticated issuer"""
-        db_session = db.query(Session).filter(Session.wallet_address == wallet_address).first()
+        db_session = await db.get(Session, wallet_address)
         
         if db_session:
             db_session.public_key_x = public_key_x
@@ -65,32 +66,28 @@ class SessionService:
             )
             db.add(db_session)
         
-        db.commit()
-        db.refresh(db_session)
+        await db.commit()
         return db_session
     
     @staticmethod
-    def get_session(db: DBSession, wallet_address: str) -> Optional[Session]:
+    async def get_session(db: DBSession, wallet_address: str) -> Optional[Session]:
         """Get session for wallet address"""
-        return db.query(Session).filter(Session.wallet_address == wallet_address).first()
+        return await db.get(Session, wallet_address)
     
     @staticmethod
-    def get_session_by_token(db: DBSession, token: str) -> Optional[Session]:
+    async def get_session_by_token(db: DBSession, token: str) -> Optional[Session]:
         """Get session by JWT token"""
-        return db.query(Session).filter(Session.jwt_token == token).first()
+        return await db.scalar(select(Session).where(Session.jwt_token == token).limit(1))
     
     @staticmethod
-    def delete_session(db: DBSession, wallet_address: str) -> bool:
+    async def delete_session(db: DBSession, wallet_address: str) -> bool:
         """Delete session on logout"""
-        db_session = db.query(Session).filter(Session.wallet_address == wallet_address).first()
-        if db_session:
-            db.delete(db_session)
-            db.commit()
-            return True
-        return False
+        deleted = await db.execute(delete(Session).where(Session.wallet_address == wallet_address))
+        await db.commit()
+        return deleted.rowcount > 0
     
     @staticmethod
-    def validate_session_token(db: DBSession, token: str) -> Optional[Session]:
+    async def validate_session_token(db: DBSession, token: str) -> Optional[Session]:
         """Validate JWT token and return session"""
         payload = SessionService.verify_jwt_token(token)
         if not payload:
@@ -100,7 +97,7 @@ class SessionService:
         if not wallet_address:
             return None
         
-        session = SessionService.get_session(db, wallet_address)
+        session = await SessionService.get_session(db, wallet_address)
         if session and session.jwt_token == token:
             return session
         
@@ -1,7 +1,8 @@
 import hashlib
 import secrets
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.student import Student
 
 
@@ -23,8 +24,8 @@ class StudentService:
         return hashlib.sha256(data.encode()).hexdigest()
     
     @staticmethod
-    def create_student(
-        db: Session,
+    async def create_student(
+        db: AsyncSession,
         wallet_address: str,
         nim: str,
         nama: str
@@ -45,20 +46,19 @@ class StudentService:
         )
         
         db.add(student)
-        db.commit()
-        db.refresh(student)
+        await db.commit()
         
         return student
     
     @staticmethod
-    def get_student_by_wallet(db: Session, wallet_address: str) -> Optional[Student]:
+    async def get_student_by_wallet(db: AsyncSession, wallet_address: str) -> Optional[Student]:
         """Get student by wallet address"""
-        return db.query(Student).filter(Student.id == wallet_address).first()
+        return await db.get(Student, wallet_address)
     
     @staticmethod
-    def get_student_by_nim(db: Session, nim: str) -> Optional[Student]:
+    async def get_student_by_nim(db: AsyncSession, nim: str) -> Optional[Student]:
         """Get student by NIM"""
-        return db.query(Student).filter(Student.nim == nim).first()
+        return await db.scalar(select(Student).where(Student.nim == nim).limit(1))
     
     @staticmethod
     def verify_student_hash(student: Student) -> bool:
@@ -71,9 +71,9 @@ class StudentService:
         return computed_hash == student.hash_val
     
     @staticmethod
-    def get_all_students(db: Session) -> list[dict]:
+    async def get_all_students(db: AsyncSession) -> list[dict]:
         """Get all students with only nim, nama, and wallet_address"""
-        students = db.query(Student.nim, Student.nama, Student.id).all()
+        students = await db.execute(select(Student.nim, Student.nama, Student.id))
         return [
             {
                 "nim": student.nim,
@@ -84,11 +84,8 @@ class StudentService:
         ]
     
     @staticmethod
-    def delete_student(db: Session, wallet_address: str) -> bool:
+    async def delete_student(db: AsyncSession, wallet_address: str) -> bool:
         """Delete student by wallet address"""
-        student = db.query(Student).filter(Student.id == wallet_address).first()
-        if student:
-            db.delete(student)
-            db.commit()
-            return True
-        return False
+        deleted = await db.execute(delete(Student).where(Student.id == wallet_address))
+        await db.commit()
+        return deleted.rowcount > 0
@@ -0,0 +1,113 @@
+import base64
+import hashlib
+import os
+from typing import Dict, List, Tuple
+
+# Kubo's `ipfs add` defaults: fixed-size 256 KiB chunks, balanced DAG of at most 174 links per node
+CHUNK_SIZE = 256 * 1024
+MAX_LINKS = 174
+IPFS_CID_VERSION = int(os.getenv('IPFS_CID_VERSION', '0'))
+
+_BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+_CODEC_RAW = 0x55
+_CODEC_DAG_PB = 0x70
+_UNIXFS_FILE = 2
+
+def add_params(cid_version: int = IPFS_CID_VERSION) -> Dict[str, str]:
+    """/api/v0/add options pinning Kubo to the layout compute_cid reproduces"""
+    return {
+        'cid-version': str(cid_version),
+        'chunker': f'size-{CHUNK_SIZE}',
+        'raw-leaves': 'true' if cid_version == 1 else 'false',
+    }
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+def _field_varint(field: int, value: int) -> bytes:
+    return _varint(field << 3) + _varint(value)
+
+def _field_bytes(field: int, value: bytes) -> bytes:
+    return _varint((field << 3) | 2) + _varint(len(value)) + value
+
+def _unixfs_file(data: bytes, filesize: int, blocksizes: List[int]) -> bytes:
+    """UnixFS Data message: Type=File, Data, filesize, repeated (unpacked) blocksizes"""
+    out = _field_varint(1, _UNIXFS_FILE)
+    if data:
+        out += _field_bytes(2, data)
+    out += _field_varint(3, filesize)
+    for size in blocksizes:
+        out += _field_varint(4, size)
+    return out
+
+def _dag_pb(links: List[Tuple[bytes, int]], data: bytes) -> bytes:
+    """PBNode in canonical order: Links (field 2) before Data (field 1)"""
+    out = b''
+    for cid_bytes, tsize in links:
+        link = _field_bytes(1, cid_bytes) + _field_bytes(2, b'') + _field_varint(3, tsize)
+        out += _field_bytes(2, link)
+    return out + _field_bytes(1, data)
+
+def _cid_bytes(block: bytes, codec: int, cid_version: int) -> bytes:
+    multihash = b'\x12\x20' + hashlib.sha256(block).digest()
+    if cid_version == 0:
+        return multihash
+    return _varint(1) + _varint(codec) + multihash
+
+def _base58btc(data: bytes) -> str:
+    number = int.from_bytes(data, 'big')
+    encoded = ''
+    while number:
+        number, remainder = divmod(number, 58)
+        encoded = _BASE58_ALPHABET[remainder] + encoded
+    return '1' * (len(data) - len(data.lstrip(b'\0'))) + encoded
+
+def encode_cid(cid_bytes: bytes, cid_version: int) -> str:
+    """String form Kubo prints: base58btc for CIDv0, multibase base32 ('b') for CIDv1"""
+    if cid_version == 0:
+        return _base58btc(cid_bytes)
+    return 'b' + base64.b32encode(cid_bytes).decode().lower().rstrip('=')
+
+def compute_cid(data: bytes, cid_version: int = IPFS_CID_VERSION) -> str:
+    """
+    CID Kubo assigns to `data` under add_params(cid_version), without contacting IPFS
+    CIDv0 wraps every chunk in a dag-pb UnixFS leaf; CIDv1 uses raw leaves
+    """
+    # (cid bytes, cumulative DAG size, file bytes) per node of the current level
+    level = []
+    for start in range(0, max(len(data), 1), CHUNK_SIZE):
+        chunk = data[start:start + CHUNK_SIZE]
+        if cid_version == 1:
+            block = chunk
+            codec = _CODEC_RAW
+        else:
+            block = _dag_pb([], _unixfs_file(chunk, len(chunk), []))
+            codec = _CODEC_DAG_PB
+        level.append((_cid_bytes(block, codec, cid_version), len(block), len(chunk)))
+
+    # Grouping bottom-up yields the same tree as Kubo's depth-first balanced builder
+    while len(level) > 1:
+        parents = []
+        for start in range(0, len(level), MAX_LINKS):
+            children = level[start:start + MAX_LINKS]
+            filesize = sum(size for _, _, size in children)
+            block = _dag_pb(
+                [(cid_bytes, tsize) for cid_bytes, tsize, _ in children],
+                _unixfs_file(b'', filesize, [size for _, _, size in children])
+            )
+            parents.append((
+                _cid_bytes(block, _CODEC_DAG_PB, cid_version),
+                len(block) + sum(tsize for _, tsize, _ in children),
+                filesize
+            ))
+        level = parents
+
+    return encode_cid(level[0][0], cid_version)
@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from eth_utils import keccak
+
+from app.services.contract_events import ContractEventWatcher
+
+VERIFY_CACHE_TTL = float(os.getenv("VERIFY_CACHE_TTL", "300"))
+VERIFY_CACHE_MAX_ENTRIES = int(os.getenv("VERIFY_CACHE_MAX_ENTRIES", "10000"))
+# Entries are only served while the event watcher has polled this recently
+VERIFY_CACHE_MAX_LAG = float(os.getenv("VERIFY_CACHE_MAX_LAG", "30"))
+
+def student_topic(student_id: str) -> bytes:
+    """The value an indexed `string studentId` event argument carries"""
+    return keccak(text=student_id)
+
+class VerificationCache:
+    """
+    In-process cache of /verify results, keyed by student ID and holding the on-chain
+    certHash (and cohort leaf) the result was checked against
+    Revocation events drop the student's entry as soon as the watcher sees them; the TTL
+    only bounds how long a missed event can go unnoticed. Entries are not served while
+    the watcher is behind by more than VERIFY_CACHE_MAX_LAG seconds
+    """
+
+    def __init__(self, contract_service, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        self.ttl = ttl if ttl is not None else VERIFY_CACHE_TTL
+        self.max_entries = max_entries or VERIFY_CACHE_MAX_ENTRIES
+        self.watcher = ContractEventWatcher(contract_service)
+        self.watcher.subscribe("CertificateRevokeSigned", self._on_certificate_event)
+        self.watcher.subscribe("CertificateRevoked", self._on_certificate_event)
+        self.watcher.subscribe("CohortCertificateRevokeSigned", self._on_cohort_revoke_signed)
+        self.watcher.subscribe("CohortCertificateRevoked", self._on_cohort_revoked)
+
+        # student_id -> (expires_at, block, topic, cert_hash, leaf, result); events name
+        # the student by keccak(student_id) or cohort leaf, hence the two reverse indexes
+        self._entries: "OrderedDict[str, Tuple]" = OrderedDict()
+        self._topics: Dict[bytes, str] = {}
+        self._leaves: Dict[bytes, str] = {}
+        # Bumped by every invalidation, so a fill that raced one is not stored
+        self._epoch = 0
+        self._start_failed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.invalidations = 0
+
+    # ========== LOOKUPS ==========
+
+    def is_serving(self) -> bool:
+        lag = self.watcher.lag()
+        return self.watcher.is_running and lag is not None and lag < VERIFY_CACHE_MAX_LAG
+
+    def get(self, student_id: str) -> Optional[Tuple[Any, int]]:
+        """
+        Returns: (cached result, block it was read at), or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(student_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] < time.monotonic() or not self.is_serving():
+                self.stale += 1
+                self._drop(student_id)
+                return None
+            self._entries.move_to_end(student_id)
+            self.hits += 1
+            return entry[5], entry[1]
+
+    def begin(self) -> Optional[Tuple[int, int]]:
+        """
+        Call before the on-chain reads of a result that may be cached
+        Starts the watcher first, so any revocation after the reads is seen
+        Returns: a token for put(), or None if events cannot be watched
+        """
+        if not self.watcher.is_running:
+            # After a failed start, bypass the cache for a while instead of paying
+            # for another failing RPC call on every verification
+            if self._start_failed_at is not None and time.monotonic() - self._start_failed_at < VERIFY_CACHE_MAX_LAG:
+                return None
+            try:
+                self.watcher.start()
+                self._start_failed_at = None
+            except Exception as e:
+                print(f"Error starting verification cache watcher: {str(e)}")
+                self._start_failed_at = time.monotonic()
+                return None
+        return self._epoch, self.watcher.last_block
+
+    def put(
+        self,
+        token: Optional[Tuple[int, int]],
+        student_id: str,
+        cert_hash: str,
+        result: Any,
+        leaf: Optional[bytes] = None
+    ) -> None:
+        """Store a result unless an invalidation happened since begin() returned `token`"""
+        if token is None:
+            return
+        epoch, block = token
+        topic = student_topic(student_id)
+        with self._lock:
+            if epoch != self._epoch:
+                return
+            self._drop(student_id)
+            self._entries[student_id] = (time.monotonic() + self.ttl, block, topic, cert_hash, leaf, result)
+            self._topics[topic] = student_id
+            if leaf is not None:
+                self._leaves[leaf] = student_id
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, student_id: str) -> None:
+        entry = self._entries.pop(student_id, None)
+        if entry is None:
+            return
+        self._topics.pop(entry[2], None)
+        if entry[4] is not None:
+            self._leaves.pop(entry[4], None)
+
+    # ========== INVALIDATION ==========
+
+    def invalidate(self, student_id: Optional[str]) -> None:
+        """Drop the entry of `student_id`; any fill in flight is discarded either way"""
+        with self._lock:
+            self._epoch += 1
+            if student_id in self._entries:
+                self._drop(student_id)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._topics.clear()
+            self._leaves.clear()
+
+    # studentId is an indexed string, so certificate events only carry its keccak
+
+    def _on_certificate_event(self, event) -> None:
+        self.invalidate(self._topics.get(bytes(event["args"]["studentId"])))
+
+    def _on_cohort_revoke_signed(self, event) -> None:
+        self.invalidate(self._leaves.get(bytes(event["args"]["leaf"])))
+
+    def _on_cohort_revoked(self, event) -> None:
+        self.invalidate(event["args"]["studentId"])
+
+    def close(self) -> None:
+        self.watcher.stop()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses + self.stale
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "last_block": self.watcher.last_block,
+            "watcher_lag_seconds": self.watcher.lag(),
+            "watching_events": self.watcher.is_running
+        }
@@ -0,0 +1,101 @@
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+PUBLIC_VERIFY_MEMO_BYTES = int(os.getenv("PUBLIC_VERIFY_MEMO_BYTES", str(32 * 1024 * 1024)))
+# Rough per-entry cost of the key, tuple and dict slot on top of the text itself
+ENTRY_OVERHEAD = 256
+
+def memo_key(ipfs_cid: str, aes_key: str, cert_hash: str) -> Tuple[str, str, str]:
+    """(cid, sha256 of the key, cert_hash): the raw AES key is never kept"""
+    return ipfs_cid, hashlib.sha256(aes_key.encode("utf-8")).hexdigest(), cert_hash
+
+class PublicVerifyMemo:
+    """
+    Bounded LRU of /verify-public payload checks (download, decrypt, re-hash)
+    A CID names immutable content, so the outcome for (cid, key, cert_hash) never
+    changes and needs no invalidation; only on-chain state is re-read per request.
+    Entries are evicted by a byte budget on the kept certificate text, and concurrent
+    identical checks share one in-flight load
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes if max_bytes is not None else PUBLIC_VERIFY_MEMO_BYTES
+        self._entries: "OrderedDict[Tuple, Tuple[Dict, int]]" = OrderedDict()
+        self._inflight: Dict[Tuple, asyncio.Task] = {}
+        self.bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    async def get_or_load(self, key: Tuple, loader: Callable[[], Awaitable[Tuple[Dict, bool]]]) -> Tuple[Dict, str]:
+        """
+        `loader` returns (outcome, cacheable); transient failures such as an IPFS
+        timeout should not be cached
+        Returns: (outcome, tier) with tier memory, coalesced or miss
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], "memory"
+
+        # The load runs as its own task, so a caller that disconnects does not cancel
+        # it for everyone else waiting on the same key
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            tier = "coalesced"
+        else:
+            self.misses += 1
+            tier = "miss"
+            task = asyncio.ensure_future(self._load(key, loader))
+            # Retrieve the exception even when every caller went away
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self._inflight[key] = task
+        return await asyncio.shield(task), tier
+
+    async def _load(self, key: Tuple, loader: Callable[[], Awaitable[Tuple[Dict, bool]]]) -> Dict:
+        try:
+            outcome, cacheable = await loader()
+        finally:
+            del self._inflight[key]
+        if cacheable:
+            self._put(key, outcome)
+        return outcome
+
+    def _put(self, key: Tuple, outcome: Dict) -> None:
+        size = len(outcome.get("certificate_text") or "") + ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        self._entries[key] = (outcome, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "in_flight": len(self._inflight)
+        }
@@ -0,0 +1,75 @@
+"""
+Concurrent certificate reads from one event loop: the blocking ContractService called
+inline, as the async routes used to, against AsyncContractService on AsyncWeb3
+
+    python -m benchmarks.async_reads                    # stub node, 50 ms per request
+    python -m benchmarks.async_reads --concurrency 500
+    python -m benchmarks.async_reads --rpc-url http://127.0.0.1:8545 --contract 0x...
+
+Also reports the longest event loop stall seen by a 10 ms heartbeat, which is what every
+other request on the worker waits for. Run from be/.
+"""
+import argparse
+import asyncio
+import os
+import time
+from contextlib import nullcontext
+
+from benchmarks.stubs import StubProcess, StubRPCServer
+
+
+async def heartbeat(stalls: list, interval: float = 0.01) -> None:
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        stalls.append(time.perf_counter() - start - interval)
+
+
+async def run(name: str, read, student_ids: list) -> None:
+    stalls = []
+    monitor = asyncio.ensure_future(heartbeat(stalls))
+    start = time.perf_counter()
+    states = await asyncio.gather(*[read(student_id) for student_id in student_ids])
+    elapsed = time.perf_counter() - start
+    monitor.cancel()
+    found = sum(1 for state in states if state["exists"])
+    print(
+        f"{name:<9} {len(student_ids)} reads ({found} found) in {elapsed:.2f} s  "
+        f"{len(student_ids) / elapsed:.0f} reads/s  longest loop stall={max(stalls, default=elapsed) * 1000:.0f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rpc-url", help="node to read from; a stub node is started when omitted")
+    parser.add_argument("--contract", default=os.getenv("CONTRACT_ADDRESS", "0x" + "22" * 20))
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.05, help="stub node latency per request (s)")
+    args = parser.parse_args()
+
+    stub = None if args.rpc_url else StubProcess(StubRPCServer, delay=args.delay)
+    with stub or nullcontext():
+        os.environ["SEPOLIA_URLS"] = args.rpc_url or stub.url
+        os.environ["CONTRACT_ADDRESS"] = args.contract
+        os.environ.setdefault("RPC_POOL_SIZE", str(args.concurrency))
+
+        from app.services.async_read_contract import AsyncContractService
+        from app.services.read_contract import ContractService
+
+        student_ids = [f"NIM{i}" for i in range(args.concurrency)]
+        blocking = ContractService()
+        blocking.multicall_deployed()
+
+        async def blocking_read(student_id: str):
+            return blocking.get_certificate_state(student_id)
+
+        native = AsyncContractService()
+        await native.multicall_deployed()
+
+        await run("blocking", blocking_read, student_ids)
+        await run("async", native.get_certificate_state, student_ids)
+        await native.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
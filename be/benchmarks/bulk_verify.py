@@ -0,0 +1,136 @@
+"""
+Verifying an employer's list of student IDs through the real route handlers: one
+POST /verify per ID in turn, all of them at once, and a single POST /verify/batch.
+The chain, IPFS and database are a stub node, a stub Kubo API and a SQLite file
+holding real encrypted certificates and their keys
+
+    python -m benchmarks.bulk_verify
+    python -m benchmarks.bulk_verify --students 1000 --delay 0.02 --size 16384
+
+Also reports the longest event loop stall seen by a 10 ms heartbeat. Run from be/.
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+
+from benchmarks.stubs import StubIPFSServer, StubProcess, StubRPCServer
+
+
+async def heartbeat(stalls: list, interval: float = 0.01) -> None:
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        stalls.append(time.perf_counter() - start - interval)
+
+
+async def run(name: str, verify_all, student_ids: list, rpc: StubProcess, ipfs: StubProcess) -> None:
+    rpc_before, ipfs_before = rpc.stats()["requests"], ipfs.stats()["requests"]
+    stalls = []
+    monitor = asyncio.ensure_future(heartbeat(stalls))
+    start = time.perf_counter()
+    verified = await verify_all(student_ids)
+    elapsed = time.perf_counter() - start
+    monitor.cancel()
+    print(
+        f"{name:<18} {verified}/{len(student_ids)} verified in {elapsed:6.2f} s  "
+        f"{len(student_ids) / elapsed:6.0f} ids/s  rpc requests={rpc.stats()['requests'] - rpc_before}  "
+        f"ipfs requests={ipfs.stats()['requests'] - ipfs_before}  "
+        f"longest loop stall={max(stalls, default=elapsed) * 1000:.0f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=300)
+    parser.add_argument("--size", type=int, default=4096, help="plaintext bytes per certificate")
+    parser.add_argument("--delay", type=float, default=0.02, help="stub node and IPFS latency per request (s)")
+    args = parser.parse_args()
+
+    workdir = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir.name}/certify.db"
+    os.environ.setdefault("CONTRACT_ADDRESS", "0x" + "22" * 20)
+
+    from app.services.encryption import AESEncryptionService
+
+    student_ids = [f"NIM{i}" for i in range(args.students)]
+    keys, blobs, hashes = {}, {}, {}
+    for student_id in student_ids:
+        plaintext = (f"Ijazah {student_id}\n" + "x" * args.size)[:args.size].encode()
+        keys[student_id] = AESEncryptionService.generate_key()
+        blobs[student_id] = AESEncryptionService.encrypt(plaintext, keys[student_id])
+        hashes[student_id] = hashlib.sha256(plaintext).hexdigest()
+
+    with StubProcess(StubIPFSServer, delay=args.delay) as ipfs:
+        os.environ["IPFS_URL"] = ipfs.url
+        from app.services.ipfs import IPFSService
+        uploader = IPFSService()
+        cids = uploader.upload_many([(student_id, blobs[student_id]) for student_id in student_ids])["cids"]
+        uploader.close()
+        records = {student_id: (hashes[student_id], cids[student_id]) for student_id in student_ids}
+
+        with StubProcess(StubRPCServer, delay=args.delay, certificates=args.students, records=records) as rpc:
+            os.environ["SEPOLIA_URLS"] = rpc.url
+            asyncio.run(measure(student_ids, keys, rpc, ipfs))
+    workdir.cleanup()
+
+
+async def measure(student_ids: list, keys: dict, rpc: StubProcess, ipfs: StubProcess) -> None:
+    from fastapi.responses import Response
+
+    from app.api.certificate import verify_certificate, verify_certificates_batch
+    from app.database.connection import AsyncSessionLocal, Base, engine
+    from app.models.certificate_key import CertificateKey
+    from app.schemas.certificate import BatchVerifyRequest, VerifyCertificateRequest
+    from app.services.async_ipfs import AsyncIPFSService
+    from app.services.async_read_contract import AsyncContractService
+    from app.services.encryption import AESEncryptionService
+    from app.services.read_contract import ContractService
+    from app.services.verify_cache import VerificationCache
+
+    Base.metadata.create_all(engine, tables=[CertificateKey.__table__])
+    async with AsyncSessionLocal() as db:
+        db.add_all([CertificateKey(student_id=student_id, aes_key=key) for student_id, key in keys.items()])
+        await db.commit()
+
+    contract_service = AsyncContractService()
+    await contract_service.multicall_deployed()
+    ipfs_service = AsyncIPFSService()
+    encryption_service = AESEncryptionService()
+    verify_cache = VerificationCache(ContractService())
+
+    async def verify_one(student_id: str) -> bool:
+        async with AsyncSessionLocal() as db:
+            result = await verify_certificate(
+                VerifyCertificateRequest(student_id=student_id), Response(), db,
+                contract_service, ipfs_service, encryption_service, None, verify_cache
+            )
+        return result.success
+
+    async def sequential(ids: list) -> int:
+        return sum([await verify_one(student_id) for student_id in ids])
+
+    async def concurrent(ids: list) -> int:
+        return sum(await asyncio.gather(*[verify_one(student_id) for student_id in ids]))
+
+    async def batch(ids: list) -> int:
+        response = await verify_certificates_batch(
+            BatchVerifyRequest(student_ids=ids), contract_service, ipfs_service,
+            encryption_service, None, verify_cache
+        )
+        lines = [line async for line in response.body_iterator]
+        return sum('"success": true' in line for line in lines[:-1])
+
+    for name, verify_all in (("/verify in turn", sequential), ("/verify at once", concurrent), ("/verify/batch", batch)):
+        # Every run starts cold; results are still cached as they would be in production
+        verify_cache.clear()
+        await run(name, verify_all, student_ids, rpc, ipfs)
+    verify_cache.close()
+    await ipfs_service.close()
+    await contract_service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+CPU time and peak memory of serializing a /blockchain/all listing of N certificates
+from the contract's parallel arrays:
+
+    dicts     one dict per certificate with a .hex() per hash, through FastAPI's
+              jsonable_encoder and json.dumps (the original response)
+    ndjson    one dict per certificate, one json.dumps line each (the default stream;
+              joined here, so its peak includes the whole body)
+    columnar  the parallel arrays as named columns, bulk hex-encoded, one orjson.dumps
+
+    python -m benchmarks.columnar_listing
+    python -m benchmarks.columnar_listing --rows 10000 100000 1000000
+
+Run from be/.
+"""
+import argparse
+import json
+import os
+import time
+import tracemalloc
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from app.services.read_contract import format_certificate_columns, format_certificate_list
+
+
+def contract_result(rows: int) -> tuple:
+    """The decoded output of getAllCertificates for `rows` certificates"""
+    return (
+        [f"NIM{i:08d}" for i in range(rows)],
+        [os.urandom(32) for _ in range(rows)],
+        [f"Qm{i:044d}" for i in range(rows)],
+        [i % 50 != 0 for i in range(rows)],
+        [1700000000 + i for i in range(rows)],
+        [1700000000 + i for i in range(rows)],
+        ["" if i % 50 else "Revoked by issuers" for i in range(rows)],
+    )
+
+
+def dicts(result: tuple) -> bytes:
+    certificates = []
+    for i in range(len(result[0])):
+        certificates.append({
+            "studentId": result[0][i],
+            "certHash": result[1][i].hex(),
+            "ipfsCID": result[2][i],
+            "isValid": result[3][i],
+            "timestampIssued": result[4][i],
+            "timestampLastUpdated": result[5][i],
+            "revokeReason": result[6][i]
+        })
+    body = {"success": True, "certificates": certificates, "count": len(certificates)}
+    return json.dumps(jsonable_encoder(body)).encode()
+
+
+def ndjson(result: tuple) -> bytes:
+    return "".join(json.dumps(certificate) + "\n" for certificate in format_certificate_list(result)).encode()
+
+
+def columnar(result: tuple) -> bytes:
+    columns = format_certificate_columns(result)
+    return orjson.dumps({**columns, "next_cursor": None, "count": len(columns["studentIds"])})
+
+
+def measure(name: str, serialize, result: tuple) -> None:
+    start = time.perf_counter()
+    body = serialize(result)
+    elapsed = time.perf_counter() - start
+    # Separate run: tracing every allocation would distort the timing
+    tracemalloc.start()
+    serialize(result)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {name:<9} {elapsed * 1000:8.1f} ms  peak {peak / 2 ** 20:7.1f} MiB  body {len(body) / 2 ** 20:6.1f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        result = contract_result(rows)
+        print(f"{rows} certificates")
+        for name, serialize in (("dicts", dicts), ("ndjson", ndjson), ("columnar", columnar)):
+            measure(name, serialize, result)
+
+
+if __name__ == "__main__":
+    main()
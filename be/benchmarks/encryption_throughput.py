@@ -0,0 +1,78 @@
+"""
+Encryption and decryption throughput of the original AES-256-CBC blobs (pycryptodome,
+pad/unpad over the whole buffer) against the chunked AES-256-GCM envelope, whole-buffer
+and incremental
+
+    python -m benchmarks.encryption_throughput
+    python -m benchmarks.encryption_throughput --sizes 65536 1048576 --repeat 50
+
+Run from be/.
+"""
+import argparse
+import base64
+import os
+import time
+
+from Crypto.Cipher import AES
+from Crypto.Random import get_random_bytes
+from Crypto.Util.Padding import pad, unpad
+
+from app.services.encryption import AESEncryptionService
+
+
+def cbc_encrypt(data: bytes, key_b64: str) -> bytes:
+    """The original AESEncryptionService.encrypt: IV + AES-256-CBC(pad(data))"""
+    iv = get_random_bytes(16)
+    return iv + AES.new(base64.b64decode(key_b64), AES.MODE_CBC, iv).encrypt(pad(data, AES.block_size))
+
+
+def cbc_decrypt(blob: bytes, key_b64: str) -> bytes:
+    cipher = AES.new(base64.b64decode(key_b64), AES.MODE_CBC, blob[:16])
+    return unpad(cipher.decrypt(blob[16:]), AES.block_size)
+
+
+def gcm_stream_encrypt(data: bytes, key_b64: str, piece: int = 256 * 1024) -> bytes:
+    encryptor = AESEncryptionService.encryptor(key_b64)
+    out = [encryptor.update(data[i:i + piece]) for i in range(0, len(data), piece)]
+    return b''.join(out) + encryptor.finalize()
+
+
+def gcm_stream_decrypt(blob: bytes, key_b64: str, piece: int = 256 * 1024) -> bytes:
+    decryptor = AESEncryptionService.decryptor(key_b64)
+    out = [decryptor.update(blob[i:i + piece]) for i in range(0, len(blob), piece)]
+    return b''.join(out) + decryptor.finalize()
+
+
+def throughput(function, payload: bytes, key: str, size: int, repeat: int) -> float:
+    function(payload, key)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(payload, key)
+    return size * repeat / (time.perf_counter() - start) / (1024 * 1024)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64 * 1024, 1024 * 1024, 16 * 1024 * 1024])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    key = AESEncryptionService.generate_key()
+    modes = [
+        ("cbc", cbc_encrypt, cbc_decrypt),
+        ("gcm envelope", AESEncryptionService.encrypt, AESEncryptionService.decrypt),
+        ("gcm stream", gcm_stream_encrypt, gcm_stream_decrypt),
+    ]
+    for size in args.sizes:
+        data = os.urandom(size)
+        for name, encrypt, decrypt in modes:
+            blob = encrypt(data, key)
+            assert decrypt(blob, key) == data
+            print(
+                f"{size // 1024:>6} KiB  {name:<13} encrypt {throughput(encrypt, data, key, size, args.repeat):7.0f} MiB/s  "
+                f"decrypt {throughput(decrypt, blob, key, size, args.repeat):7.0f} MiB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
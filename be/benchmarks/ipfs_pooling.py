@@ -0,0 +1,91 @@
+"""
+Upload and download bursts against a local stub Kubo API: the original one
+requests.post per call (a new TCP connection each time), the pooled IPFSService
+session, and AsyncIPFSService with the whole burst in flight at once
+
+    python -m benchmarks.ipfs_pooling
+    python -m benchmarks.ipfs_pooling --files 1000 --size 65536 --delay 0
+    python -m benchmarks.ipfs_pooling --ipfs-url http://127.0.0.1:5001   # a local Kubo node
+
+Run from be/.
+"""
+import argparse
+import asyncio
+import os
+import time
+from contextlib import nullcontext
+from io import BytesIO
+
+import requests
+
+from benchmarks.stubs import StubIPFSServer, StubProcess
+
+
+class PerRequestIPFS:
+    """The original IPFSService calls: module-level requests.post, flat 30 s timeout"""
+
+    def __init__(self, ipfs_url: str):
+        self.ipfs_url = ipfs_url
+
+    def upload_file(self, file_content: bytes, filename: str) -> str:
+        response = requests.post(
+            f'{self.ipfs_url}/api/v0/add',
+            files={'file': (filename, BytesIO(file_content))},
+            timeout=30
+        )
+        response.raise_for_status()
+        return response.json()['Hash']
+
+    def get_file(self, cid: str) -> bytes:
+        response = requests.post(f"{self.ipfs_url}/api/v0/cat", params={"arg": cid}, stream=True, timeout=30)
+        response.raise_for_status()
+        return response.content
+
+
+def report(name: str, elapsed: float, calls: int, stub, connections_before: int) -> None:
+    connections = f"  {stub.stats()['connections'] - connections_before} connections" if stub else ""
+    print(f"{name:<12} {calls} calls in {elapsed:6.2f} s  {calls / elapsed:7.0f} calls/s{connections}")
+
+
+def run_sync(name: str, service, payloads: list, stub) -> None:
+    before = stub.stats()["connections"] if stub else 0
+    start = time.perf_counter()
+    cids = [service.upload_file(content, f"cert-{i}.bin") for i, content in enumerate(payloads)]
+    for cid in cids:
+        service.get_file(cid)
+    report(name, time.perf_counter() - start, 2 * len(payloads), stub, before)
+
+
+async def run_async(name: str, service, payloads: list, stub) -> None:
+    before = stub.stats()["connections"] if stub else 0
+    start = time.perf_counter()
+    cids = await asyncio.gather(*[service.upload_file(content, f"cert-{i}.bin") for i, content in enumerate(payloads)])
+    await asyncio.gather(*[service.get_file(cid) for cid in cids])
+    report(name, time.perf_counter() - start, 2 * len(payloads), stub, before)
+    await service.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ipfs-url", help="Kubo API to use; a stub is started when omitted")
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--size", type=int, default=16 * 1024, help="bytes per file")
+    parser.add_argument("--delay", type=float, default=0.01, help="stub latency per request (s)")
+    args = parser.parse_args()
+
+    stub = None if args.ipfs_url else StubProcess(StubIPFSServer, delay=args.delay)
+    with stub or nullcontext():
+        os.environ["IPFS_URL"] = args.ipfs_url or stub.url
+        from app.services.async_ipfs import AsyncIPFSService
+        from app.services.ipfs import IPFSService
+
+        payloads = [os.urandom(args.size) for _ in range(args.files)]
+        run_sync("per-request", PerRequestIPFS(os.environ["IPFS_URL"]), payloads, stub)
+        pooled = IPFSService()
+        run_sync("pooled", pooled, payloads, stub)
+        pooled.close()
+        asyncio.run(run_async("async", AsyncIPFSService(), payloads, stub))
+
+
+if __name__ == "__main__":
+    main()
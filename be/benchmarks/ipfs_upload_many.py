@@ -0,0 +1,79 @@
+"""
+Adding a cohort of files against a local stub Kubo API: one /api/v0/add per file
+against upload_many's multipart adds of IPFS_ADD_BATCH_SIZE files, for IPFSService
+and AsyncIPFSService
+
+    python -m benchmarks.ipfs_upload_many
+    python -m benchmarks.ipfs_upload_many --files 2000 --size 4096 --delay 0.02
+    python -m benchmarks.ipfs_upload_many --ipfs-url http://127.0.0.1:5001   # a local Kubo node
+
+Run from be/.
+"""
+import argparse
+import asyncio
+import os
+import time
+from contextlib import nullcontext
+
+from benchmarks.stubs import StubIPFSServer, StubProcess
+
+
+def report(name: str, elapsed: float, uploaded: int, stub, requests_before: int) -> None:
+    requests = f"  {stub.stats()['requests'] - requests_before} add requests" if stub else ""
+    print(f"{name:<18} {uploaded} files in {elapsed:6.2f} s  {uploaded / elapsed:7.0f} files/s{requests}")
+
+
+def run_sync(name: str, upload, files: list, stub) -> None:
+    before = stub.stats()["requests"] if stub else 0
+    start = time.perf_counter()
+    uploaded = upload(files)
+    report(name, time.perf_counter() - start, uploaded, stub, before)
+
+
+async def run_async(name: str, upload, files: list, stub) -> None:
+    before = stub.stats()["requests"] if stub else 0
+    start = time.perf_counter()
+    uploaded = await upload(files)
+    report(name, time.perf_counter() - start, uploaded, stub, before)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ipfs-url", help="Kubo API to use; a stub is started when omitted")
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--size", type=int, default=8 * 1024, help="bytes per file")
+    parser.add_argument("--delay", type=float, default=0.01, help="stub latency per request (s)")
+    args = parser.parse_args()
+
+    stub = None if args.ipfs_url else StubProcess(StubIPFSServer, delay=args.delay)
+    with stub or nullcontext():
+        os.environ["IPFS_URL"] = args.ipfs_url or stub.url
+        from app.services.async_ipfs import AsyncIPFSService
+        from app.services.ipfs import IPFSService
+
+        files = [(f"cert-{i}.bin", os.urandom(args.size)) for i in range(args.files)]
+
+        service = IPFSService()
+        run_sync("per-file", lambda batch: sum(1 for name, content in batch if service.upload_file(content, name)), files, stub)
+        run_sync("upload_many", lambda batch: len(service.upload_many(batch)["cids"]), files, stub)
+        service.close()
+
+        async def run_all() -> None:
+            service = AsyncIPFSService()
+
+            async def per_file(batch: list) -> int:
+                cids = await asyncio.gather(*[service.upload_file(content, name) for name, content in batch])
+                return sum(1 for cid in cids if cid)
+
+            async def many(batch: list) -> int:
+                return len((await service.upload_many(batch))["cids"])
+
+            await run_async("async per-file", per_file, files, stub)
+            await run_async("async upload_many", many, files, stub)
+            await service.close()
+
+        asyncio.run(run_all())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Read latency percentiles through the RPC endpoint pool, with one endpoint artificially
+delayed: a single endpoint (the old SEPOLIA_URL setup), two pooled endpoints with hedged
+reads, and two pooled endpoints where the first is rate limited
+
+    python -m benchmarks.rpc_hedging
+    python -m benchmarks.rpc_hedging --tail-fraction 0.05 --tail-delay 1.0
+    python -m benchmarks.rpc_hedging --rpc-url http://127.0.0.1:8545 --rpc-url http://127.0.0.1:8546
+
+With --rpc-url (two local Hardhat/anvil nodes, one behind a delaying proxy) the given
+endpoints are measured as a pool instead. Run from be/.
+"""
+import argparse
+import time
+from contextlib import ExitStack
+
+from benchmarks.stubs import StubProcess, StubRPCServer
+
+SAMPLES_PER_ENDPOINT = 10
+
+
+def percentile(ordered: list, fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def measure(name: str, urls: list, requests: int) -> None:
+    from app.services.rpc_pool import PooledHTTPProvider
+
+    provider = PooledHTTPProvider(urls)
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        provider.make_request("eth_blockNumber", [])
+        latencies.append(time.perf_counter() - start)
+    provider.close()
+    # The first requests only collect the samples the hedge delay is derived from
+    ordered = sorted(latencies[SAMPLES_PER_ENDPOINT * len(urls):])
+    hedges = sum(endpoint.hedges_sent for endpoint in provider.pool.endpoints)
+    print(
+        f"{name:<22} p50={percentile(ordered, 0.5) * 1000:6.1f} ms  p95={percentile(ordered, 0.95) * 1000:6.1f} ms  "
+        f"p99={percentile(ordered, 0.99) * 1000:6.1f} ms  max={ordered[-1] * 1000:6.1f} ms  hedges={hedges}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rpc-url", action="append", help="endpoint to pool; repeat for each node")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--delay", type=float, default=0.02, help="stub latency per request (s)")
+    parser.add_argument("--tail-delay", type=float, default=0.5, help="extra latency of a slow response (s)")
+    parser.add_argument("--tail-fraction", type=float, default=0.03, help="share of slow responses")
+    args = parser.parse_args()
+
+    if args.rpc_url:
+        measure("pooled", args.rpc_url, args.requests)
+        return
+
+    latency = {"delay": args.delay, "tail_delay": args.tail_delay, "tail_fraction": args.tail_fraction}
+    with ExitStack() as stack:
+        delayed = stack.enter_context(StubProcess(StubRPCServer, **latency))
+        second = stack.enter_context(StubProcess(StubRPCServer, **latency))
+        limited = stack.enter_context(StubProcess(StubRPCServer, error_code=429))
+        measure("single endpoint", [delayed.url], args.requests)
+        measure("pooled + hedged", [delayed.url, second.url], args.requests)
+        measure("first rate limited", [limited.url, second.url], args.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,420 @@
+"""
+Local stand-ins for the services the backend talks to, for benchmarks and tests
+
+StubRPCServer answers the DiplomaContract view calls (directly, through Multicall3
+aggregate3 or in JSON-RPC batches) with canned data, so read paths can be measured
+without a node, and mines the transactions of a single sender as soon as their nonce
+is next. StubIPFSServer implements the Kubo add, cat and pin calls in memory. Every server can add a fixed delay per HTTP request to play a remote
+provider, and counts the requests it served. Benchmarks run them in a StubProcess so the
+stub does not compete with the code under test for the GIL.
+"""
+import json
+import multiprocessing
+import random
+import socket
+import threading
+import time
+import urllib.request
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from eth_abi import decode as abi_decode, encode as abi_encode
+from eth_account.typed_transactions import TypedTransaction
+from hexbytes import HexBytes
+from web3 import Web3
+
+from app.services.read_contract import CONTRACT_ABI, MULTICALL3_ADDRESS, OUTPUT_TYPES
+from app.services.unixfs import compute_cid
+
+CHAIN_ID = 31337
+GWEI = 10 ** 9
+
+INPUT_TYPES = {
+    item["name"]: [arg["type"] for arg in item["inputs"]]
+    for item in CONTRACT_ABI
+    if item["type"] == "function"
+}
+
+SELECTORS = {
+    Web3.keccak(text=f"{name}({','.join(types)})")[:4]: name
+    for name, types in INPUT_TYPES.items()
+}
+
+ISSUER = "0x" + "11" * 20
+
+
+class StubHTTPServer:
+    """
+    Threaded HTTP server on a free local port
+    handler(path, body, headers) returns (status, content type, response body)
+    A `tail_fraction` of requests takes `tail_delay` longer, like a provider's slow tail
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str, bytes, Dict[str, str]], tuple],
+        delay: float = 0.0,
+        tail_delay: float = 0.0,
+        tail_fraction: float = 0.0
+    ):
+        self.handler = handler
+        self.delay = delay
+        self.tail_delay = tail_delay
+        self.tail_fraction = tail_fraction
+        self.requests = 0
+        self.connections = 0
+        self._stats_connections = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # Headers and body go out in separate writes; without this, delayed ACKs add ~40 ms
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_POST(self):
+                if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+                    body = self._read_chunked()
+                else:
+                    body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                with stub._lock:
+                    stub.requests += 1
+                delay = stub.delay
+                if stub.tail_fraction and random.random() < stub.tail_fraction:
+                    delay += stub.tail_delay
+                if delay:
+                    time.sleep(delay)
+                status, content_type, payload = stub.handler(self.path, body, dict(self.headers))
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                if self.path != "/stub/stats":
+                    self.send_error(404)
+                    return
+                with stub._lock:
+                    stub._stats_connections += 1
+                payload = json.dumps(stub.stats()).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _read_chunked(self) -> bytes:
+                chunks = []
+                while True:
+                    size = int(self.rfile.readline().strip(), 16)
+                    if size == 0:
+                        self.rfile.readline()
+                        return b"".join(chunks)
+                    chunks.append(self.rfile.read(size))
+                    self.rfile.readline()
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Requests served and TCP connections accepted; also served at GET /stub/stats,
+        not counting the connections used to ask
+        """
+        with self._lock:
+            return {"requests": self.requests, "connections": self.connections - self._stats_connections}
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubHTTPServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def _serve(stub_class, kwargs: Dict, conn) -> None:
+    stub = stub_class(**kwargs).start()
+    conn.send(stub.url)
+    threading.Event().wait()
+
+
+class StubProcess:
+    """Run a stub server in a child process; only its URL is available to the parent"""
+
+    def __init__(self, stub_class, **kwargs: Any):
+        self.stub_class = stub_class
+        self.kwargs = kwargs
+        self.url: Optional[str] = None
+        self._process: Optional[multiprocessing.Process] = None
+
+    def __enter__(self) -> "StubProcess":
+        parent_conn, child_conn = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_serve, args=(self.stub_class, self.kwargs, child_conn), daemon=True
+        )
+        self._process.start()
+        self.url = parent_conn.recv()
+        return self
+
+    def __exit__(self, *exc):
+        self._process.terminate()
+        self._process.join()
+
+    def stats(self) -> Dict[str, int]:
+        """The child's StubHTTPServer.stats"""
+        with urllib.request.urlopen(f"{self.url}/stub/stats") as response:
+            return json.loads(response.read())
+
+
+class StubRPCServer(StubHTTPServer):
+    """
+    JSON-RPC node serving `certificates` canned certificates from any contract address
+    multicall: whether Multicall3 has code, as on Sepolia; a fresh Hardhat node has none
+    error_code: answer every request with this JSON-RPC error (429, -32005, ...)
+    records: {student_id: (certHash hex, ipfsCID)} overriding the canned hash and CID, so
+    reads can be checked against real payloads
+    tail_delay, tail_fraction: see StubHTTPServer
+    Raw transactions are taken as one sender's: each is mined, successfully, once every
+    lower nonce is, so pending and latest transaction counts are the same
+    """
+
+    def __init__(
+        self,
+        delay: float = 0.0,
+        multicall: bool = True,
+        error_code: Optional[int] = None,
+        certificates: int = 1000,
+        records: Optional[Dict[str, Tuple[str, str]]] = None,
+        **latency: float
+    ):
+        super().__init__(self._handle_http, delay, **latency)
+        self.multicall = multicall
+        self.error_code = error_code
+        self.certificates = certificates
+        self.records = {
+            student_id: (bytes.fromhex(cert_hash.removeprefix("0x")), cid)
+            for student_id, (cert_hash, cid) in (records or {}).items()
+        }
+        self.methods: Counter = Counter()
+        self.nonce = 0
+        # Accepted transaction hashes by nonce, waiting for the nonces below them
+        self.queued: Dict[int, str] = {}
+        self.receipts: Dict[str, Dict] = {}
+
+    def _handle_http(self, path: str, body: bytes, headers: Dict[str, str]) -> tuple:
+        request = json.loads(body)
+        if isinstance(request, list):
+            response = [self._handle(item) for item in request]
+        else:
+            response = self._handle(request)
+        return 200, "application/json", json.dumps(response).encode()
+
+    def _handle(self, request: Dict) -> Dict:
+        method, params = request["method"], request.get("params", [])
+        with self._lock:
+            self.methods[method] += 1
+        response = {"jsonrpc": "2.0", "id": request.get("id")}
+        if self.error_code is not None:
+            response["error"] = {"code": self.error_code, "message": "rate limited"}
+            return response
+        try:
+            response["result"] = self.rpc(method, params)
+        except ValueError as e:
+            if method == "eth_sendRawTransaction":
+                response["error"] = {"code": -32000, "message": str(e)}
+            else:
+                response["error"] = {"code": 3, "message": f"execution reverted: {e}"}
+        return response
+
+    def rpc(self, method: str, params: List[Any]) -> Any:
+        if method == "eth_chainId":
+            return hex(CHAIN_ID)
+        if method == "eth_blockNumber":
+            return "0x1"
+        if method == "eth_getCode":
+            is_multicall = params[0].lower() == MULTICALL3_ADDRESS.lower()
+            return "0x6080" if self.multicall or not is_multicall else "0x"
+        if method == "eth_call":
+            return "0x" + self.call(params[0]["to"], bytes.fromhex(params[0]["data"][2:])).hex()
+        if method == "eth_estimateGas":
+            return hex(200000)
+        if method == "eth_gasPrice":
+            return hex(GWEI)
+        if method == "eth_feeHistory":
+            blocks = int(params[0], 16) if isinstance(params[0], str) else params[0]
+            return {
+                "oldestBlock": "0x1",
+                "baseFeePerGas": [hex(GWEI)] * (blocks + 1),
+                "gasUsedRatio": [0.5] * blocks,
+                "reward": [[hex(GWEI)] for _ in range(blocks)]
+            }
+        if method == "eth_getTransactionCount":
+            with self._lock:
+                return hex(self.nonce)
+        if method == "eth_sendRawTransaction":
+            return self.send_raw_transaction(bytes.fromhex(params[0][2:]))
+        if method == "eth_getTransactionReceipt":
+            with self._lock:
+                return self.receipts.get(params[0])
+        raise ValueError(f"unsupported method {method}")
+
+    def send_raw_transaction(self, raw: bytes) -> str:
+        try:
+            nonce = TypedTransaction.from_bytes(HexBytes(raw)).as_dict()["nonce"]
+        except Exception:
+            raise ValueError("rlp: invalid typed transaction")
+        tx_hash = Web3.to_hex(Web3.keccak(raw))
+        with self._lock:
+            if nonce < self.nonce:
+                raise ValueError("nonce too low")
+            self.queued[nonce] = tx_hash
+            while self.nonce in self.queued:
+                mined = self.queued.pop(self.nonce)
+                self.receipts[mined] = {
+                    "transactionHash": mined,
+                    "blockNumber": hex(self.nonce + 1),
+                    "gasUsed": hex(150000),
+                    "status": "0x1"
+                }
+                self.nonce += 1
+        return tx_hash
+
+    def call(self, to: str, data: bytes) -> bytes:
+        if to.lower() == MULTICALL3_ADDRESS.lower():
+            if not self.multicall:
+                return b""
+            (calls,) = abi_decode(["(address,bool,bytes)[]"], data[4:])
+            results = []
+            for _, _, call_data in calls:
+                try:
+                    results.append((True, self.view_call(call_data)))
+                except ValueError:
+                    results.append((False, b""))
+            return abi_encode(["(bool,bytes)[]"], [results])
+        return self.view_call(data)
+
+    def view_call(self, data: bytes) -> bytes:
+        name = SELECTORS.get(data[:4])
+        if name is None:
+            raise ValueError("unknown selector")
+        args = abi_decode(INPUT_TYPES[name], data[4:])
+        return abi_encode(OUTPUT_TYPES[name], self.view(name, args))
+
+    def _exists(self, student_id: str) -> bool:
+        return student_id.startswith("NIM") and student_id[3:].isdigit() and int(student_id[3:]) < self.certificates
+
+    def _record(self, student_id: str) -> Tuple[bytes, str]:
+        return self.records.get(student_id) or (Web3.keccak(text=student_id), "Qm" + "a" * 44)
+
+    def view(self, name: str, args: tuple) -> tuple:
+        """Canned answers: students NIM0 .. NIM<certificates - 1> hold valid certificates"""
+        if name in ("certificateExistsFor", "isCertificateValid"):
+            return (self._exists(args[0]),)
+        if name == "isIssuer":
+            return (args[0].lower() == ISSUER,)
+        if name == "getIssuerList":
+            return ([ISSUER],)
+        if name == "getCertificateCount":
+            return (self.certificates,)
+        if name == "getCertificate":
+            if not self._exists(args[0]):
+                raise ValueError("Certificate does not exist")
+            return (
+                args[0], *self._record(args[0]), [ISSUER],
+                1, 0, True, 1700000000, 1700000000, "", False
+            )
+        if name == "getCertificatesPage":
+            offset, limit = args
+            ids = [f"NIM{i}" for i in range(offset, min(offset + limit, self.certificates))]
+            records = [self._record(student_id) for student_id in ids]
+            return (
+                ids,
+                [cert_hash for cert_hash, _ in records],
+                [cid for _, cid in records],
+                [True] * len(ids),
+                [1700000000] * len(ids),
+                [1700000000] * len(ids),
+                [""] * len(ids)
+            )
+        raise ValueError(f"{name} is not stubbed")
+
+
+def parse_multipart(body: bytes, content_type: str) -> List[Tuple[str, bytes]]:
+    """(filename, content) of every part of a multipart/form-data body"""
+    boundary = content_type.split("boundary=", 1)[1].strip('"').encode()
+    files = []
+    for part in body.split(b"--" + boundary)[1:-1]:
+        head, _, content = part[2:].partition(b"\r\n\r\n")
+        disposition = next(
+            line for line in head.decode().split("\r\n") if line.lower().startswith("content-disposition")
+        )
+        filename = disposition.split('filename="', 1)[1].split('"', 1)[0] if 'filename="' in disposition else ""
+        files.append((filename, content[:-2]))
+    return files
+
+
+class StubIPFSServer(StubHTTPServer):
+    """
+    Kubo HTTP API stand-in keeping added blocks in memory
+    /api/v0/add answers with real CIDs (compute_cid) in Kubo's NDJSON; /api/v0/cat serves
+    added content; /api/v0/pin/add always succeeds
+    """
+
+    def __init__(self, delay: float = 0.0, **latency: float):
+        super().__init__(self._handle_http, delay, **latency)
+        self.blocks: Dict[str, bytes] = {}
+        self.adds = 0
+
+    def _handle_http(self, path: str, body: bytes, headers: Dict[str, str]) -> tuple:
+        url = urlsplit(path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path == "/api/v0/add":
+            content_type = next(value for key, value in headers.items() if key.lower() == "content-type")
+            return self.add(parse_multipart(body, content_type), query)
+        if url.path == "/api/v0/cat":
+            content = self.blocks.get(query.get("arg", ""))
+            if content is None:
+                return 500, "application/json", b'{"Message": "block not found", "Code": 0, "Type": "error"}'
+            return 200, "application/octet-stream", content
+        if url.path == "/api/v0/pin/add":
+            return 200, "application/json", json.dumps({"Pins": [query.get("arg")]}).encode()
+        return 404, "text/plain", b"404 page not found"
+
+    def add(self, files: List[Tuple[str, bytes]], query: Dict[str, str]) -> tuple:
+        cid_version = int(query.get("cid-version", "0"))
+        lines = []
+        with self._lock:
+            self.adds += 1
+            for filename, content in files:
+                cid = compute_cid(content, cid_version)
+                self.blocks[cid] = content
+                lines.append({"Name": filename, "Hash": cid, "Size": str(len(content))})
+        if query.get("wrap-with-directory") == "true":
+            listing = "\n".join(f"{line['Name']} {line['Hash']}" for line in lines).encode()
+            lines.append({"Name": "", "Hash": compute_cid(listing, cid_version), "Size": str(len(listing))})
+        return 200, "application/x-ndjson", "".join(json.dumps(line) + "\n" for line in lines).encode()
@@ -0,0 +1,91 @@
+"""
+Round trips and latency of the /verify chain reads: the three sequential calls the route
+used to make (certificateExistsFor, isCertificateValid, getCertificate) against the
+single batched get_certificate_state
+
+    python -m benchmarks.verify_round_trips                      # stub node, 20 ms per request
+    python -m benchmarks.verify_round_trips --no-multicall       # stub node like a fresh Hardhat
+    python -m benchmarks.verify_round_trips --rpc-url http://127.0.0.1:8545 \\
+        --contract 0x... --student-id NIM123                     # local Hardhat node
+
+Run from be/.
+"""
+import argparse
+import os
+import statistics
+import time
+from contextlib import nullcontext
+
+from benchmarks.stubs import StubProcess, StubRPCServer
+
+
+def count_round_trips(service) -> dict:
+    """Wrap the service's provider so every HTTP round trip is counted"""
+    counter = {"requests": 0}
+    provider = service.w3.provider
+    make_request, make_batch_request = provider.make_request, provider.make_batch_request
+
+    def counted_request(method, params):
+        counter["requests"] += 1
+        return make_request(method, params)
+
+    def counted_batch_request(requests):
+        counter["requests"] += 1
+        return make_batch_request(requests)
+
+    provider.make_request = counted_request
+    provider.make_batch_request = counted_batch_request
+    return counter
+
+
+def sequential_reads(service, student_id: str) -> bool:
+    if not service.certificate_exists(student_id):
+        return False
+    service.is_certificate_valid(student_id)
+    return service.get_certificate(student_id) is not None
+
+
+def batched_read(service, student_id: str) -> bool:
+    return service.get_certificate_state(student_id)["exists"]
+
+
+def measure(name: str, read, service, counter: dict, student_id: str, requests: int) -> None:
+    read(service, student_id)
+    counter["requests"] = 0
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        found = read(service, student_id)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    print(
+        f"{name:<12} found={found!s:<5} round trips/verify={counter['requests'] / requests:.1f}  "
+        f"mean={statistics.mean(latencies) * 1000:.1f} ms  p95={latencies[int(0.95 * len(latencies))] * 1000:.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rpc-url", help="node to read from; a stub node is started when omitted")
+    parser.add_argument("--contract", default=os.getenv("CONTRACT_ADDRESS", "0x" + "22" * 20))
+    parser.add_argument("--student-id", default="NIM1")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--delay", type=float, default=0.02, help="stub node latency per request (s)")
+    parser.add_argument("--no-multicall", action="store_true", help="stub node without Multicall3")
+    args = parser.parse_args()
+
+    stub = None if args.rpc_url else StubProcess(StubRPCServer, delay=args.delay, multicall=not args.no_multicall)
+    with stub or nullcontext():
+        os.environ["SEPOLIA_URLS"] = args.rpc_url or stub.url
+        os.environ["CONTRACT_ADDRESS"] = args.contract
+
+        from app.services.read_contract import ContractService
+        service = ContractService()
+        counter = count_round_trips(service)
+        print(f"Multicall3 deployed: {service.multicall_deployed()}")
+        measure("sequential", sequential_reads, service, counter, args.student_id, args.requests)
+        measure("batched", batched_read, service, counter, args.student_id, args.requests)
+
+
+if __name__ == "__main__":
+    main()
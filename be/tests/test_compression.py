@@ -0,0 +1,54 @@
+import os
+import struct
+
+import pytest
+import zstandard
+
+from app.services.compression import MAX_DECOMPRESSED_SIZE, LimitedDecompressor
+
+def zero_stream_frame(size: int) -> bytes:
+    """A frame of `size` zero bytes written in chunks, so its header has no content size"""
+    compressor = zstandard.ZstdCompressor(write_checksum=False).compressobj()
+    chunk = b'\0' * (1024 * 1024)
+    frame = b''.join(compressor.compress(chunk) for _ in range(size // len(chunk)))
+    return frame + compressor.flush()
+
+def test_round_trip_in_small_pieces():
+    data = os.urandom(1000) * 500
+    frame = zstandard.ZstdCompressor(write_checksum=False).compress(data)
+    decompressor = LimitedDecompressor(None)
+    out = b''.join(decompressor.update(frame[i:i + 7]) for i in range(0, len(frame), 7))
+    assert out + decompressor.finalize() == data
+
+def test_truncated_frame_is_rejected():
+    frame = zstandard.ZstdCompressor(write_checksum=False).compress(os.urandom(100000))
+    decompressor = LimitedDecompressor(None)
+    decompressor.update(frame[:-20])
+    with pytest.raises(ValueError, match="truncated"):
+        decompressor.finalize()
+
+def test_high_ratio_frame_without_size_is_rejected_before_output():
+    frame = zero_stream_frame(1024 * 1024 * 1024)
+    assert len(frame) < 64 * 1024
+    decompressor = LimitedDecompressor(None)
+    with pytest.raises(ValueError, match="does not declare its size"):
+        decompressor.update(frame)
+    assert decompressor._sink is None
+
+def test_high_ratio_frame_over_limit_is_rejected_before_output():
+    frame = zstandard.ZstdCompressor(write_checksum=False).compress(b'\0' * (MAX_DECOMPRESSED_SIZE + 1))
+    assert len(frame) < 64 * 1024
+    decompressor = LimitedDecompressor(None)
+    with pytest.raises(ValueError, match="too large"):
+        decompressor.update(frame)
+    assert decompressor._sink is None
+
+def test_frame_understating_its_size_stops_at_declared_size():
+    frame = bytearray(zstandard.ZstdCompressor(write_checksum=False).compress(b'\0' * (8 * 1024 * 1024)))
+    # Descriptor 0x80: 4-byte content size right after the window descriptor
+    assert frame[4] == 0x80
+    frame[6:10] = struct.pack('<I', 1000)
+    decompressor = LimitedDecompressor(None)
+    with pytest.raises(ValueError, match="Decryption failed"):
+        decompressor.update(bytes(frame))
+    assert decompressor._sink.size <= 1000
@@ -0,0 +1,124 @@
+import base64
+import os
+
+import pytest
+from Crypto.Cipher import AES
+from Crypto.Util.Padding import pad
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.compression_dictionary import CompressionDictionary
+from app.services.compression import CompressionService
+from app.services.encryption import (
+    HEADER_SIZE, TAG_SIZE, AESEncryptionService, EnvelopeEncryptor, encrypt_envelope, envelope_dictionary
+)
+
+# Small frames, so test payloads span several without megabytes of data
+CHUNK_SIZE = 1024
+FRAME_SIZE = CHUNK_SIZE + TAG_SIZE
+TEMPLATE = (
+    "Ijazah {degree}\nDiberikan kepada {student_name} (NIM {student_id}), lahir di {birth_place} "
+    "pada {birth_date}, yang telah menyelesaikan seluruh persyaratan akademik.\nBandung, {issue_date}\n"
+)
+
+@pytest.fixture
+def key():
+    return AESEncryptionService.generate_key()
+
+@pytest.fixture
+def compression():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    CompressionDictionary.__table__.create(engine)
+    service = CompressionService(sessionmaker(bind=engine))
+    service.enabled = True
+    service.train({"ijazah:1": TEMPLATE})
+    return service
+
+def seal(data: bytes, key: str) -> bytes:
+    return encrypt_envelope(data, base64.b64decode(key), chunk_size=CHUNK_SIZE)
+
+def stream(data: bytes, key: str, compression=None, piece: int = 700) -> bytes:
+    decryptor = AESEncryptionService.decryptor(key, compression)
+    out = b''.join(decryptor.update(data[i:i + piece]) for i in range(0, len(data), piece))
+    return out + decryptor.finalize()
+
+def frames(envelope: bytes) -> list:
+    body = envelope[HEADER_SIZE:]
+    return [body[i:i + FRAME_SIZE] for i in range(0, len(body), FRAME_SIZE)]
+
+@pytest.mark.parametrize("size", [0, 1, CHUNK_SIZE, 5 * CHUNK_SIZE + 3])
+def test_v1_round_trip(key, size):
+    data = os.urandom(size)
+    for envelope in (AESEncryptionService.encrypt(data, key), seal(data, key)):
+        assert envelope_dictionary(envelope) is None
+        assert AESEncryptionService.decrypt(envelope, key) == data
+        assert stream(envelope, key) == data
+
+def test_incremental_encryptor_matches_whole_buffer_format(key):
+    data = os.urandom(3 * CHUNK_SIZE + 10)
+    encryptor = EnvelopeEncryptor(base64.b64decode(key), CHUNK_SIZE)
+    envelope = b''.join(encryptor.update(data[i:i + 300]) for i in range(0, len(data), 300)) + encryptor.finalize()
+    assert len(frames(envelope)) == 4
+    assert AESEncryptionService.decrypt(envelope, key) == data
+
+def test_v2_round_trip(key, compression):
+    data = TEMPLATE.format(
+        degree="Teknik Informatika", student_name="Budi Santoso", student_id="13522150",
+        birth_place="Bandung", birth_date="1 Januari 2003", issue_date="1 Juli 2026"
+    ).encode() * 40
+    envelope = AESEncryptionService.encrypt(data, key, compression)
+    assert envelope_dictionary(envelope) == compression.current().dict_id
+    assert len(envelope) < len(data)
+    assert AESEncryptionService.decrypt(envelope, key, compression) == data
+    assert stream(envelope, key, compression) == data
+    with pytest.raises(ValueError, match="compressed with dictionary"):
+        AESEncryptionService.decrypt(envelope, key)
+
+def test_legacy_cbc_still_decrypts(key):
+    data = os.urandom(3000)
+    iv = os.urandom(16)
+    blob = iv + AES.new(base64.b64decode(key), AES.MODE_CBC, iv).encrypt(pad(data, AES.block_size))
+    assert AESEncryptionService.decrypt(blob, key) == data
+    assert stream(blob, key) == data
+
+def test_flipped_byte_is_rejected_before_its_frame_is_released(key):
+    data = os.urandom(4 * CHUNK_SIZE + 100)
+    envelope = bytearray(seal(data, key))
+    envelope[HEADER_SIZE + 2 * FRAME_SIZE + 5] ^= 0x01
+
+    with pytest.raises(ValueError, match="frame 2 failed authentication"):
+        AESEncryptionService.decrypt(bytes(envelope), key)
+
+    decryptor = AESEncryptionService.decryptor(key)
+    released = b''
+    with pytest.raises(ValueError, match="frame 2 failed authentication"):
+        for i in range(0, len(envelope), 100):
+            released += decryptor.update(bytes(envelope[i:i + 100]))
+    # Frames 0 and 1 authenticated; not one byte of the tampered frame came out
+    assert released == data[:2 * CHUNK_SIZE]
+
+def test_flipped_header_byte_rejects_the_first_frame(key):
+    envelope = bytearray(seal(os.urandom(2 * CHUNK_SIZE), key))
+    envelope[12] ^= 0x01
+    decryptor = AESEncryptionService.decryptor(key)
+    with pytest.raises(ValueError, match="frame 0 failed authentication"):
+        decryptor.update(bytes(envelope))
+
+@pytest.mark.parametrize("cut", [FRAME_SIZE, 10], ids=["final-frame-dropped", "final-frame-short"])
+def test_truncated_envelope_is_rejected(key, cut):
+    envelope = seal(os.urandom(3 * CHUNK_SIZE + 50), key)
+    truncated = envelope[:-cut]
+    with pytest.raises(ValueError, match="Decryption failed"):
+        AESEncryptionService.decrypt(truncated, key)
+    with pytest.raises(ValueError, match="Decryption failed"):
+        stream(truncated, key)
+
+def test_reordered_frames_are_rejected(key):
+    envelope = seal(os.urandom(3 * CHUNK_SIZE + 50), key)
+    first, second, *rest = frames(envelope)
+    reordered = envelope[:HEADER_SIZE] + second + first + b''.join(rest)
+    with pytest.raises(ValueError, match="frame 0 failed authentication"):
+        AESEncryptionService.decrypt(reordered, key)
+    with pytest.raises(ValueError, match="frame 0 failed authentication"):
+        stream(reordered, key)
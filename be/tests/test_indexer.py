@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+import pytest
+from web3 import Web3
+
+from app.services.indexer import CertificateIndexer
+from app.services.read_contract import CONTRACT_ABI
+
+CONTRACT = Web3().eth.contract(address="0x" + "22" * 20, abi=CONTRACT_ABI)
+
+class StubEth:
+    def __init__(self, calldata=None, error=None):
+        self.calldata = calldata
+        self.error = error
+
+    def get_transaction(self, tx_hash):
+        if self.error:
+            raise self.error
+        return {"input": self.calldata}
+
+def indexer(eth: StubEth) -> CertificateIndexer:
+    return CertificateIndexer(SimpleNamespace(
+        w3=SimpleNamespace(eth=eth),
+        contract=CONTRACT,
+        contract_abi=CONTRACT_ABI
+    ))
+
+def test_proposal_is_decoded_from_calldata():
+    calldata = CONTRACT.encode_abi(
+        "proposeCertificate",
+        args=["NIM1", b"\1" * 32, "Qm", ["0x" + "11" * 20], b"", False]
+    )
+    proposal = indexer(StubEth(calldata))._decode_proposal(b"\0" * 32)
+    assert proposal["studentId"] == "NIM1"
+    assert proposal["requiresAllSignatures"] is False
+
+def test_rpc_error_is_raised_so_the_range_is_retried():
+    with pytest.raises(TimeoutError):
+        indexer(StubEth(error=TimeoutError("read timed out")))._decode_proposal(b"\0" * 32)
+
+@pytest.mark.parametrize("calldata", [
+    "0xdeadbeef",
+    CONTRACT.encode_abi("proposeCertificate", args=["NIM1", b"\1" * 32, "Qm", [], b"", True])[:40],
+    CONTRACT.encode_abi("signCertificateIssuance", args=["NIM1", b""]),
+])
+def test_undecodable_calldata_gives_an_empty_proposal(calldata):
+    assert indexer(StubEth(calldata))._decode_proposal(b"\0" * 32) == {}
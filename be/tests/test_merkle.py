@@ -0,0 +1,41 @@
+import hashlib
+import json
+from pathlib import Path
+
+import pytest
+
+from app.services.merkle import MerkleTree, cohort_leaf, verify_proof
+
+# blockchain/test/Cohort.js checks these roots and proofs against DiplomaContract._processProof
+FIXTURE = Path(__file__).resolve().parents[2] / "blockchain" / "test" / "fixtures" / "cohort-merkle.json"
+SIZES = [1, 2, 3, 5, 7, 13]
+
+def cohort_vectors() -> dict:
+    trees = []
+    for size in SIZES:
+        students = [
+            {"studentId": f"1352{size:02d}{i:02d}", "certHash": "0x" + hashlib.sha256(f"ijazah {size} {i}".encode()).hexdigest()}
+            for i in range(size)
+        ]
+        leaves = [cohort_leaf(student["studentId"], student["certHash"]) for student in students]
+        tree = MerkleTree(leaves)
+        trees.append({
+            "size": size,
+            "students": students,
+            "leaves": ["0x" + leaf.hex() for leaf in leaves],
+            "root": "0x" + tree.root.hex(),
+            "proofs": [["0x" + sibling.hex() for sibling in tree.proof(i)] for i in range(size)],
+        })
+    return {"trees": trees}
+
+def test_fixture_matches_merkle_py():
+    # Regenerate with: python -c "import json, tests.test_merkle as t; t.FIXTURE.write_text(json.dumps(t.cohort_vectors(), indent=2) + '\n')"
+    assert json.loads(FIXTURE.read_text()) == cohort_vectors()
+
+@pytest.mark.parametrize("size", SIZES)
+def test_every_proof_verifies_and_a_wrong_leaf_does_not(size):
+    leaves = [cohort_leaf(f"NIM{i}", hashlib.sha256(str(i).encode()).hexdigest()) for i in range(size)]
+    tree = MerkleTree(leaves)
+    for index, leaf in enumerate(leaves):
+        assert verify_proof(leaf, tree.proof(index), tree.root)
+    assert not verify_proof(cohort_leaf("NIM0", "00" * 32), tree.proof(0), tree.root)
@@ -0,0 +1,62 @@
+import asyncio
+import hashlib
+import tracemalloc
+
+import pytest
+
+from app.services.encryption import AESEncryptionService
+from app.services.payload_stream import PayloadStreamService
+
+CHUNK = bytes(range(256)) * 256
+
+class StubIPFS:
+    """Serves an envelope of `size` plaintext bytes, encrypted as it is read"""
+
+    def __init__(self, key: str, size: int):
+        self.key = key
+        self.size = size
+
+    async def iter_file(self, cid: str):
+        encryptor = AESEncryptionService.encryptor(self.key)
+        remaining = self.size
+        while remaining:
+            chunk = CHUNK[:min(remaining, len(CHUNK))]
+            remaining -= len(chunk)
+            encrypted = encryptor.update(chunk)
+            if encrypted:
+                yield encrypted
+        yield encryptor.finalize()
+
+def expected_digest(size: int) -> str:
+    digest = hashlib.sha256()
+    remaining = size
+    while remaining:
+        chunk = CHUNK[:min(remaining, len(CHUNK))]
+        remaining -= len(chunk)
+        digest.update(chunk)
+    return digest.hexdigest()
+
+def download_peak(size: int):
+    key = AESEncryptionService.generate_key()
+    tracemalloc.start()
+    try:
+        spool, digest, length = asyncio.run(
+            PayloadStreamService.download_decrypt(StubIPFS(key, size), AESEncryptionService, "cid", key)
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    spool.close()
+    return peak, digest, length
+
+@pytest.mark.parametrize("size", [1024, 50 * 1024 * 1024], ids=["1KB", "50MB"])
+def test_download_decrypt_digest(size):
+    _, digest, length = download_peak(size)
+    assert length == size
+    assert digest == expected_digest(size)
+
+def test_download_decrypt_memory_is_flat():
+    small, _, _ = download_peak(1024)
+    large, _, _ = download_peak(50 * 1024 * 1024)
+    # The spool holds at most PAYLOAD_SPOOL_MEMORY_BYTES (1 MiB) before spilling to disk
+    assert large - small < 4 * 1024 * 1024
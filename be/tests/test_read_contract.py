@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from app.services.async_read_contract import AsyncContractService
+from app.services.read_contract import ContractService
+from benchmarks.stubs import StubRPCServer
+
+@pytest.fixture(params=[True, False], ids=["multicall", "no-multicall"])
+def node(request, monkeypatch):
+    with StubRPCServer(multicall=request.param) as stub:
+        monkeypatch.setenv("SEPOLIA_URLS", stub.url)
+        monkeypatch.setenv("CONTRACT_ADDRESS", "0x" + "22" * 20)
+        yield stub
+
+def test_certificate_state_in_one_round_trip(node):
+    service = ContractService()
+    assert service.multicall_deployed() == node.multicall
+    before = node.requests
+    state = service.get_certificate_state("NIM1")
+    assert node.requests - before == 1
+    assert state["exists"] and state["isValid"] and state["certificate"]["studentId"] == "NIM1"
+
+def test_missing_certificate_is_not_an_error(node):
+    state = ContractService().get_certificate_state("NIM99999")
+    assert state == {"exists": False, "isValid": False, "certificate": None}
+
+def test_async_certificate_states_in_one_round_trip(node):
+    async def read():
+        service = AsyncContractService()
+        await service.multicall_deployed()
+        before = node.requests
+        states = await service.get_certificate_states(["NIM1", "NIM2", "NIM99999"])
+        await service.close()
+        return node.requests - before, states
+
+    round_trips, states = asyncio.run(read())
+    assert round_trips == 1
+    assert states["NIM1"]["exists"] and states["NIM2"]["certificate"]["studentId"] == "NIM2"
+    assert states["NIM99999"] == {"exists": False, "isValid": False, "certificate": None}
@@ -0,0 +1,160 @@
+import asyncio
+import time
+
+import pytest
+from web3 import Web3
+
+from app.services.async_read_contract import AsyncContractService
+from app.services.relayer import TransactionRelayer, issued_on_proposal
+
+GWEI = 10 ** 9
+
+class StubNode:
+    """make_batch_request / make_request stand-ins answering eth_sendRawTransaction per nonce"""
+
+    def __init__(self, errors=None, transaction_count=0):
+        # {index in the batch: error message}
+        self.errors = errors or {}
+        self.transaction_count = transaction_count
+        self.batches = []
+
+    async def make_batch_request(self, requests):
+        self.batches.append(requests)
+        return [
+            {"jsonrpc": "2.0", "id": i, "error": {"code": -32000, "message": self.errors[i]}}
+            if i in self.errors else
+            {"jsonrpc": "2.0", "id": i, "result": "0x" + "ab" * 32}
+            for i, _ in enumerate(requests)
+        ]
+
+    async def make_request(self, method, params):
+        assert method == "eth_getTransactionCount"
+        return {"jsonrpc": "2.0", "id": 0, "result": hex(self.transaction_count)}
+
+@pytest.fixture
+def relayer(monkeypatch):
+    monkeypatch.setenv("RELAYER_PRIVATE_KEY", "0x" + "01" * 32)
+    monkeypatch.setenv("SEPOLIA_URLS", "http://127.0.0.1:9")
+    monkeypatch.setenv("CONTRACT_ADDRESS", "0x" + "22" * 20)
+    relayer = TransactionRelayer(AsyncContractService())
+    relayer.chain_id = 31337
+    relayer._fees = {"maxFeePerGas": 30 * GWEI, "maxPriorityFeePerGas": 2 * GWEI}
+    relayer._fees_at = time.monotonic()
+    return relayer
+
+def use_node(relayer, node):
+    relayer.w3.provider.make_batch_request = node.make_batch_request
+    relayer.w3.provider.make_request = node.make_request
+
+async def send(relayer, count):
+    """Queue `count` calls the way _next_batch hands them to _send_batch"""
+    relayer._slots = asyncio.Semaphore(count)
+    loop = asyncio.get_running_loop()
+    items = []
+    for i in range(count):
+        await relayer._slots.acquire()
+        items.append({
+            "function": "signCertificateIssuance",
+            "student_id": f"NIM{i}",
+            "data": "0x",
+            "gas": 200000,
+            "future": loop.create_future()
+        })
+    await relayer._send_batch(items)
+    await relayer.contract_service.close()
+    return items
+
+def test_released_nonces_roll_back_and_are_reused(relayer):
+    relayer._nonce = 10
+    assert [relayer._allocate_nonce() for _ in range(3)] == [10, 11, 12]
+
+    # A gap below the top stays free and is handed out before a new nonce
+    relayer._release_nonce(11)
+    assert relayer._nonce == 13 and relayer._free_nonces == {11}
+    assert relayer._allocate_nonce() == 11
+    assert relayer._allocate_nonce() == 13
+
+    # Releasing the top rolls the counter back over every free nonce below it
+    relayer._release_nonce(12)
+    relayer._release_nonce(13)
+    assert relayer._nonce == 12 and relayer._free_nonces == set()
+    relayer._release_nonce(10)
+    relayer._release_nonce(11)
+    assert relayer._nonce == 10 and relayer._free_nonces == set()
+
+def test_mid_batch_rejection_requeues_later_items(relayer):
+    relayer._nonce = 10
+    node = StubNode(errors={1: "insufficient funds for gas * price + value", 2: "nonce too high"})
+    use_node(relayer, node)
+    accepted, rejected, later = asyncio.run(send(relayer, 3))
+
+    assert len(node.batches) == 1 and len(node.batches[0]) == 3
+    assert accepted["future"].result()["nonce"] == 10
+    assert "insufficient funds" in str(rejected["future"].exception())
+    # Nonce 12 was refused for the gap at 11, so it is signed again next batch
+    assert not later["future"].done()
+    assert list(relayer._retry) == [later]
+    assert relayer._nonce == 11 and relayer._free_nonces == set()
+    assert list(relayer._pending) == [10]
+    # The accepted transaction keeps its slot until mined
+    assert relayer._slots._value == 2
+    assert relayer.counters["resyncs"] == 0
+
+def test_gap_left_by_a_rejection_is_filled(relayer):
+    relayer._nonce = 10
+    node = StubNode(errors={1: "insufficient funds for gas * price + value"})
+    use_node(relayer, node)
+    _, _, later = asyncio.run(send(relayer, 3))
+
+    # The node queued nonce 12 behind the gap; a self-transfer unblocks it
+    assert later["future"].result()["nonce"] == 12
+    assert relayer._nonce == 13 and relayer._free_nonces == {11}
+
+    node.errors = {}
+    asyncio.run(relayer._fill_gaps())
+    asyncio.run(relayer.contract_service.close())
+    assert relayer._free_nonces == set()
+    assert relayer._pending[11]["function"] == "fillNonce"
+    assert relayer.counters["gaps_filled"] == 1
+
+@pytest.mark.parametrize("pooled, current", [
+    ({"maxFeePerGas": 40 * GWEI, "maxPriorityFeePerGas": 2 * GWEI}, {"maxFeePerGas": 30 * GWEI, "maxPriorityFeePerGas": 1 * GWEI}),
+    ({"maxFeePerGas": 40 * GWEI + 7, "maxPriorityFeePerGas": 7}, {"maxFeePerGas": 0, "maxPriorityFeePerGas": 0}),
+    ({"gasPrice": 15 * GWEI + 1}, {"gasPrice": 10 * GWEI}),
+], ids=["eip1559", "rounding", "legacy"])
+def test_bumped_fees_raise_every_field_by_an_eighth(relayer, pooled, current):
+    bumped = relayer._bumped_fees({"nonce": 3, "gas": 21000, **pooled}, current)
+    assert set(bumped) == set(pooled)
+    for field, value in pooled.items():
+        assert bumped[field] * 8 >= value * 9
+
+def test_bumped_fees_follow_higher_current_fees(relayer):
+    pooled = {"maxFeePerGas": 20 * GWEI, "maxPriorityFeePerGas": 1 * GWEI}
+    current = {"maxFeePerGas": 50 * GWEI, "maxPriorityFeePerGas": 3 * GWEI}
+    assert relayer._bumped_fees(pooled, current) == current
+
+def test_nonce_too_low_resyncs_and_requeues(relayer):
+    relayer._nonce = 5
+    node = StubNode(errors={0: "nonce too low", 1: "nonce too low"}, transaction_count=9)
+    use_node(relayer, node)
+    items = asyncio.run(send(relayer, 2))
+
+    assert not any(item["future"].done() for item in items)
+    assert list(relayer._retry) == items
+    assert relayer._nonce == 9 and relayer._free_nonces == set()
+    assert relayer.counters["resyncs"] == 1
+    assert relayer._slots._value == 2
+
+    # The retried calls are signed again from the node's count
+    node.errors = {}
+    relayer._retry.clear()
+    asyncio.run(send(relayer, 2))
+    assert sorted(relayer._pending) == [9, 10]
+
+def test_relayer_alone_must_not_meet_the_threshold():
+    relayer_wallet, other = "0x" + "01" * 20, "0x" + "02" * 20
+    assert issued_on_proposal([relayer_wallet], True)
+    assert issued_on_proposal([relayer_wallet], False)
+    assert not issued_on_proposal([relayer_wallet, other], True)
+    assert not issued_on_proposal([relayer_wallet, other], False)
+    assert not issued_on_proposal([relayer_wallet, other, Web3.to_checksum_address("0x" + "03" * 20)], False)
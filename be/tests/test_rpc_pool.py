@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.rpc_pool import AsyncPooledHTTPProvider, PooledHTTPProvider
+from benchmarks.stubs import StubRPCServer
+
+HEDGE_DELAY = 0.1
+SLOW_DELAY = 0.6
+
+@pytest.fixture(autouse=True)
+def hedge_delay(monkeypatch):
+    # Fewer than 10 samples per endpoint, so every hedge waits the default delay
+    monkeypatch.setenv("RPC_HEDGE_DEFAULT_DELAY", str(HEDGE_DELAY))
+
+@pytest.fixture
+def slow_and_fast():
+    with StubRPCServer(delay=SLOW_DELAY) as slow, StubRPCServer() as fast:
+        yield slow, fast
+
+def endpoint(provider, stub):
+    return next(endpoint for endpoint in provider.pool.endpoints if endpoint.url == stub.url)
+
+def test_hedge_fires_after_delay_and_fast_endpoint_wins(slow_and_fast):
+    slow, fast = slow_and_fast
+    provider = PooledHTTPProvider([slow.url, fast.url])
+    start = time.perf_counter()
+    response = provider.make_request("eth_blockNumber", [])
+    elapsed = time.perf_counter() - start
+    provider.close()
+
+    assert response["result"] == "0x1"
+    assert HEDGE_DELAY <= elapsed < SLOW_DELAY
+    assert fast.requests == 1 and slow.requests == 1
+    assert endpoint(provider, fast).hedges_sent == 1
+    assert endpoint(provider, fast).hedges_won == 1
+
+def test_async_hedge_abandons_the_cancelled_loser(slow_and_fast):
+    slow, fast = slow_and_fast
+
+    async def hedged():
+        provider = AsyncPooledHTTPProvider([slow.url, fast.url])
+        start = time.perf_counter()
+        response = await provider.make_request("eth_blockNumber", [])
+        elapsed = time.perf_counter() - start
+        # Let the cancelled leg run its CancelledError handler
+        await asyncio.sleep(0.05)
+        await provider.disconnect()
+        return provider, response, elapsed
+
+    provider, response, elapsed = asyncio.run(hedged())
+    assert response["result"] == "0x1"
+    assert HEDGE_DELAY <= elapsed < SLOW_DELAY
+    assert endpoint(provider, fast).hedges_won == 1
+
+    loser = endpoint(provider, slow)
+    assert loser.in_flight == 0
+    assert loser.requests == 0 and loser.errors == 0
+
+@pytest.mark.parametrize("error_code", [429, -32005])
+@pytest.mark.parametrize("method", ["eth_call", "eth_sendRawTransaction"], ids=["hedged", "not-hedged"])
+def test_failover_on_rate_limit(error_code, method):
+    with StubRPCServer(error_code=error_code) as limited, StubRPCServer() as healthy:
+        provider = PooledHTTPProvider([limited.url, healthy.url])
+        params = [{"to": "0x" + "22" * 20, "data": "0x"}, "latest"] if method == "eth_call" else ["0x00"]
+        response = provider.make_request(method, params)
+        provider.close()
+
+    assert "error" not in response or response["error"]["code"] != error_code
+    assert limited.requests == 1 and healthy.requests == 1
+    assert endpoint(provider, limited).errors == 1
+    assert endpoint(provider, healthy).errors == 0
+
+@pytest.mark.parametrize("error_code", [429, -32005])
+def test_async_failover_on_rate_limit(error_code):
+    async def request(limited, healthy):
+        provider = AsyncPooledHTTPProvider([limited.url, healthy.url])
+        response = await provider.make_request("eth_blockNumber", [])
+        await provider.disconnect()
+        return provider, response
+
+    with StubRPCServer(error_code=error_code) as limited, StubRPCServer() as healthy:
+        provider, response = asyncio.run(request(limited, healthy))
+
+    assert response["result"] == "0x1"
+    assert endpoint(provider, limited).errors == 1
+    # The rate-limited endpoint now ranks last
+    assert provider.pool.ranked()[0].url == healthy.url
@@ -0,0 +1,45 @@
+import base64
+import hashlib
+
+import pytest
+
+from app.services.unixfs import CHUNK_SIZE, MAX_LINKS, _dag_pb, _unixfs_file, compute_cid
+
+DAG_PB_V1_SHA256 = b"\x01\x70\x12\x20"
+
+# Published by `ipfs add` with Kubo's defaults
+@pytest.mark.parametrize("data, cid_version, cid", [
+    (b"", 0, "QmbFMke1KXqnYyBBWxB74N4c5SBnJMVAiMNRcGu6x1AwQH"),
+    (b"hello world\n", 0, "QmT78zSuBmuS4z925WZfrqQ1qHaJ56DQaTfyMUF7F8ff5o"),
+    (b"hello world\n", 1, "bafkreifjjcie6lypi6ny7amxnfftagclbuxndqonfipmb64f2km2devei4"),
+])
+def test_known_cids(data, cid_version, cid):
+    assert compute_cid(data, cid_version) == cid
+
+def cid_bytes(cid: str) -> bytes:
+    """Binary form of a base32 CIDv1 string"""
+    body = cid[1:].upper()
+    return base64.b32decode(body + "=" * (-len(body) % 8))
+
+def test_more_than_max_links_chunks_add_a_second_level():
+    data = bytes(range(256)) * (CHUNK_SIZE // 256) * (MAX_LINKS + 1)
+    first, last = data[:MAX_LINKS * CHUNK_SIZE], data[MAX_LINKS * CHUNK_SIZE:]
+
+    # Left child: one node over the first 174 raw leaves, i.e. the root of a 174-chunk file
+    first_node = _dag_pb(
+        [(cid_bytes(compute_cid(first[i:i + CHUNK_SIZE], 1)), CHUNK_SIZE) for i in range(0, len(first), CHUNK_SIZE)],
+        _unixfs_file(b"", len(first), [CHUNK_SIZE] * MAX_LINKS)
+    )
+    assert cid_bytes(compute_cid(first, 1)) == DAG_PB_V1_SHA256 + hashlib.sha256(first_node).digest()
+
+    # Right child: the balanced layout keeps every leaf at the same depth, so the 175th
+    # chunk's raw leaf hangs off a one-link node rather than off the root
+    last_node = _dag_pb([(cid_bytes(compute_cid(last, 1)), len(last))], _unixfs_file(b"", len(last), [len(last)]))
+    root = _dag_pb(
+        [
+            (cid_bytes(compute_cid(first, 1)), len(first_node) + len(first)),
+            (DAG_PB_V1_SHA256 + hashlib.sha256(last_node).digest(), len(last_node) + len(last)),
+        ],
+        _unixfs_file(b"", len(data), [len(first), len(last)])
+    )
+    assert cid_bytes(compute_cid(data, 1)) == DAG_PB_V1_SHA256 + hashlib.sha256(root).digest()
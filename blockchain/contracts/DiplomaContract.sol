@@ -26,6 +26,21 @@ contract DiplomaContract {
         bool requiresAllSignatures; // if true, requires all issuers to sign
     }
 
+    // Cohort structure: many certificates anchored by the Merkle root of their leaves,
+    // leaf = keccak256(abi.encode(studentId, certHash)), pairs hashed in sorted order
+    struct Cohort {
+        string cohortId;
+        bytes32 merkleRoot;
+        uint256 size; // number of certificates under the root
+        address[] issuerWallets;
+        mapping(address => bytes) issueSignatures;
+        uint256 issueSignatureCount;
+        bool isValid;
+        uint256 timestampIssued;
+        uint256 timestampLastUpdated;
+        bool requiresAllSignatures;
+    }
+
     // Mappings
     mapping(address => Issuer) private issuers;
     address[] private issuerList;
@@ -34,6 +49,15 @@ contract DiplomaContract {
     mapping(string => bool) private certificateExists; // studentId => exists
     string[] private certificateIds; // Array to store all certificate IDs
 
+    mapping(string => Cohort) private cohorts; // cohortId => Cohort
+    mapping(string => bool) private cohortExists; // cohortId => exists
+    string[] private cohortIds;
+
+    // Revocation of single certificates inside a cohort, keyed by keccak256(cohortId, leaf)
+    mapping(bytes32 => mapping(address => bool)) private cohortRevokeSigned;
+    mapping(bytes32 => uint256) private cohortRevokeSignatureCount;
+    mapping(bytes32 => bool) private cohortRevoked;
+
     // Events
     event IssuerAdded(address indexed walletId, string publicKey);
     event IssuerRemoved(address indexed walletId);
@@ -43,6 +67,11 @@ contract DiplomaContract {
     event CertificateIssued(string indexed studentId, bytes32 certHash, string ipfsCID);
     event CertificateRevokeSigned(string indexed studentId, address indexed issuer, string reason);
     event CertificateRevoked(string indexed studentId, string reason);
+    event CohortProposed(string indexed cohortId, bytes32 merkleRoot, uint256 size, address indexed proposer);
+    event CohortIssueSigned(string indexed cohortId, address indexed issuer);
+    event CohortIssued(string indexed cohortId, bytes32 merkleRoot, uint256 size);
+    event CohortCertificateRevokeSigned(string indexed cohortId, bytes32 indexed leaf, address indexed issuer, string reason);
+    event CohortCertificateRevoked(string indexed cohortId, bytes32 indexed leaf, string studentId, string reason);
 
     // Modifiers
     modifier onlyIssuer() {
@@ -64,6 +93,20 @@ contract DiplomaContract {
         _;
     }
 
+    modifier onlyActiveIssuerForCohort(string memory cohortId) {
+        require(cohortExists[cohortId], "Cohort does not exist");
+        bool isIssuerForCohort = false;
+        Cohort storage cohort = cohorts[cohortId];
+        for (uint i = 0; i < cohort.issuerWallets.length; i++) {
+            if (cohort.issuerWallets[i] == msg.sender) {
+                isIssuerForCohort = true;
+                break;
+            }
+        }
+        require(isIssuerForCohort && issuers[msg.sender].isActive, "Not an authorized issuer for this cohort");
+        _;
+    }
+
     constructor() {
         // Initialize the three default issuers
         address albert = 0x9025bCF725Cce60610030A4824156346fDFAc97c;
@@ -391,6 +434,50 @@ contract DiplomaContract {
         return (studentIds, certHashes, ipfsCIDs, isValids, timestampsIssued, timestampsLastUpdated, revokeReasons);
     }
 
+    /**
+     * @dev Get a page of certificates, in the same layout as getAllCertificates
+     * @param offset Index of the first certificate to return
+     * @param limit Maximum number of certificates to return
+     */
+    function getCertificatesPage(uint256 offset, uint256 limit) external view returns (
+        string[] memory studentIds,
+        bytes32[] memory certHashes,
+        string[] memory ipfsCIDs,
+        bool[] memory isValids,
+        uint256[] memory timestampsIssued,
+        uint256[] memory timestampsLastUpdated,
+        string[] memory revokeReasons
+    ) {
+        if (offset > certificateIds.length) {
+            offset = certificateIds.length;
+        }
+        if (limit > certificateIds.length - offset) {
+            limit = certificateIds.length - offset;
+        }
+        
+        studentIds = new string[](limit);
+        certHashes = new bytes32[](limit);
+        ipfsCIDs = new string[](limit);
+        isValids = new bool[](limit);
+        timestampsIssued = new uint256[](limit);
+        timestampsLastUpdated = new uint256[](limit);
+        revokeReasons = new string[](limit);
+        
+        for (uint i = 0; i < limit; i++) {
+            Certificate storage cert = certificates[certificateIds[offset + i]];
+            
+            studentIds[i] = cert.studentId;
+            certHashes[i] = cert.certHash;
+            ipfsCIDs[i] = cert.ipfsCID;
+            isValids[i] = cert.isValid;
+            timestampsIssued[i] = cert.timestampIssued;
+            timestampsLastUpdated[i] = cert.timestampLastUpdated;
+            revokeReasons[i] = cert.revokeReason;
+        }
+        
+        return (studentIds, certHashes, ipfsCIDs, isValids, timestampsIssued, timestampsLastUpdated, revokeReasons);
+    }
+
     /**
      * @dev Get total number of certificates
      */
@@ -442,4 +529,256 @@ contract DiplomaContract {
         }
         return certificates[studentId].isValid;
     }
+
+    // ========== COHORT MANAGEMENT ==========
+
+    /**
+     * @dev Propose a cohort: one Merkle root standing for many certificates (only issuer can propose)
+     * @param cohortId Cohort identifier, e.g. graduation period
+     * @param merkleRoot Root over cohortLeaf(studentId, certHash) of every certificate
+     * @param size Number of certificates under the root
+     * @param issuerWallets List of issuer wallet addresses who need to sign
+     * @param signature First issuer's signature over the root
+     * @param requiresAllSignatures If true, all issuers must sign; if false, majority is enough
+     */
+    function proposeCohort(
+        string memory cohortId,
+        bytes32 merkleRoot,
+        uint256 size,
+        address[] memory issuerWallets,
+        bytes memory signature,
+        bool requiresAllSignatures
+    ) external onlyIssuer {
+        require(bytes(cohortId).length > 0, "Invalid cohort ID");
+        require(merkleRoot != bytes32(0), "Merkle root cannot be empty");
+        require(size > 0, "Cohort cannot be empty");
+        require(issuerWallets.length > 0, "At least one issuer required");
+        require(!cohortExists[cohortId], "Cohort already exists");
+
+        bool proposerIsInList = false;
+        for (uint i = 0; i < issuerWallets.length; i++) {
+            require(issuers[issuerWallets[i]].isActive, "One or more issuers are not active");
+            if (issuerWallets[i] == msg.sender) {
+                proposerIsInList = true;
+            }
+        }
+        require(proposerIsInList, "Proposer must be in issuer list");
+
+        Cohort storage cohort = cohorts[cohortId];
+        cohort.cohortId = cohortId;
+        cohort.merkleRoot = merkleRoot;
+        cohort.size = size;
+        cohort.issuerWallets = issuerWallets;
+        cohort.issueSignatureCount = 1;
+        cohort.isValid = false;
+        cohort.timestampIssued = block.timestamp;
+        cohort.timestampLastUpdated = block.timestamp;
+        cohort.requiresAllSignatures = requiresAllSignatures;
+        cohort.issueSignatures[msg.sender] = signature;
+
+        cohortExists[cohortId] = true;
+        cohortIds.push(cohortId);
+
+        emit CohortProposed(cohortId, merkleRoot, size, msg.sender);
+        emit CohortIssueSigned(cohortId, msg.sender);
+
+        _checkAndIssueCohort(cohortId);
+    }
+
+    /**
+     * @dev Sign a cohort for issuance (only authorized issuers can sign)
+     * @param cohortId Cohort identifier
+     * @param signature ECDSA signature from the issuer over the root
+     */
+    function signCohortIssuance(
+        string memory cohortId,
+        bytes memory signature
+    ) external onlyActiveIssuerForCohort(cohortId) {
+        Cohort storage cohort = cohorts[cohortId];
+        require(!cohort.isValid, "Cohort already issued");
+        require(cohort.issueSignatures[msg.sender].length == 0, "Already signed by this issuer");
+
+        cohort.issueSignatures[msg.sender] = signature;
+        cohort.issueSignatureCount++;
+        cohort.timestampLastUpdated = block.timestamp;
+
+        emit CohortIssueSigned(cohortId, msg.sender);
+
+        _checkAndIssueCohort(cohortId);
+    }
+
+    /**
+     * @dev Internal function to check if a cohort has enough signatures and issue it
+     * @param cohortId Cohort identifier
+     */
+    function _checkAndIssueCohort(string memory cohortId) internal {
+        Cohort storage cohort = cohorts[cohortId];
+
+        bool shouldIssue = false;
+        if (cohort.requiresAllSignatures) {
+            shouldIssue = cohort.issueSignatureCount == cohort.issuerWallets.length;
+        } else {
+            shouldIssue = cohort.issueSignatureCount > cohort.issuerWallets.length / 2;
+        }
+
+        if (shouldIssue && !cohort.isValid) {
+            cohort.isValid = true;
+            cohort.timestampLastUpdated = block.timestamp;
+            emit CohortIssued(cohortId, cohort.merkleRoot, cohort.size);
+        }
+    }
+
+    /**
+     * @dev Sign to revoke one certificate of an issued cohort (only authorized issuers can sign)
+     * @param cohortId Cohort identifier
+     * @param studentId Student NIM or ID
+     * @param certHash Hash of the certificate content
+     * @param proof Merkle proof of the certificate under the cohort root
+     * @param reason Reason for revocation
+     */
+    function signCohortCertificateRevocation(
+        string memory cohortId,
+        string memory studentId,
+        bytes32 certHash,
+        bytes32[] memory proof,
+        string memory reason
+    ) external onlyActiveIssuerForCohort(cohortId) {
+        Cohort storage cohort = cohorts[cohortId];
+        require(cohort.isValid, "Cohort is not issued");
+        bytes32 leaf = cohortLeaf(studentId, certHash);
+        require(_processProof(proof, leaf) == cohort.merkleRoot, "Invalid Merkle proof");
+
+        bytes32 key = keccak256(abi.encode(cohortId, leaf));
+        require(!cohortRevoked[key], "Certificate already revoked");
+        require(!cohortRevokeSigned[key][msg.sender], "Already signed revocation by this issuer");
+
+        cohortRevokeSigned[key][msg.sender] = true;
+        cohortRevokeSignatureCount[key]++;
+
+        emit CohortCertificateRevokeSigned(cohortId, leaf, msg.sender, reason);
+
+        bool shouldRevoke = false;
+        if (cohort.requiresAllSignatures) {
+            shouldRevoke = cohortRevokeSignatureCount[key] == cohort.issuerWallets.length;
+        } else {
+            shouldRevoke = cohortRevokeSignatureCount[key] > cohort.issuerWallets.length / 2;
+        }
+        if (shouldRevoke) {
+            cohortRevoked[key] = true;
+            emit CohortCertificateRevoked(cohortId, leaf, studentId, reason);
+        }
+    }
+
+    /**
+     * @dev Get cohort details
+     * @param cohortId Cohort identifier
+     */
+    function getCohort(string memory cohortId) external view returns (
+        string memory _cohortId,
+        bytes32 merkleRoot,
+        uint256 size,
+        address[] memory issuerWallets,
+        uint256 issueSignatureCount,
+        bool isValid,
+        uint256 timestampIssued,
+        uint256 timestampLastUpdated,
+        bool requiresAllSignatures
+    ) {
+        require(cohortExists[cohortId], "Cohort does not exist");
+        Cohort storage cohort = cohorts[cohortId];
+        return (
+            cohort.cohortId,
+            cohort.merkleRoot,
+            cohort.size,
+            cohort.issuerWallets,
+            cohort.issueSignatureCount,
+            cohort.isValid,
+            cohort.timestampIssued,
+            cohort.timestampLastUpdated,
+            cohort.requiresAllSignatures
+        );
+    }
+
+    /**
+     * @dev Get cohort issue signature for a specific issuer
+     * @param cohortId Cohort identifier
+     * @param issuer Address of the issuer
+     */
+    function getCohortIssueSignature(
+        string memory cohortId,
+        address issuer
+    ) external view returns (bytes memory) {
+        require(cohortExists[cohortId], "Cohort does not exist");
+        return cohorts[cohortId].issueSignatures[issuer];
+    }
+
+    /**
+     * @dev Check if cohort exists
+     * @param cohortId Cohort identifier
+     */
+    function cohortExistsFor(string memory cohortId) external view returns (bool) {
+        return cohortExists[cohortId];
+    }
+
+    /**
+     * @dev Get total number of cohorts
+     */
+    function getCohortCount() external view returns (uint256) {
+        return cohortIds.length;
+    }
+
+    /**
+     * @dev Check if a certificate of a cohort has been revoked
+     * @param cohortId Cohort identifier
+     * @param leaf cohortLeaf(studentId, certHash) of the certificate
+     */
+    function isCohortCertificateRevoked(string memory cohortId, bytes32 leaf) external view returns (bool) {
+        return cohortRevoked[keccak256(abi.encode(cohortId, leaf))];
+    }
+
+    /**
+     * @dev Check a certificate against its cohort: issued, included under the root, not revoked
+     * @param cohortId Cohort identifier
+     * @param studentId Student NIM or ID
+     * @param certHash Hash of the certificate content
+     * @param proof Merkle proof of the certificate under the cohort root
+     */
+    function verifyCohortCertificate(
+        string memory cohortId,
+        string memory studentId,
+        bytes32 certHash,
+        bytes32[] memory proof
+    ) external view returns (bool) {
+        if (!cohortExists[cohortId] || !cohorts[cohortId].isValid) {
+            return false;
+        }
+        bytes32 leaf = cohortLeaf(studentId, certHash);
+        if (_processProof(proof, leaf) != cohorts[cohortId].merkleRoot) {
+            return false;
+        }
+        return !cohortRevoked[keccak256(abi.encode(cohortId, leaf))];
+    }
+
+    /**
+     * @dev Merkle leaf of a certificate
+     * @param studentId Student NIM or ID
+     * @param certHash Hash of the certificate content
+     */
+    function cohortLeaf(string memory studentId, bytes32 certHash) public pure returns (bytes32) {
+        return keccak256(abi.encode(studentId, certHash));
+    }
+
+    /**
+     * @dev Fold a proof into a root, hashing each pair in sorted order
+     */
+    function _processProof(bytes32[] memory proof, bytes32 leaf) internal pure returns (bytes32) {
+        bytes32 computed = leaf;
+        for (uint i = 0; i < proof.length; i++) {
+            bytes32 sibling = proof[i];
+            computed = computed < sibling
+                ? keccak256(abi.encodePacked(computed, sibling))
+                : keccak256(abi.encodePacked(sibling, computed));
+        }
+        return computed;
+    }
 }
\ No newline at end of file
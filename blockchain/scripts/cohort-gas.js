@@ -0,0 +1,141 @@
+// Gas per cohort on a local Hardhat network: one proposeCertificate + signatures per
+// student, against one Merkle cohort root for the same students. Every cohort proof is
+// then checked on chain with verifyCohortCertificate.
+//
+//   npx hardhat run scripts/cohort-gas.js
+//   COHORT_SIZE=1000 SINGLE_SAMPLE=100 npx hardhat run scripts/cohort-gas.js
+//
+// The per-certificate flow is measured on SINGLE_SAMPLE students and scaled to
+// COHORT_SIZE, since its cost is linear in the number of certificates.
+const { ethers, network } = require("hardhat");
+
+const COHORT_SIZE = Number(process.env.COHORT_SIZE || 1000);
+const SINGLE_SAMPLE = Math.min(Number(process.env.SINGLE_SAMPLE || 100), COHORT_SIZE);
+
+// Default issuers set in the DiplomaContract constructor
+const ISSUERS = [
+  "0x9025bCF725Cce60610030A4824156346fDFAc97c",
+  "0xd924c8F1BA5f69292baDD9baf06893D7F90aeBCd",
+  "0xda2486286e253201de026A066f75Bb8B0696E8cD",
+];
+
+// Same leaf and pair hashing as DiplomaContract and be/app/services/merkle.py
+function cohortLeaf(studentId, certHash) {
+  return ethers.keccak256(
+    ethers.AbiCoder.defaultAbiCoder().encode(["string", "bytes32"], [studentId, certHash])
+  );
+}
+
+function hashPair(a, b) {
+  return a < b ? ethers.keccak256(ethers.concat([a, b])) : ethers.keccak256(ethers.concat([b, a]));
+}
+
+function buildTree(leaves) {
+  const levels = [leaves];
+  while (levels[levels.length - 1].length > 1) {
+    const level = levels[levels.length - 1];
+    const parents = [];
+    for (let i = 0; i + 1 < level.length; i += 2) {
+      parents.push(hashPair(level[i], level[i + 1]));
+    }
+    if (level.length % 2) {
+      parents.push(level[level.length - 1]);
+    }
+    levels.push(parents);
+  }
+  return levels;
+}
+
+function proofFor(levels, index) {
+  const proof = [];
+  for (const level of levels.slice(0, -1)) {
+    const sibling = index ^ 1;
+    if (sibling < level.length) {
+      proof.push(level[sibling]);
+    }
+    index = Math.floor(index / 2);
+  }
+  return proof;
+}
+
+async function issuerSigners() {
+  const signers = [];
+  for (const address of ISSUERS) {
+    await network.provider.request({ method: "hardhat_impersonateAccount", params: [address] });
+    await network.provider.request({ method: "hardhat_setBalance", params: [address, "0x56BC75E2D63100000"] });
+    signers.push(await ethers.getSigner(address));
+  }
+  return signers;
+}
+
+async function gasOf(txPromise) {
+  const receipt = await (await txPromise).wait();
+  return receipt.gasUsed;
+}
+
+async function main() {
+  if (network.name !== "hardhat" && network.name !== "localhost") {
+    throw new Error("Run this script on the local Hardhat network only");
+  }
+
+  const Contract = await ethers.getContractFactory("DiplomaContract");
+  const contract = await Contract.deploy();
+  await contract.waitForDeployment();
+  const [proposer, ...cosigners] = await issuerSigners();
+
+  const students = Array.from({ length: COHORT_SIZE }, (_, i) => ({
+    studentId: `135${String(i).padStart(5, "0")}`,
+    certHash: ethers.sha256(ethers.toUtf8Bytes(`ijazah ${i}`)),
+    ipfsCID: `Qm${ethers.sha256(ethers.toUtf8Bytes(`cid ${i}`)).slice(2, 46)}`,
+  }));
+  const signature = () => ethers.hexlify(ethers.randomBytes(65));
+
+  // Per-certificate flow: propose + one signature per remaining issuer
+  let singleGas = 0n;
+  for (const student of students.slice(0, SINGLE_SAMPLE)) {
+    singleGas += await gasOf(contract.connect(proposer).proposeCertificate(
+      student.studentId, student.certHash, student.ipfsCID, ISSUERS, signature(), true
+    ));
+    for (const cosigner of cosigners) {
+      singleGas += await gasOf(contract.connect(cosigner).signCertificateIssuance(student.studentId, signature()));
+    }
+  }
+
+  // Cohort flow: one root, one multisig round
+  const levels = buildTree(students.map((student) => cohortLeaf(student.studentId, student.certHash)));
+  const root = levels[levels.length - 1][0];
+  let cohortGas = await gasOf(contract.connect(proposer).proposeCohort(
+    "cohort-gas", root, students.length, ISSUERS, signature(), true
+  ));
+  for (const cosigner of cosigners) {
+    cohortGas += await gasOf(contract.connect(cosigner).signCohortIssuance("cohort-gas", signature()));
+  }
+
+  // End-to-end check: every proof verifies, a tampered hash does not
+  for (let i = 0; i < students.length; i++) {
+    const ok = await contract.verifyCohortCertificate(
+      "cohort-gas", students[i].studentId, students[i].certHash, proofFor(levels, i)
+    );
+    if (!ok) {
+      throw new Error(`Proof ${i} rejected`);
+    }
+  }
+  const tampered = await contract.verifyCohortCertificate(
+    "cohort-gas", students[0].studentId, students[1].certHash, proofFor(levels, 0)
+  );
+  if (tampered) {
+    throw new Error("Tampered certificate accepted");
+  }
+
+  const singleScaled = (singleGas * BigInt(COHORT_SIZE)) / BigInt(SINGLE_SAMPLE);
+  console.log(`Certificates:                ${COHORT_SIZE} (${ISSUERS.length} issuers, all must sign)`);
+  console.log(`Per-certificate flow:        ${singleScaled} gas (measured on ${SINGLE_SAMPLE})`);
+  console.log(`Cohort flow:                 ${cohortGas} gas`);
+  console.log(`Per 1,000 certificates:      ${(singleScaled * 1000n) / BigInt(COHORT_SIZE)} vs ${(cohortGas * 1000n) / BigInt(COHORT_SIZE)} gas`);
+  console.log(`Proofs verified on chain:    ${students.length}, proof length ${proofFor(levels, 0).length}`);
+}
+
+main().catch((error) => {
+  console.error(error);
+  process.exitCode = 1;
+});
@@ -0,0 +1,276 @@
+const {
+  loadFixture,
+} = require("@nomicfoundation/hardhat-toolbox/network-helpers");
+const { expect } = require("chai");
+const { ethers, network } = require("hardhat");
+
+// Roots and proofs built by be/app/services/merkle.py (be/tests/test_merkle.py keeps it current)
+const vectors = require("./fixtures/cohort-merkle.json");
+
+// Default issuers set in the DiplomaContract constructor
+const ISSUERS = [
+  "0x9025bCF725Cce60610030A4824156346fDFAc97c",
+  "0xd924c8F1BA5f69292baDD9baf06893D7F90aeBCd",
+  "0xda2486286e253201de026A066f75Bb8B0696E8cD",
+];
+
+const signature = () => ethers.hexlify(ethers.randomBytes(65));
+
+describe("Cohort", function () {
+  async function deployFixture() {
+    const issuers = [];
+    for (const address of ISSUERS) {
+      await network.provider.request({ method: "hardhat_impersonateAccount", params: [address] });
+      await network.provider.request({ method: "hardhat_setBalance", params: [address, "0x56BC75E2D63100000"] });
+      issuers.push(await ethers.getSigner(address));
+    }
+    const [outsider] = await ethers.getSigners();
+
+    const Contract = await ethers.getContractFactory("DiplomaContract");
+    const contract = await Contract.deploy();
+
+    return { contract, issuers, outsider };
+  }
+
+  // The 5-certificate tree: odd, so its last leaf is carried up a level unpaired
+  const tree = vectors.trees.find((t) => t.size === 5);
+  const student = tree.students[4];
+  const proof = tree.proofs[4];
+
+  async function proposeCohort(contract, proposer, cohortId, requiresAllSignatures) {
+    return contract
+      .connect(proposer)
+      .proposeCohort(cohortId, tree.root, tree.size, ISSUERS, signature(), requiresAllSignatures);
+  }
+
+  async function issuedCohortFixture(requiresAllSignatures) {
+    const { contract, issuers, outsider } = await deployFixture();
+    await proposeCohort(contract, issuers[0], "cohort-1", requiresAllSignatures);
+    await contract.connect(issuers[1]).signCohortIssuance("cohort-1", signature());
+    if (requiresAllSignatures) {
+      await contract.connect(issuers[2]).signCohortIssuance("cohort-1", signature());
+    }
+    return { contract, issuers, outsider };
+  }
+
+  const issuedAllFixture = () => issuedCohortFixture(true);
+  const issuedMajorityFixture = () => issuedCohortFixture(false);
+
+  function revoke(contract, issuer, cohortProof = proof) {
+    return contract
+      .connect(issuer)
+      .signCohortCertificateRevocation("cohort-1", student.studentId, student.certHash, cohortProof, "Plagiarism");
+  }
+
+  describe("Issuance", function () {
+    it("Should wait for every issuer when all signatures are required", async function () {
+      const { contract, issuers } = await loadFixture(deployFixture);
+
+      await proposeCohort(contract, issuers[0], "cohort-1", true);
+      await contract.connect(issuers[1]).signCohortIssuance("cohort-1", signature());
+      expect((await contract.getCohort("cohort-1")).isValid).to.equal(false);
+
+      await expect(contract.connect(issuers[2]).signCohortIssuance("cohort-1", signature()))
+        .to.emit(contract, "CohortIssued")
+        .withArgs("cohort-1", tree.root, tree.size);
+      expect((await contract.getCohort("cohort-1")).isValid).to.equal(true);
+    });
+
+    it("Should issue on a majority when not all signatures are required", async function () {
+      const { contract, issuers } = await loadFixture(deployFixture);
+
+      await proposeCohort(contract, issuers[0], "cohort-1", false);
+      expect((await contract.getCohort("cohort-1")).isValid).to.equal(false);
+
+      await expect(contract.connect(issuers[1]).signCohortIssuance("cohort-1", signature()))
+        .to.emit(contract, "CohortIssued");
+      await expect(
+        contract.connect(issuers[2]).signCohortIssuance("cohort-1", signature())
+      ).to.be.revertedWith("Cohort already issued");
+    });
+
+    it("Should reject a duplicate cohortId", async function () {
+      const { contract, issuers } = await loadFixture(deployFixture);
+
+      await proposeCohort(contract, issuers[0], "cohort-1", true);
+      await expect(proposeCohort(contract, issuers[1], "cohort-1", true)).to.be.revertedWith(
+        "Cohort already exists",
+      );
+      expect(await contract.getCohortCount()).to.equal(1);
+    });
+
+    it("Should reject signing a cohort that was never proposed", async function () {
+      const { contract, issuers } = await loadFixture(deployFixture);
+
+      await expect(
+        contract.connect(issuers[0]).signCohortIssuance("missing", signature())
+      ).to.be.revertedWith("Cohort does not exist");
+    });
+
+    it("Should reject a second signature from the same issuer", async function () {
+      const { contract, issuers } = await loadFixture(deployFixture);
+
+      await proposeCohort(contract, issuers[0], "cohort-1", true);
+      await expect(
+        contract.connect(issuers[0]).signCohortIssuance("cohort-1", signature())
+      ).to.be.revertedWith("Already signed by this issuer");
+    });
+  });
+
+  describe("Issuers", function () {
+    it("Should reject a proposal from an account that is not an issuer", async function () {
+      const { contract, outsider } = await loadFixture(deployFixture);
+
+      await expect(proposeCohort(contract, outsider, "cohort-1", true)).to.be.revertedWith(
+        "Only issuer can perform this action",
+      );
+    });
+
+    it("Should reject a signature from an active issuer left off the cohort's list", async function () {
+      const { contract, issuers, outsider } = await loadFixture(deployFixture);
+
+      await contract.connect(issuers[0]).addIssuer(outsider.address, "");
+      await proposeCohort(contract, issuers[0], "cohort-1", true);
+      await expect(
+        contract.connect(outsider).signCohortIssuance("cohort-1", signature())
+      ).to.be.revertedWith("Not an authorized issuer for this cohort");
+    });
+
+    it("Should reject a signature from a listed issuer who was removed", async function () {
+      const { contract, issuers } = await loadFixture(deployFixture);
+
+      await proposeCohort(contract, issuers[0], "cohort-1", true);
+      await contract.connect(issuers[0]).removeIssuer(issuers[2].address);
+      await expect(
+        contract.connect(issuers[2]).signCohortIssuance("cohort-1", signature())
+      ).to.be.revertedWith("Not an authorized issuer for this cohort");
+    });
+
+    it("Should reject a proposal listing an inactive issuer", async function () {
+      const { contract, issuers } = await loadFixture(deployFixture);
+
+      await contract.connect(issuers[0]).removeIssuer(issuers[2].address);
+      await expect(proposeCohort(contract, issuers[0], "cohort-1", true)).to.be.revertedWith(
+        "One or more issuers are not active",
+      );
+    });
+
+    it("Should reject a revocation from an issuer left off the cohort's list", async function () {
+      const { contract, issuers, outsider } = await loadFixture(issuedAllFixture);
+
+      await contract.connect(issuers[0]).addIssuer(outsider.address, "");
+      await expect(revoke(contract, outsider)).to.be.revertedWith(
+        "Not an authorized issuer for this cohort",
+      );
+    });
+  });
+
+  describe("Revocation", function () {
+    it("Should reject revoking from a cohort that is not issued yet", async function () {
+      const { contract, issuers } = await loadFixture(deployFixture);
+
+      await proposeCohort(contract, issuers[0], "cohort-1", true);
+      await expect(revoke(contract, issuers[0])).to.be.revertedWith("Cohort is not issued");
+    });
+
+    it("Should wait for every issuer when all signatures are required", async function () {
+      const { contract, issuers } = await loadFixture(issuedAllFixture);
+      const leaf = await contract.cohortLeaf(student.studentId, student.certHash);
+
+      await revoke(contract, issuers[0]);
+      await revoke(contract, issuers[1]);
+      expect(await contract.isCohortCertificateRevoked("cohort-1", leaf)).to.equal(false);
+      expect(await contract.verifyCohortCertificate("cohort-1", student.studentId, student.certHash, proof)).to.equal(true);
+
+      await expect(revoke(contract, issuers[2]))
+        .to.emit(contract, "CohortCertificateRevoked")
+        .withArgs("cohort-1", leaf, student.studentId, "Plagiarism");
+      expect(await contract.isCohortCertificateRevoked("cohort-1", leaf)).to.equal(true);
+      expect(await contract.verifyCohortCertificate("cohort-1", student.studentId, student.certHash, proof)).to.equal(false);
+    });
+
+    it("Should revoke on a majority when not all signatures are required", async function () {
+      const { contract, issuers } = await loadFixture(issuedMajorityFixture);
+      const leaf = await contract.cohortLeaf(student.studentId, student.certHash);
+
+      await revoke(contract, issuers[0]);
+      expect(await contract.isCohortCertificateRevoked("cohort-1", leaf)).to.equal(false);
+
+      await expect(revoke(contract, issuers[1])).to.emit(contract, "CohortCertificateRevoked");
+      expect(await contract.isCohortCertificateRevoked("cohort-1", leaf)).to.equal(true);
+      await expect(revoke(contract, issuers[2])).to.be.revertedWith("Certificate already revoked");
+    });
+
+    it("Should only revoke the certificate named by the proof", async function () {
+      const { contract, issuers } = await loadFixture(issuedMajorityFixture);
+      const other = tree.students[0];
+
+      await revoke(contract, issuers[0]);
+      await revoke(contract, issuers[1]);
+      expect(
+        await contract.verifyCohortCertificate("cohort-1", other.studentId, other.certHash, tree.proofs[0])
+      ).to.equal(true);
+    });
+
+    it("Should reject a second revocation signature from the same issuer", async function () {
+      const { contract, issuers } = await loadFixture(issuedAllFixture);
+
+      await revoke(contract, issuers[0]);
+      await expect(revoke(contract, issuers[0])).to.be.revertedWith(
+        "Already signed revocation by this issuer",
+      );
+    });
+
+    it("Should reject an invalid proof", async function () {
+      const { contract, issuers } = await loadFixture(issuedAllFixture);
+
+      await expect(revoke(contract, issuers[0], tree.proofs[0])).to.be.revertedWith("Invalid Merkle proof");
+      await expect(revoke(contract, issuers[0], [])).to.be.revertedWith("Invalid Merkle proof");
+      await expect(
+        contract.connect(issuers[0]).signCohortCertificateRevocation(
+          "cohort-1", student.studentId, tree.students[0].certHash, proof, "Plagiarism"
+        )
+      ).to.be.revertedWith("Invalid Merkle proof");
+    });
+  });
+
+  describe("Verification", function () {
+    it("Should not verify a certificate of a cohort that is not issued yet", async function () {
+      const { contract, issuers } = await loadFixture(deployFixture);
+
+      await proposeCohort(contract, issuers[0], "cohort-1", true);
+      expect(await contract.verifyCohortCertificate("cohort-1", student.studentId, student.certHash, proof)).to.equal(false);
+      expect(await contract.verifyCohortCertificate("missing", student.studentId, student.certHash, proof)).to.equal(false);
+    });
+
+    it("Should not verify a tampered hash or proof", async function () {
+      const { contract } = await loadFixture(issuedAllFixture);
+
+      expect(
+        await contract.verifyCohortCertificate("cohort-1", student.studentId, tree.students[0].certHash, proof)
+      ).to.equal(false);
+      expect(
+        await contract.verifyCohortCertificate("cohort-1", student.studentId, student.certHash, tree.proofs[3])
+      ).to.equal(false);
+    });
+
+    // _processProof is internal; verifyCohortCertificate folds the proof with it
+    for (const vector of vectors.trees) {
+      it(`Should accept every merkle.py proof of a ${vector.size}-certificate cohort`, async function () {
+        const { contract, issuers } = await loadFixture(deployFixture);
+        const cohortId = `parity-${vector.size}`;
+
+        await contract
+          .connect(issuers[0])
+          .proposeCohort(cohortId, vector.root, vector.size, ISSUERS, signature(), false);
+        await contract.connect(issuers[1]).signCohortIssuance(cohortId, signature());
+
+        for (let i = 0; i < vector.size; i++) {
+          const { studentId, certHash } = vector.students[i];
+          expect(await contract.cohortLeaf(studentId, certHash)).to.equal(vector.leaves[i]);
+          expect(await contract.verifyCohortCertificate(cohortId, studentId, certHash, vector.proofs[i])).to.equal(true);
+        }
+      });
+    }
+  });
+});
@@ -160,12 +160,56 @@ export interface AllCertificatesResponse {
   success: boolean;
   certificates: BlockchainCertificate[];
   count: number;
+  indexed_block?: number | null;
 }
 
+interface CertificatePageSummary {
+  next_cursor: number | null;
+  count: number;
+  indexed_block?: number | null;
+}
+
+const CERTIFICATE_PAGE_SIZE = 500;
+
+// /certificate/blockchain/all streams NDJSON: one certificate per line, then a summary line
 export const getAllCertificatesFromBlockchain = async (): Promise<AllCertificatesResponse> => {
   try {
-    const response = await apiClient.get('/certificate/blockchain/all');
-    return response.data;
+    const certificates: BlockchainCertificate[] = [];
+    let indexedBlock: number | null | undefined;
+    let cursor: number | null = 0;
+
+    while (cursor !== null) {
+      let summary: CertificatePageSummary | null = null;
+      const response = await apiClient.get('/certificate/blockchain/all', {
+        params: { cursor, limit: CERTIFICATE_PAGE_SIZE },
+        responseType: 'text',
+      });
+      const lines = (response.data as string).split('\n').filter((line) => line.trim());
+      for (const line of lines) {
+        const item = JSON.parse(line);
+        // A failed page read ends the stream with {error, next_cursor} and no summary
+        if ('error' in item) {
+          throw new Error(item.error);
+        }
+        if ('next_cursor' in item) {
+          summary = item;
+        } else {
+          certificates.push(item);
+        }
+      }
+      if (!summary) {
+        throw new Error('Certificate listing ended without a summary line');
+      }
+      cursor = summary.next_cursor;
+      indexedBlock = summary.indexed_block;
+    }
+
+    return {
+      success: true,
+      certificates,
+      count: certificates.length,
+      indexed_block: indexedBlock,
+    };
   } catch (error) {
     console.error('Error fetching certificates from blockchain:', error);
     throw error;